@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Broadcast, Transcript
+from .models import Announcement, Broadcast, Transcript
 
 # Register your models here.
 # ==========================================================
@@ -27,6 +27,19 @@ class BroadcastAdmin(admin.ModelAdmin):
         return ", ".join([k.word for k in obj.keywords_detected.all()]) or "-"
 
 
+# ==========================================================
+# Announcement 
+# ==========================================================
+@admin.register(Announcement)
+class AnnouncementAdmin(admin.ModelAdmin):
+    list_display = ("id", "session", "seq", "is_closed", "created_at", "updated_at")
+    list_filter = ("is_closed", "created_at")
+    search_fields = ("id", "session__id")
+    ordering = ("-created_at",)
+    list_display_links = ("id",)
+    list_per_page = 20
+
+
 # ==========================================================
 # Transcript 
 # ==========================================================
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broadcasts', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='broadcast',
+            name='station_guess',
+            field=models.CharField(blank=True, db_index=True, help_text='추정 역명', max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='is_intro',
+            field=models.BooleanField(db_index=True, help_text="'이번 역은' 패턴 포함 여부", null=True),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='is_incomplete',
+            field=models.BooleanField(db_index=True, help_text='문장 미완성 여부', null=True),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='has_broadcast_keyword',
+            field=models.BooleanField(db_index=True, help_text='안내방송 키워드 포함 여부', null=True),
+        ),
+    ]
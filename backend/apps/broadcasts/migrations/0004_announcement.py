@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broadcasts', '0003_broadcast_features'),
+        ('recordings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Announcement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveIntegerField()),
+                ('is_closed', models.BooleanField(db_index=True, default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='announcements', to='recordings.session')),
+            ],
+            options={
+                'verbose_name': 'Announcement',
+                'verbose_name_plural': 'Announcements',
+                'ordering': ['seq'],
+                'unique_together': {('session', 'seq')},
+            },
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='announcement',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='broadcasts', to='broadcasts.announcement'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-18 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broadcasts', '0004_announcement'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcript',
+            name='full_text',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='transcript',
+            name='timeline',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='transcript',
+            name='version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='transcript',
+            name='group_cache',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
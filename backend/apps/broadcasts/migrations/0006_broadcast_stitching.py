@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broadcasts', '0005_transcript_result_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='broadcast',
+            name='stitched_text',
+            field=models.TextField(blank=True, default='', help_text='겹침 제거 후 텍스트'),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='overlap_chars',
+            field=models.PositiveIntegerField(default=0, help_text='앞 방송과 겹친 글자 수'),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='continues_previous',
+            field=models.BooleanField(default=False, help_text='앞 방송 끝에서 잘린 단어로 이어짐'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broadcasts', '0006_broadcast_stitching'),
+        ('recordings', '0003_audiochunk_cleaned_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='broadcast',
+            index=models.Index(fields=['session', 'created_at'], name='broadcast_session_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='broadcast',
+            index=models.Index(fields=['announcement', 'created_at'], name='broadcast_announce_created_idx'),
+        ),
+    ]
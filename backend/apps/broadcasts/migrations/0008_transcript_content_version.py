@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broadcasts', '0007_broadcast_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcript',
+            name='content_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -3,6 +3,35 @@ from django.db.models import JSONField
 
 from apps.recordings.models import Session, AudioChunk
 
+# ==========================================================
+#  Announcement (연속 방송을 묶은 안내방송 그룹)
+# ==========================================================
+class Announcement(models.Model):
+    session = models.ForeignKey(
+        Session,
+        on_delete=models.CASCADE,
+        related_name="announcements")
+
+    # 세션 내 안내방송 순번 (1부터)
+    seq = models.PositiveIntegerField()
+
+    # 다음 방송이 다른 안내방송으로 판정되면 닫힘
+    is_closed = models.BooleanField(default=False, db_index=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        state = "closed" if self.is_closed else "open"
+        return f"[{self.id}] session={self.session_id}, seq={self.seq}, {state}"
+
+    class Meta:
+        ordering = ["seq"]
+        unique_together = ("session", "seq")
+        verbose_name = "Announcement"
+        verbose_name_plural = "Announcements"
+
+
 # ==========================================================
 #  Broadcast (안내방송 단위 인식 결과)
 # ==========================================================
@@ -12,11 +41,27 @@ class Broadcast(models.Model):
         on_delete=models.CASCADE, 
         related_name="broadcasts")
     audio_chunk = models.ForeignKey(AudioChunk, on_delete=models.SET_NULL, null=True, blank=True, related_name="broadcasts")
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name="broadcasts")
 
     full_text = models.TextField(help_text="STT 변환된 안내방송 텍스트")
     summary = models.TextField(blank=True, help_text="LLM 요약 결과")
     confidence_avg = models.FloatField(default=0)
 
+    # 그룹핑용 텍스트 특징 (청크 처리 시 1회 계산, null 이면 미계산)
+    station_guess = models.CharField(max_length=50, null=True, blank=True, db_index=True, help_text="추정 역명")
+    is_intro = models.BooleanField(null=True, db_index=True, help_text="'이번 역은' 패턴 포함 여부")
+    is_incomplete = models.BooleanField(null=True, db_index=True, help_text="문장 미완성 여부")
+    has_broadcast_keyword = models.BooleanField(null=True, db_index=True, help_text="안내방송 키워드 포함 여부")
+
+    # 청크 경계 겹침 처리 (앞 방송과 겹친 머리를 뺀 텍스트)
+    stitched_text = models.TextField(blank=True, default="", help_text="겹침 제거 후 텍스트")
+    overlap_chars = models.PositiveIntegerField(default=0, help_text="앞 방송과 겹친 글자 수")
+    continues_previous = models.BooleanField(default=False, help_text="앞 방송 끝에서 잘린 단어로 이어짐")
+
     # 감지된 키워드는 keyword 앱의 Keyword 모델과 연결 (ManyToMany)
     keywords_detected = models.ManyToManyField(
         "keywords.Keyword",
@@ -40,6 +85,12 @@ class Broadcast(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Broadcast"
         verbose_name_plural = "Broadcast"
+        indexes = [
+            # 세션 방송 시간순 조회 (results / 그룹핑)
+            models.Index(fields=["session", "created_at"], name="broadcast_session_created_idx"),
+            # 그룹별 방송 prefetch (order_by created_at)
+            models.Index(fields=["announcement", "created_at"], name="broadcast_announce_created_idx"),
+        ]
 
 
 # ==========================================================
@@ -57,6 +108,12 @@ class Transcript(models.Model):
     # 전체 announcements 리스트 그대로 저장
     timeline = JSONField(default=list)
 
+    # 결과 캐시 — version: 그룹 구성 해시, group_cache: 내용 해시 → LLM 결과
+    #           content_version: 이 결과를 만든 시점의 Session.content_version
+    version = models.CharField(max_length=64, blank=True, default="")
+    content_version = models.PositiveIntegerField(default=0)
+    group_cache = JSONField(default=dict, blank=True)
+
     # 통계 정보
     total_broadcasts = models.IntegerField(default=0)
     total_keywords = models.IntegerField(default=0)
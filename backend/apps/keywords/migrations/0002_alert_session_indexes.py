@@ -0,0 +1,54 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_alert_session(apps, schema_editor):
+    """기존 Alert 의 session 을 keyword.session 으로 채움"""
+    Alert = apps.get_model('keywords', 'Alert')
+    Keyword = apps.get_model('keywords', 'Keyword')
+
+    Alert.objects.filter(session__isnull=True).update(
+        session_id=Subquery(
+            Keyword.objects.filter(pk=OuterRef('keyword_id')).values('session_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broadcasts', '0007_broadcast_indexes'),
+        ('keywords', '0001_initial'),
+        ('recordings', '0003_audiochunk_cleaned_path_indexes'),
+    ]
+
+    operations = [
+        # 모델에는 있었지만 마이그레이션에 빠져 있던 필드 (null 로 추가 → 채움 → not null)
+        migrations.AddField(
+            model_name='alert',
+            name='session',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='recordings.session'),
+        ),
+        migrations.RunPython(fill_alert_session, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='alert',
+            name='session',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='recordings.session'),
+        ),
+        migrations.AlterField(
+            model_name='alert',
+            name='broadcast',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='broadcasts.broadcast'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['session', 'detected_at'], name='alert_session_detected_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['keyword', 'detected_at'], name='alert_keyword_detected_idx'),
+        ),
+    ]
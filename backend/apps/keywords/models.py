@@ -49,6 +49,12 @@ class Alert(models.Model):
         ordering = ["-detected_at"]
         verbose_name = "Alert"
         verbose_name_plural = "Alerts"
+        indexes = [
+            # 세션 알림 목록 (status, 최신순)
+            models.Index(fields=["session", "detected_at"], name="alert_session_detected_idx"),
+            # 키워드별 알림 (keyword__session 조인)
+            models.Index(fields=["keyword", "detected_at"], name="alert_keyword_detected_idx"),
+        ]
 
     def __str__(self):
         return f"[{self.id}] session={self.session_id}, keyword='{self.keyword.word}', broadcast={self.broadcast_id}, time={self.detected_at:%H:%M:%S}"
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from ..models import Keyword
+from ..utils.matcher import invalidate_matcher
 from apps.recordings.models import Session
 
 
@@ -41,6 +42,9 @@ class KeywordCreateSerializer(serializers.Serializer):
             )
             created_keywords.append(keyword)
 
+        # 워커에 캐시된 키워드 매처 무효화
+        invalidate_matcher(session.id)
+
         return created_keywords
         
 
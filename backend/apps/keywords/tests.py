@@ -1,3 +1,65 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.keywords.models import Keyword
+from apps.keywords.utils import matcher
+from apps.keywords.utils.detect import normalize
+from apps.recordings.models import Session
+from apps.recordings.testing import FakeRedisMixin
+
+
+# ==========================================================
+#  키워드 매처 캐시 — 키워드 생성/삭제 API 가 버전을 올리면
+#  다른 워커에 캐시된 매처도 다음 청크에서 다시 빌드돼야 한다
+# ==========================================================
+class KeywordMatcherInvalidationTests(FakeRedisMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        matcher._cache.clear()
+        self.addCleanup(matcher._cache.clear)
+        self.session = Session.objects.create()
+        self.api = APIClient()
+
+    def _match(self, text):
+        found = matcher.get_matcher(self.session.id, normalize).match(normalize(text))
+        return [kw.word for kw in found]
+
+    def _keep_stale(self, stale):
+        # 다른 워커의 캐시 흉내 — 같은 프로세스의 pop 과 무관하게 오래된 매처가 남아 있음
+        matcher._cache[self.session.id] = stale
+
+    def test_created_keyword_reaches_cached_matcher(self):
+        stale = matcher.get_matcher(self.session.id, normalize)
+        self.assertEqual(self._match("이번 역은 시청역입니다"), [])
+
+        res = self.api.post(
+            "/api/keywords/",
+            {"session_id": self.session.id, "keywords": ["시청"]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, 201)
+        self._keep_stale(stale)
+
+        self.assertEqual(self._match("이번 역은 시청역입니다"), ["시청"])
+
+    def test_deleted_keyword_is_no_longer_matched(self):
+        keyword = Keyword.objects.create(session=self.session, word="시청")
+        matcher.invalidate_matcher(self.session.id)
+        stale = matcher.get_matcher(self.session.id, normalize)
+        self.assertEqual(self._match("이번 역은 시청역입니다"), ["시청"])
+
+        res = self.api.delete(f"/api/keywords/{keyword.id}/")
+        self.assertEqual(res.status_code, 200)
+        self._keep_stale(stale)
+
+        self.assertEqual(self._match("이번 역은 시청역입니다"), [])
+
+    def test_unchanged_version_reuses_matcher_without_query(self):
+        Keyword.objects.create(session=self.session, word="시청")
+        first = matcher.get_matcher(self.session.id, normalize)
+
+        with self.assertNumQueries(0):
+            second = matcher.get_matcher(self.session.id, normalize)
+
+        self.assertIs(first, second)
@@ -1,6 +1,9 @@
 import re
-from apps.keywords.models import Keyword, Alert
-from apps.recordings.sse.publisher import push_event
+from apps.keywords.models import Alert
+from apps.keywords.utils.matcher import get_matcher
+from apps.recordings.sse.publisher import push_events
+from apps.recordings.services.counters import mark_counted
+from apps.recordings.services.results import bump_content_version
 
 
 def normalize(text: str) -> str:
@@ -18,36 +21,41 @@ def normalize(text: str) -> str:
 
 def detect_keywords_in_chunk(session, text,broadcast):
     """
-    - 청크의 텍스트에서 키워드 감지
+    - 청크의 텍스트에서 키워드 감지 (세션 매처로 한 번에 탐색)
     - Broadcast.keywords_detected 에 저장
     - Alert 생성
     - SSE 푸시
+    감지 개수와 무관하게 M2M 1회, Alert bulk insert 1회, Redis 파이프라인 1회.
     """
     norm = normalize(text)
-    detected_keywords = []
-
-    for kw in Keyword.objects.filter(session=session):
-        if normalize(kw.word) in norm:
-            
-            # Broadcast <-> Keyword 연결
-            broadcast.keywords_detected.add(kw)
-            
-            # Alert 생성
-            alert = Alert.objects.create(
-                session=session,
-                broadcast=broadcast,
-                keyword=kw    
-            )
-            
-            # Keyword 객체만 추가
-            detected_keywords.append(kw)
-            
-            # SSE 전송
-            push_event(session.id, {
-                "type": "keyword_alert",
-                "keyword": kw.word,
-                "broadcast_id": broadcast.id,
-                "detected_at": str(alert.detected_at)
-            })
-
-    return detected_keywords
\ No newline at end of file
+
+    matcher = get_matcher(session.id, normalize)
+    detected_keywords = matcher.match(norm)
+
+    if not detected_keywords:
+        return detected_keywords
+
+    # Broadcast <-> Keyword 연결 (한 번에)
+    broadcast.keywords_detected.add(*detected_keywords)
+
+    # Alert 일괄 생성 (detected_at 은 auto_now_add 로 객체에 채워짐)
+    alerts = Alert.objects.bulk_create([
+        Alert(session=session, broadcast=broadcast, keyword=kw)
+        for kw in detected_keywords
+    ])
+    mark_counted(session.id, "alerts", [alert.id for alert in alerts])
+    # 그룹 메타데이터(keywords_detected)가 바뀜
+    bump_content_version(session.id)
+
+    # SSE 일괄 전송
+    push_events(session.id, [
+        {
+            "type": "keyword_alert",
+            "keyword": alert.keyword.word,
+            "broadcast_id": broadcast.id,
+            "detected_at": str(alert.detected_at)
+        }
+        for alert in alerts
+    ])
+
+    return detected_keywords
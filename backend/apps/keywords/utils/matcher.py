@@ -0,0 +1,154 @@
+from collections import OrderedDict, deque
+
+from django.conf import settings
+
+from apps.keywords.models import Keyword
+from apps.recordings.services.redis_client import r
+
+
+# 워커 프로세스당 캐시할 최대 세션 수
+MATCHER_CACHE_SIZE = getattr(settings, "KEYWORD_MATCHER_CACHE_SIZE", 1024)
+
+
+def _version_key(session_id):
+    return f"keywords:version:{session_id}"
+
+
+# ==========================================================
+#  Aho-Corasick 다중 패턴 매처
+# ==========================================================
+class AhoCorasick:
+    """
+    정규화된 키워드 전체를 하나의 오토마톤으로 컴파일한다.
+    - find_all(text): 텍스트를 한 번만 훑어 매칭된 payload 전부를 반환
+    - 같은 정규화 결과를 가진 키워드는 하나의 패턴에 함께 묶인다
+    """
+
+    def __init__(self, patterns):
+        # patterns: [(pattern, payload), ...]
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+
+        for pattern, payload in patterns:
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(payload)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+
+                # 실패 링크 쪽 출력도 함께 물려받음 (접미사 패턴)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find_all(self, text):
+        found = []
+        seen = set()
+        node = 0
+
+        for ch in text:
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+
+            for payload in self.out[node]:
+                key = id(payload)
+                if key not in seen:
+                    seen.add(key)
+                    found.append(payload)
+
+        return found
+
+
+# ==========================================================
+#  세션별 매처 캐시 (워커 프로세스 로컬)
+# ==========================================================
+class KeywordMatcher:
+    """
+    세션 하나의 키워드 매처.
+    version 은 Redis 의 keywords:version:{session_id} 값으로,
+    키워드가 추가/삭제될 때마다 증가한다.
+    """
+
+    def __init__(self, keywords, version, normalize):
+        self.version = version
+        self.keywords = list(keywords)
+        self.automaton = AhoCorasick(
+            (normalize(kw.word), kw) for kw in self.keywords
+        )
+
+    def match(self, norm_text):
+        """정규화된 텍스트에서 감지된 Keyword 목록 (기존 word 정렬 순서 유지)"""
+        hits = {kw.id for kw in self.automaton.find_all(norm_text)}
+        return [kw for kw in self.keywords if kw.id in hits]
+
+
+_cache = OrderedDict()
+
+
+def _current_version(session_id):
+    try:
+        value = r.get(_version_key(session_id))
+    except Exception as e:
+        print("⚠️ keyword version 조회 실패:", e)
+        return None
+    return int(value) if value is not None else 0
+
+
+def get_matcher(session_id, normalize):
+    """
+    세션 매처를 반환한다.
+    캐시된 버전이 Redis 버전과 같으면 DB 조회 없이 재사용.
+    """
+    version = _current_version(session_id)
+    matcher = _cache.get(session_id)
+
+    if matcher is not None and version is not None and matcher.version == version:
+        _cache.move_to_end(session_id)
+        return matcher
+
+    keywords = Keyword.objects.filter(session_id=session_id).only("id", "word", "session_id")
+    matcher = KeywordMatcher(keywords, version, normalize)
+
+    # 버전 확인이 불가능하면 캐시하지 않음 (오래된 매처 재사용 방지)
+    if version is not None:
+        _cache[session_id] = matcher
+        _cache.move_to_end(session_id)
+        while len(_cache) > MATCHER_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return matcher
+
+
+def invalidate_matcher(session_id):
+    """
+    키워드 생성/삭제 시 호출.
+    모든 워커가 다음 청크에서 매처를 다시 빌드하도록 버전을 올린다.
+    """
+    _cache.pop(session_id, None)
+    try:
+        r.incr(_version_key(session_id))
+    except Exception as e:
+        print("⚠️ keyword version 갱신 실패:", e)
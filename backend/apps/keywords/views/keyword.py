@@ -5,7 +5,10 @@ from django.shortcuts import get_object_or_404
 
 from apps.keywords.models import Keyword
 from apps.keywords.serializers.keyword import KeywordCreateSerializer, KeywordListSerializer
+from apps.keywords.utils.matcher import invalidate_matcher
 from apps.recordings.models import Session
+from apps.recordings.services.counters import reset_counts
+from apps.recordings.services.results import bump_content_version
 
 
 class KeywordViewSet(viewsets.ViewSet):
@@ -62,6 +65,12 @@ class KeywordViewSet(viewsets.ViewSet):
             "detail": "deleted"
         }
         
+        session_id = keyword.session_id
         keyword.delete()
+        invalidate_matcher(session_id)
+        # 연결된 Alert 도 함께 삭제되므로 알림 카운터 재집계
+        reset_counts(session_id)
+        # 방송의 감지 키워드도 빠지므로 저장된 결과는 다시 생성
+        bump_content_version(session_id)
         return Response(response_data, status=status.HTTP_200_OK)
 
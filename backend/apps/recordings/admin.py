@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Session, AudioChunk
+from .models import Session, AudioChunk, ChunkUpload
 
 
 # ==========================================================
@@ -26,4 +26,16 @@ class AudioChunkAdmin(admin.ModelAdmin):
     search_fields = ("id", "file_path", "session__id")
     ordering = ("-created_at",)
     list_display_links = ("id", "file_path")
-    list_per_page = 20
\ No newline at end of file
+    list_per_page = 20
+
+
+# ==========================================================
+# ChunkUpload
+# ==========================================================
+@admin.register(ChunkUpload)
+class ChunkUploadAdmin(admin.ModelAdmin):
+    list_display = ("id", "session", "status", "offset", "size", "filename", "created_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("id", "filename", "session__id")
+    ordering = ("-created_at",)
+    list_per_page = 20
@@ -0,0 +1,62 @@
+import os
+import resource
+import subprocess
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.recordings.services import audio_decode
+
+
+def _cpu_seconds():
+    """현재 프로세스 + 종료된 자식 프로세스(ffmpeg)의 user+sys CPU 시간"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _subprocess_wav(path):
+    """기존 convert_to_wav 방식 — 파일마다 ffmpeg 프로세스 + 임시 WAV 파일"""
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "out.wav")
+        subprocess.run(
+            ["ffmpeg", "-i", path, "-ac", "1", "-ar", "16000", "-y", output_path],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+        )
+        return audio_decode._read_wav(output_path)
+
+
+class Command(BaseCommand):
+    help = "ffmpeg 서브프로세스 변환 vs 프로세스 내 디코딩 — 청크당 지연/CPU 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="m4a/aac/mp3 청크 파일")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        paths = options["paths"]
+        repeat = options["repeat"]
+
+        methods = [("subprocess+wav", _subprocess_wav), ("ffmpeg pipe", audio_decode._read_ffmpeg)]
+        if audio_decode.av is not None:
+            methods.append(("in-process (PyAV)", audio_decode._read_av))
+        else:
+            self.stdout.write("⚠️ PyAV 미설치 — 프로세스 내 디코딩 생략")
+
+        n = len(paths) * repeat
+        for name, decode in methods:
+            decode(paths[0])  # 워밍업
+
+            wall = time.perf_counter()
+            cpu = _cpu_seconds()
+            for _ in range(repeat):
+                for path in paths:
+                    pcm = decode(path)
+            cpu = _cpu_seconds() - cpu
+            wall = time.perf_counter() - wall
+
+            self.stdout.write(
+                f"{name:<20} {wall / n * 1000:7.1f} ms/chunk (latency)  "
+                f"{cpu / n * 1000:7.1f} ms/chunk (CPU)  samples={len(pcm)}"
+            )
@@ -0,0 +1,179 @@
+import re
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Prefetch
+
+from apps.broadcasts.models import Announcement, Broadcast
+from apps.keywords.models import Alert, Keyword
+from apps.recordings.models import AudioChunk, Session
+from apps.recordings.services.counters import reconcile_queries
+
+
+# ==========================================================
+#  핫 쿼리 벤치마크
+#  - 청크/방송/알림을 대량으로 시드한 뒤 status / results / 키워드 감지 /
+#    겹침 처리에서 실제로 나가는 쿼리를 반복 실행해 중앙값(ms) + EXPLAIN 기록
+#  - 실행 계획에 테이블 풀스캔이 보이면 CommandError 로 실패
+#  - 시드 데이터는 기본적으로 롤백 (--keep 으로 유지)
+# ==========================================================
+
+BATCH_SIZE = 5000
+KEYWORDS = ["구로", "신도림", "환승", "출입문", "지연"]
+
+# SQLite: "SCAN recordings_audiochunk" (USING INDEX 없이) / Postgres: "Seq Scan"
+FULL_SCAN = {
+    "sqlite": re.compile(r"\bSCAN (\w+)(?! USING)(?:\s|$)"),
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+}
+
+
+def _bulk(model, objs):
+    model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+
+
+class Command(BaseCommand):
+    help = "청크/방송/알림 대량 시드 후 status·results·detect 쿼리의 지연과 실행 계획 점검"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunks", type=int, default=1_000_000)
+        parser.add_argument("--sessions", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--output", help="리포트(타이밍 + EXPLAIN) 저장 경로")
+        parser.add_argument("--keep", action="store_true", help="시드 데이터를 롤백하지 않음")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            session = self.seed(options["chunks"], options["sessions"])
+            report, scans = self.run_queries(session, options["repeat"])
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                f.write(report)
+            self.stdout.write(f"📝 리포트 저장: {options['output']}")
+
+        if scans:
+            raise CommandError("풀스캔 발생: " + ", ".join(scans))
+        self.stdout.write(self.style.SUCCESS("✅ 모든 쿼리가 인덱스를 사용"))
+
+    # ------------------------------------------------------
+    # 시드: 세션마다 청크 N개, 청크 2개당 방송 1개, 방송 5개당 안내방송 1개,
+    #       방송 4개당 알림 1개, 세션당 키워드 5개
+    # ------------------------------------------------------
+    def seed(self, n_chunks, n_sessions):
+        per_session = max(1, n_chunks // n_sessions)
+        started = time.perf_counter()
+
+        _bulk(Session, [Session(status="RECORDING") for _ in range(n_sessions)])
+        sessions = list(Session.objects.order_by("-id")[:n_sessions])
+
+        for s in sessions:
+            _bulk(Keyword, [Keyword(session=s, word=w) for w in KEYWORDS])
+            _bulk(AudioChunk, [
+                AudioChunk(
+                    session=s,
+                    file_path=f"media/audio/bench_{s.id}_{i}.m4a",
+                    status="COMPLETE" if i < per_session - 1 else "PROCESSING",
+                )
+                for i in range(per_session)
+            ])
+
+        keywords = {}
+        for kw in Keyword.objects.filter(session__in=sessions):
+            keywords.setdefault(kw.session_id, []).append(kw)
+
+        for s in sessions:
+            chunk_ids = list(
+                AudioChunk.objects.filter(session=s).order_by("id").values_list("id", flat=True)
+            )[::2]
+
+            _bulk(Announcement, [
+                Announcement(session=s, seq=i + 1, is_closed=True)
+                for i in range((len(chunk_ids) + 4) // 5)
+            ])
+            announcements = list(Announcement.objects.filter(session=s).order_by("seq"))
+
+            _bulk(Broadcast, [
+                Broadcast(
+                    session=s,
+                    audio_chunk_id=chunk_id,
+                    announcement=announcements[i // 5],
+                    full_text="이번 역은 구로역입니다 내리실 문은 오른쪽입니다",
+                )
+                for i, chunk_id in enumerate(chunk_ids)
+            ])
+
+            broadcast_ids = list(
+                Broadcast.objects.filter(session=s).order_by("id").values_list("id", flat=True)
+            )[::4]
+            kws = keywords[s.id]
+            _bulk(Alert, [
+                Alert(session=s, broadcast_id=b_id, keyword=kws[i % len(kws)])
+                for i, b_id in enumerate(broadcast_ids)
+            ])
+
+        # 플래너 통계 갱신 (Postgres 는 트랜잭션 안에서도 가능)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        self.stdout.write(
+            f"🌱 시드 완료: sessions={n_sessions} chunks={AudioChunk.objects.count()} "
+            f"broadcasts={Broadcast.objects.count()} alerts={Alert.objects.count()} "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+        # 측정 대상: 중간 세션
+        return sessions[len(sessions) // 2]
+
+    # ------------------------------------------------------
+    # 측정 대상 쿼리 (뷰/서비스와 같은 형태)
+    # ------------------------------------------------------
+    def queries(self, session):
+        last_chunk = AudioChunk.objects.filter(session=session).order_by("-id").first()
+        announcement_ids = list(session.announcements.values_list("id", flat=True))
+
+        return [
+            # status
+            ("status: session", Session.objects.filter(id=session.id)),
+            # 카운터 키가 없을 때의 재집계 (counters.reconcile_counts)
+            *((f"status: reconcile {name}", qs) for name, qs in reconcile_queries(session.id).items()),
+            ("status: alerts", Alert.objects.filter(session=session).select_related("keyword")
+                .only("broadcast_id", "detected_at", "keyword__word")),
+            # results
+            ("results: broadcasts exists", Broadcast.objects.filter(session=session)[:1]),
+            ("results: announcements", session.announcements.prefetch_related(
+                Prefetch("broadcasts", queryset=Broadcast.objects.order_by("created_at")))),
+            ("results: group broadcasts", Broadcast.objects.filter(announcement_id__in=announcement_ids)
+                .order_by("created_at")),
+            # detect_keywords_in_chunk
+            ("detect: session keywords", Keyword.objects.filter(session=session)),
+            ("detect: keyword alerts", Alert.objects.filter(keyword__session=session).order_by("-detected_at")[:50]),
+            # 겹침 처리 (stitcher.previous_chunk)
+            ("stitch: previous chunk", AudioChunk.objects.filter(session=session, created_at__lt=last_chunk.created_at)
+                .order_by("-created_at", "-id")[:1]),
+        ]
+
+    def run_queries(self, session, repeat):
+        pattern = FULL_SCAN.get(connection.vendor)
+        lines, scans = [], []
+
+        for name, qs in self.queries(session):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(qs.all())
+                timings.append((time.perf_counter() - started) * 1000)
+
+            plan = qs.explain()
+            tables = sorted(set(pattern.findall(plan))) if pattern else []
+            if tables:
+                scans.append(f"{name} ({', '.join(tables)})")
+
+            mark = "❌" if tables else "✅"
+            self.stdout.write(f"{mark} {name:<28} {statistics.median(timings):8.2f} ms")
+            lines.append(f"## {name} — median {statistics.median(timings):.2f} ms\n{plan}\n")
+
+        return "\n".join(lines), scans
@@ -0,0 +1,43 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from apps.recordings.services.ai_client import get_client
+
+
+class Command(BaseCommand):
+    help = "AI 서버 단건(/enhance_stt) vs 배치(/enhance_stt_batch) 처리량 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("audio_path", help="테스트용 10초 음성 파일")
+        parser.add_argument("--chunks", type=int, default=32, help="보낼 청크 수")
+        parser.add_argument("--concurrency", type=int, default=4, help="단건 경로 동시 요청 수 (= 워커 수)")
+        parser.add_argument("--batch-size", type=int, default=8)
+
+    def handle(self, *args, **options):
+        path = options["audio_path"]
+        n = options["chunks"]
+        client = get_client()
+
+        # 1) 단건 경로 — 워커 여러 개가 각자 1개씩 보내는 현재 구조
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            single = list(pool.map(lambda i: client.post_audio(path, i), range(n)))
+        single_elapsed = time.monotonic() - started
+
+        # 2) 배치 경로
+        size = options["batch_size"]
+        started = time.monotonic()
+        batched = {}
+        for start in range(0, n, size):
+            ids = range(start, min(start + size, n))
+            batched.update(client.post_batch([(path, i) for i in ids]))
+        batch_elapsed = time.monotonic() - started
+
+        single_errors = sum(1 for res in single if "error" in res)
+        batch_errors = sum(1 for res in batched.values() if "error" in res)
+
+        self.stdout.write(f"단건 : {n} chunks / {single_elapsed:.2f}s = {n / single_elapsed:.2f} chunks/s (errors={single_errors})")
+        self.stdout.write(f"배치 : {n} chunks / {batch_elapsed:.2f}s = {n / batch_elapsed:.2f} chunks/s (errors={batch_errors})")
+        self.stdout.write(f"처리량 향상: x{single_elapsed / batch_elapsed:.2f}")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.recordings.services.llm_cache import STATS_KEY, cache_stats
+from apps.recordings.services.redis_client import r
+
+
+class Command(BaseCommand):
+    help = "LLM 응답 캐시 항목 수 / 함수별 hit·miss"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="hit/miss 카운터 초기화")
+
+    def handle(self, *args, **options):
+        stats = cache_stats()
+        self.stdout.write(f"🗄️ 캐시 항목: {stats['entries']}")
+        for name, s in sorted(stats["functions"].items()):
+            self.stdout.write(f"  {name:<28} hit={s['hit']:<6} miss={s['miss']:<6} hit_rate={s['hit_rate']:.1%}")
+
+        if options["reset"]:
+            r.delete(STATS_KEY)
+            self.stdout.write("♻️ 카운터 초기화")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.recordings.services.redis_client import pool_stats, server_client_stats
+
+
+class Command(BaseCommand):
+    help = "Redis 연결 풀 사용량 (현재 프로세스) + 서버 기준 프로세스별 연결 수"
+
+    def handle(self, *args, **options):
+        stats = pool_stats()
+        self.stdout.write(f"📊 pid={stats['pid']}")
+        for kind in ("default", "blocking"):
+            if kind in stats:
+                self.stdout.write(f"  {kind:<9} {stats[kind]}")
+
+        self.stdout.write("🔌 Redis 서버 연결 (client_name 별)")
+        for name, count in sorted(server_client_stats().items()):
+            self.stdout.write(f"  {name:<28} {count}")
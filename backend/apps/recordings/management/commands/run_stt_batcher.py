@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.recordings.services.ai_client import get_client
+from apps.recordings.services.stt_batcher import (
+    AI_BATCH_MAX_SIZE,
+    AI_BATCH_WINDOW_MS,
+    collect_batch,
+    publish_results,
+)
+
+
+class Command(BaseCommand):
+    help = "세션 간 STT 마이크로 배칭 디스패처 (AI_BATCHING_ENABLED=True 일 때 사용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--window-ms", type=int, default=AI_BATCH_WINDOW_MS)
+        parser.add_argument("--max-size", type=int, default=AI_BATCH_MAX_SIZE)
+
+    def handle(self, *args, **options):
+        window_ms = options["window_ms"]
+        max_size = options["max_size"]
+        client = get_client()
+
+        self.stdout.write(f"🚦 STT batcher 시작 (window={window_ms}ms, max={max_size})")
+
+        batches = 0
+        chunks = 0
+        started = time.monotonic()
+
+        while True:
+            batch = []
+            try:
+                batch = collect_batch(window_ms, max_size)
+                if not batch:
+                    continue
+
+                t = time.monotonic()
+                results = client.post_batch([(item["path"], item["chunk_id"]) for item in batch])
+                elapsed = time.monotonic() - t
+
+                # 응답에 빠진 청크도 대기 중인 태스크가 풀려나도록 error 로 채움
+                for item in batch:
+                    results.setdefault(item["chunk_id"], {"error": "missing in batch response"})
+                publish_results(results)
+            except Exception as e:
+                # 한 배치의 오류로 디스패처가 멈추지 않도록 — 대기 중인 태스크는 error 로 풀어줌
+                self.stderr.write(f"❌ 배치 처리 실패: {e}")
+                try:
+                    publish_results({item["chunk_id"]: {"error": "batch failed", "raw": str(e)} for item in batch})
+                except Exception as publish_error:
+                    self.stderr.write(f"❌ 오류 결과 전달 실패: {publish_error}")
+                    time.sleep(1)
+                continue
+
+            batches += 1
+            chunks += len(batch)
+            wait_ms = (time.time() - min(item["queued_at"] for item in batch)) * 1000
+            throughput = chunks / (time.monotonic() - started)
+
+            self.stdout.write(
+                f"📦 batch={len(batch)} infer={elapsed:.2f}s max_wait={wait_ms:.0f}ms "
+                f"avg_batch={chunks / batches:.2f} total={chunks} ({throughput:.2f} chunks/s)"
+            )
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from apps.broadcasts.models import Broadcast
+from apps.recordings.models import Session
+from apps.recordings.services.stitcher import join_broadcast_texts
+from apps.recordings.services.template_parser import TEMPLATE_MIN_CONFIDENCE, parse_announcement
+
+
+class Command(BaseCommand):
+    help = "저장된 세션의 안내방송 그룹 중 템플릿 파서로 처리되는 비율 (= 줄어드는 LLM 호출)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sessions", type=int, default=100, help="최근 세션 수")
+        parser.add_argument("--show-misses", action="store_true", help="LLM 으로 가는 텍스트 출력")
+
+    def handle(self, *args, **options):
+        sessions = Session.objects.prefetch_related(
+            Prefetch("announcements__broadcasts", queryset=Broadcast.objects.order_by("created_at"))
+        ).order_by("-created_at")[:options["sessions"]]
+
+        total = parsed = 0
+        for session in sessions:
+            groups = [list(a.broadcasts.all()) for a in session.announcements.all()]
+            texts = [join_broadcast_texts(g) for g in groups if g]
+            if not texts:
+                continue
+
+            hits = 0
+            for text in texts:
+                result = parse_announcement(text)
+                if result["confidence"] >= TEMPLATE_MIN_CONFIDENCE:
+                    hits += 1
+                elif options["show_misses"]:
+                    self.stdout.write(f"    ↳ ({result['confidence']:.2f}) {text}")
+
+            total += len(texts)
+            parsed += hits
+            self.stdout.write(f"  session {session.id:<6} groups={len(texts):<4} parsed={hits:<4} llm={len(texts) - hits}")
+
+        if not total:
+            self.stdout.write("⚠️ 분석할 안내방송 그룹이 없습니다")
+            return
+        self.stdout.write(
+            f"📉 LLM 호출: {total} → {total - parsed} "
+            f"(템플릿 처리 {parsed / total:.1%}, 기준 confidence {TEMPLATE_MIN_CONFIDENCE})"
+        )
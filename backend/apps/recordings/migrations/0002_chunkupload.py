@@ -0,0 +1,34 @@
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChunkUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField()),
+                ('sha256', models.CharField(blank=True, default='', max_length=64)),
+                ('offset', models.BigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('UPLOADING', 'Uploading'), ('COMMITTED', 'Committed')], db_index=True, default='UPLOADING', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('chunk', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload', to='recordings.audiochunk')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='recordings.session')),
+            ],
+            options={
+                'verbose_name': 'Chunk Upload',
+                'verbose_name_plural': 'Chunk Uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
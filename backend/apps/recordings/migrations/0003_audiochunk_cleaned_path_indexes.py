@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0002_chunkupload'),
+    ]
+
+    operations = [
+        # 모델에는 있었지만 마이그레이션에 빠져 있던 필드
+        migrations.AddField(
+            model_name='audiochunk',
+            name='cleaned_path',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='audiochunk',
+            index=models.Index(fields=['session', 'status'], name='chunk_session_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='audiochunk',
+            index=models.Index(fields=['session', 'created_at'], name='chunk_session_created_idx'),
+        ),
+    ]
@@ -1,3 +1,4 @@
+import uuid
 from datetime import timedelta
 from django.db import models
 from django.utils import timezone
@@ -23,6 +24,8 @@ class Session(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     expired_at = models.DateTimeField(default=default_expired_time)
     ended_at = models.DateTimeField(null=True, blank=True)
+    # 결과 내용 버전 — 방송 그룹 배정 / 키워드 감지·삭제 때마다 +1 (results GET 캐시 확인용)
+    content_version = models.PositiveIntegerField(default=0)
 
     @property
     def is_expired(self):
@@ -62,4 +65,42 @@ class AudioChunk(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Audio Chunk"
         verbose_name_plural = "Audio Chunks"
+        indexes = [
+            # 세션별 진행률 집계 (status / 카운터 재집계)
+            models.Index(fields=["session", "status"], name="chunk_session_status_idx"),
+            # 세션 내 직전 청크 조회 (겹침 처리)
+            models.Index(fields=["session", "created_at"], name="chunk_session_created_idx"),
+        ]
 
+
+# ==========================================================
+#  ChunkUpload (이어받기 가능한 스트리밍 업로드)
+#  - 본문은 media/uploads/{id}.part 에 파트 단위로 이어 씀
+#  - commit 시점에 AudioChunk 생성 + 처리 태스크 호출
+# ==========================================================
+class ChunkUpload(models.Model):
+    STATUS_CHOICES = [
+        ("UPLOADING", "Uploading"),
+        ("COMMITTED", "Committed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name="uploads")
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True, default="")
+    offset = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="UPLOADING", db_index=True)
+    chunk = models.OneToOneField(
+        AudioChunk, on_delete=models.SET_NULL, null=True, blank=True, related_name="upload"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"[{self.id}] session={self.session_id}, {self.offset}/{self.size} ({self.status})"
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Chunk Upload"
+        verbose_name_plural = "Chunk Uploads"
@@ -40,6 +40,24 @@ class AudioUploadSerializer(serializers.Serializer):
         return data
 
 
+class ChunkUploadCreateSerializer(serializers.Serializer):
+    session_id = serializers.IntegerField()
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$", required=False, default="")
+
+    def validate(self, data):
+        from apps.recordings.models import Session
+        session_id = data["session_id"]
+
+        try:
+            data["session"] = Session.objects.get(id=session_id)
+        except Session.DoesNotExist:
+            raise serializers.ValidationError("Invalid session_id")
+
+        return data
+
+
 
 
 class BroadcastSerializer(serializers.ModelSerializer):
@@ -1,19 +1,190 @@
+import os
+import random
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 
+from .stt_batcher import submit_and_wait
+
 AI_URL = settings.AI_SERVER_URL  # .env 에서 관리
+AI_BATCH_URL = getattr(settings, "AI_BATCH_URL", AI_URL + "_batch")
+AI_BATCHING_ENABLED = getattr(settings, "AI_BATCHING_ENABLED", False)
 
-def call_ai_server(audio_path,chunk_id):
-    with open(audio_path, "rb") as f:
-        response = requests.post(
-            AI_URL, 
-            files={"audio": f}, 
+AI_CONNECT_TIMEOUT = getattr(settings, "AI_CONNECT_TIMEOUT", 3.0)
+AI_READ_TIMEOUT = getattr(settings, "AI_READ_TIMEOUT", 30.0)
+AI_MAX_RETRIES = getattr(settings, "AI_MAX_RETRIES", 2)
+AI_BACKOFF_BASE = getattr(settings, "AI_BACKOFF_BASE", 0.5)
+AI_POOL_SIZE = getattr(settings, "AI_POOL_SIZE", 4)
+AI_BREAKER_THRESHOLD = getattr(settings, "AI_BREAKER_THRESHOLD", 5)
+AI_BREAKER_COOLDOWN = getattr(settings, "AI_BREAKER_COOLDOWN", 30.0)
+
+
+# ==========================================================
+#  서킷 브레이커
+#  - 연속 실패가 threshold 에 닿으면 OPEN → cooldown 동안 즉시 실패
+#  - cooldown 후 한 번 시도(HALF-OPEN), 성공하면 CLOSED 로 복귀
+# ==========================================================
+class CircuitBreaker:
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            # cooldown 이 지나면 시험 요청 1회 허용
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    print(f"🔌 AI 서버 서킷 OPEN ({self.failures}회 연속 실패)")
+                self.opened_at = time.monotonic()
+
+
+# ==========================================================
+#  워커 프로세스당 하나의 keep-alive 세션
+# ==========================================================
+class AIClient:
+
+    def __init__(self, url):
+        self.url = url
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=AI_POOL_SIZE)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        self.breaker = CircuitBreaker(AI_BREAKER_THRESHOLD, AI_BREAKER_COOLDOWN)
+
+    def _backoff(self, attempt):
+        # 지수 백오프 + full jitter
+        time.sleep(random.uniform(0, AI_BACKOFF_BASE * (2 ** attempt)))
+
+    def _post(self, url, files, data, label):
+        """재시도 + 서킷 브레이커가 적용된 POST → JSON(dict)"""
+        if not self.breaker.allow():
+            return {"error": "ai server unavailable (circuit open)"}
+
+        for attempt in range(AI_MAX_RETRIES + 1):
+            try:
+                response = self.http.post(
+                    url,
+                    files=files,
+                    data=data,
+                    timeout=(AI_CONNECT_TIMEOUT, AI_READ_TIMEOUT),
+                )
+            except requests.ConnectionError as e:
+                # 연결 실패 → 재시도
+                print(f"⚠️ AI 서버 연결 실패 ({label}, attempt={attempt + 1}):", e)
+                self.breaker.failure()
+                if attempt < AI_MAX_RETRIES and self.breaker.allow():
+                    self._backoff(attempt)
+                    continue
+                return {"error": "connection failed", "raw": str(e)}
+            except requests.Timeout as e:
+                # 추론 중일 수 있으므로 read timeout 은 재시도하지 않음
+                self.breaker.failure()
+                return {"error": "timeout", "raw": str(e)}
+
+            if response.status_code >= 500:
+                print(f"⚠️ AI 서버 {response.status_code} ({label}, attempt={attempt + 1})")
+                self.breaker.failure()
+                if attempt < AI_MAX_RETRIES and self.breaker.allow():
+                    self._backoff(attempt)
+                    continue
+            else:
+                self.breaker.success()
+            break
+
+        # 상태 코드가 400~500이어도 일단 body를 읽자
+        try:
+            return response.json()
+        except Exception:
+            return {"error": "invalid JSON", "raw": response.text}
+
+    def post_audio(self, audio_path, chunk_id):
+        with open(audio_path, "rb") as f:
+            audio = f.read()
+
+        return self._post(
+            self.url,
+            files={"audio": (os.path.basename(audio_path), audio)},
             data={"chunk_id": chunk_id},
-            timeout=30
-            )
-        
-    # 상태 코드가 400~500이어도 일단 body를 읽자
-    try:
-        return response.json()
-    except Exception:
-        return {"error": "invalid JSON", "raw": response.text}
+            label=f"chunk={chunk_id}",
+        )
+
+    def post_batch(self, items):
+        """
+        items: [(audio_path, chunk_id), ...] 를 배치 라우트로 한 번에 전송.
+        반환: {chunk_id: result dict} — 실패 시 모든 청크에 같은 error dict,
+        파일을 읽지 못한 청크는 그 청크만 error dict (나머지는 그대로 전송)
+        """
+        results = {}
+        files = []
+        chunk_ids = []
+        for audio_path, chunk_id in items:
+            try:
+                with open(audio_path, "rb") as f:
+                    files.append(("audio", (os.path.basename(audio_path), f.read())))
+            except OSError as e:
+                results[chunk_id] = {"error": "audio file unavailable", "raw": str(e)}
+                continue
+            chunk_ids.append(chunk_id)
+
+        if not chunk_ids:
+            return results
+
+        body = self._post(
+            AI_BATCH_URL,
+            files=files,
+            data={"chunk_ids": chunk_ids},
+            label=f"batch={len(chunk_ids)}",
+        )
+
+        if "results" not in body:
+            results.update({chunk_id: body for chunk_id in chunk_ids})
+        else:
+            results.update({int(res["chunk_id"]): res for res in body["results"]})
+        return results
+
+
+_client = None
+_client_pid = None
+
+
+def get_client():
+    """fork 된 Celery 워커가 부모의 연결을 물려받지 않도록 pid 별로 생성"""
+    global _client, _client_pid
+
+    if _client is None or _client_pid != os.getpid():
+        _client = AIClient(AI_URL)
+        _client_pid = os.getpid()
+
+    return _client
+
+
+def call_ai_server(audio_path,chunk_id):
+    # 배치 디스패처가 켜져 있으면 다른 세션 청크와 묶어서 전송
+    if AI_BATCHING_ENABLED:
+        result = submit_and_wait(audio_path, chunk_id)
+        if result is not None:
+            return result
+
+    return get_client().post_audio(audio_path, chunk_id)
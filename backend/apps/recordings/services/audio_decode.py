@@ -0,0 +1,91 @@
+import subprocess
+import wave
+
+import numpy as np
+
+try:
+    import av  # PyAV — libavcodec 를 프로세스 안에서 직접 사용
+except ImportError:
+    av = None
+
+
+# ==========================================================
+#  오디오 디코딩 → 16kHz mono float32 PCM (NumPy)
+#  - 16kHz mono 16bit WAV 는 표준 라이브러리로 바로 읽음
+#  - 그 외(m4a/aac/mp3)는 PyAV 로 프로세스 안에서 디코딩 + 리샘플
+#    (파일마다 ffmpeg 프로세스를 띄우지 않고, 임시 WAV 파일도 만들지 않음)
+#  - PyAV 가 없으면 ffmpeg 출력(s16le)을 파이프로 받는 방식으로 대체
+# ==========================================================
+
+SAMPLE_RATE = 16000
+
+
+def _to_float(samples):
+    return samples.astype(np.float32) / 32768.0
+
+
+def _read_wav(path):
+    with wave.open(path, "rb") as w:
+        if w.getnchannels() != 1 or w.getsampwidth() != 2 or w.getframerate() != SAMPLE_RATE:
+            return None
+        raw = w.readframes(w.getnframes())
+    return _to_float(np.frombuffer(raw, dtype="<i2"))
+
+
+def _read_av(path):
+    with av.open(path) as container:
+        stream = container.streams.audio[0]
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+
+        parts = []
+        for frame in container.decode(stream):
+            for out in resampler.resample(frame):
+                parts.append(out.to_ndarray().reshape(-1))
+        # 리샘플러 내부에 남은 샘플
+        for out in resampler.resample(None):
+            parts.append(out.to_ndarray().reshape(-1))
+
+    if not parts:
+        return np.zeros(0, dtype=np.float32)
+    return _to_float(np.concatenate(parts))
+
+
+def _read_ffmpeg(path):
+    command = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-i", path,
+        "-f", "s16le",
+        "-ac", "1",
+        "-ar", str(SAMPLE_RATE),
+        "-",
+    ]
+    proc = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    return _to_float(np.frombuffer(proc.stdout, dtype="<i2"))
+
+
+def decode_pcm(path):
+    """
+    반환: 16kHz mono float32 배열 ([-1, 1]) / 디코딩 실패 시 None
+    """
+    try:
+        if path.lower().endswith(".wav"):
+            pcm = _read_wav(path)
+            if pcm is not None:
+                return pcm
+        if av is not None:
+            return _read_av(path)
+        return _read_ffmpeg(path)
+    except Exception as e:
+        # av.FFmpegError / wave.Error / CalledProcessError / OSError 등
+        print(f"[ERROR] 오디오 디코딩 실패 ({path}):", e)
+        return None
+
+
+def write_wav(path, pcm):
+    """float32 PCM → 16kHz mono 16bit WAV"""
+    samples = (np.clip(pcm, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(samples.tobytes())
@@ -0,0 +1,153 @@
+import re
+from difflib import SequenceMatcher
+
+from django.conf import settings
+
+from apps.recordings.services.redis_client import r
+from .station_index import jamo
+from .stitcher import broadcast_text
+
+
+# ==========================================================
+#  로컬 연속성 점수 + 세션별 LLM 호출 예산
+#  - 규칙 0~4 로 판단이 안 된 방송 쌍만 여기로 온다
+#    → 간격 > TIME_CLOSE_SECONDS, 앞 문장 완결, 역명이 같지 않음,
+#      두 문장이 모두 안내방송 키워드를 갖지는 않음 (이 입력 범위에 맞춰 가중치 설정)
+#  - 점수가 애매한 구간일 때만, 예산 안에서 LLM 에 묻는다
+# ==========================================================
+
+CONTINUATION_LOW = getattr(settings, "CONTINUATION_LOW", 0.35)
+CONTINUATION_HIGH = getattr(settings, "CONTINUATION_HIGH", 0.65)
+CONTINUATION_LLM_BUDGET = getattr(settings, "CONTINUATION_LLM_BUDGET", 20)
+
+# 이 간격(초) 이하는 규칙 2 (merger.is_time_close) 에서 이미 같은 방송으로 판단
+TIME_CLOSE_SECONDS = 12
+# 이 시간(초) 이상 벌어지면 시간 점수 0
+MAX_GAP_SECONDS = 60
+# 꼬리/머리 비교 글자 수
+EDGE_CHARS = 8
+
+WEIGHTS = {
+    "time": 0.40,
+    "station": 0.20,
+    "keyword": 0.25,
+    "jamo": 0.15,
+}
+
+
+def _words(text):
+    return set(re.findall(r"[가-힣a-zA-Z0-9]{2,}", text))
+
+
+def continuation_score(prev, curr, prev_feat, curr_feat) -> float:
+    """
+    0~1 사이 연속성 점수 (높을수록 같은 안내방송).
+    - time   : TIME_CLOSE_SECONDS 직후 1 → MAX_GAP_SECONDS 에서 0
+    - station: 한쪽(또는 양쪽) 없음 0.5 / 불일치 0 (일치는 규칙 0 에서 처리)
+    - keyword: 두 문장 단어 집합의 Jaccard
+    - jamo   : 앞 문장 꼬리와 뒷 문장 머리의 자모 유사도
+    최대값: 역명 없음 0.90 / 역명 불일치 0.80
+    """
+    gap = (curr.created_at - prev.created_at).total_seconds()
+    window = MAX_GAP_SECONDS - TIME_CLOSE_SECONDS
+    time_score = min(1.0, max(0.0, 1 - (gap - TIME_CLOSE_SECONDS) / window))
+
+    prev_station = prev_feat["station_guess"]
+    curr_station = curr_feat["station_guess"]
+    if prev_station and curr_station:
+        station_score = 1.0 if prev_station == curr_station else 0.0
+    else:
+        station_score = 0.5
+
+    prev_text, curr_text = broadcast_text(prev), broadcast_text(curr)
+
+    prev_words, curr_words = _words(prev_text), _words(curr_text)
+    union = prev_words | curr_words
+    keyword_score = len(prev_words & curr_words) / len(union) if union else 0.0
+
+    tail = jamo(prev_text.strip()[-EDGE_CHARS:])
+    head = jamo(curr_text.strip()[:EDGE_CHARS])
+    jamo_score = SequenceMatcher(None, tail, head).ratio() if tail and head else 0.0
+
+    score = (
+        WEIGHTS["time"] * time_score
+        + WEIGHTS["station"] * station_score
+        + WEIGHTS["keyword"] * keyword_score
+        + WEIGHTS["jamo"] * jamo_score
+    )
+    return round(score, 4)
+
+
+# ==========================================================
+#  세션별 LLM 예산 / 통계 (Redis 해시: continuation:{session_id})
+# ==========================================================
+STATS_TTL = 60 * 60 * 24
+
+
+def _stats_key(session_id):
+    return f"continuation:{session_id}"
+
+
+class ContinuationBudget:
+    """
+    세션 하나의 LLM 연속성 판단 예산.
+    llm_calls          : 실제 LLM 호출 수
+    avoided_by_score   : 점수로 바로 결정되어 생략된 호출 수
+    avoided_by_budget  : 애매했지만 예산 소진으로 점수로 결정한 수
+    """
+
+    def __init__(self, session_id, limit=None):
+        self.key = _stats_key(session_id)
+        self.limit = CONTINUATION_LLM_BUDGET if limit is None else limit
+
+    def _incr(self, field, amount=1):
+        pipe = r.pipeline()
+        pipe.hincrby(self.key, field, amount)
+        pipe.expire(self.key, STATS_TTL)
+        return pipe.execute()[0]
+
+    def try_consume(self) -> bool:
+        """예산이 남아 있으면 1 차감하고 True"""
+        used = self._incr("llm_calls")
+        if used > self.limit:
+            self._incr("llm_calls", -1)
+            return False
+        return True
+
+    def record(self, field):
+        self._incr(field)
+
+
+def continuation_stats(session_id) -> dict:
+    raw = r.hgetall(_stats_key(session_id))
+    stats = {k.decode(): int(v) for k, v in raw.items()}
+    return {
+        "llm_calls": stats.get("llm_calls", 0),
+        "avoided_by_score": stats.get("avoided_by_score", 0),
+        "avoided_by_budget": stats.get("avoided_by_budget", 0),
+        "budget": CONTINUATION_LLM_BUDGET,
+    }
+
+
+def decide_continuation(prev, curr, prev_feat, curr_feat, ask_llm) -> bool:
+    """
+    규칙 5 (마지막 수단) — 점수로 먼저 판단하고, 애매하면 예산 안에서 LLM.
+    ask_llm: (prev_text, curr_text) -> bool
+    """
+    score = continuation_score(prev, curr, prev_feat, curr_feat)
+    budget = ContinuationBudget(curr.session_id)
+
+    if score >= CONTINUATION_HIGH or score <= CONTINUATION_LOW:
+        budget.record("avoided_by_score")
+        return score >= CONTINUATION_HIGH
+
+    if not budget.try_consume():
+        budget.record("avoided_by_budget")
+        print(f"⚠️ 연속성 LLM 예산 소진 (session={curr.session_id}, score={score})")
+        return score >= (CONTINUATION_LOW + CONTINUATION_HIGH) / 2
+
+    print(f"🤖 연속성 LLM 판단 (session={curr.session_id}, score={score})")
+    try:
+        return ask_llm(broadcast_text(prev), broadcast_text(curr))
+    except:
+        return score >= (CONTINUATION_LOW + CONTINUATION_HIGH) / 2
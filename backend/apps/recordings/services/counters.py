@@ -0,0 +1,110 @@
+from apps.keywords.models import Alert
+from apps.recordings.models import AudioChunk
+from apps.recordings.services.redis_client import r
+
+
+# ==========================================================
+#  세션 진행 카운터 (Redis sorted set: session_counts:{session_id}:{field})
+#  - received  : 업로드된 청크 ID
+#  - completed : 처리 끝난 청크 ID (무음 포함)
+#  - silent    : 방송 없이 끝난 청크 ID (VAD / 빈 STT)
+#  - alerts    : 키워드 알림 ID
+#  개수 = ZCARD, member = score = 행 ID → 같은 ID 를 두 번 넣어도 한 번만 셈
+#  키가 없을 때(만료/초기)는 DB 의 ID 를 합쳐 넣고 session_counts:{session_id} 표시
+#  → DB 재집계와 처리 중 추가가 겹쳐도 중복 집계되지 않음 (합집합)
+# ==========================================================
+
+FIELDS = ("received", "completed", "silent", "alerts")
+COUNTS_TTL = 60 * 60 * 24
+
+
+def _key(session_id):
+    return f"session_counts:{session_id}"
+
+
+def _field_key(session_id, field):
+    return f"{_key(session_id)}:{field}"
+
+
+def _keys(session_id):
+    return [_key(session_id), *(_field_key(session_id, f) for f in FIELDS)]
+
+
+def mark_counted(session_id, field, ids):
+    """행 ID 들을 field 에 추가 (이미 있으면 무시) — 모든 키의 TTL 을 함께 갱신"""
+    if not ids:
+        return
+    pipe = r.pipeline(transaction=False)
+    pipe.zadd(_field_key(session_id, field), {i: i for i in ids})
+    for key in _keys(session_id):
+        pipe.expire(key, COUNTS_TTL)
+    pipe.execute()
+
+
+def reconcile_queries(session_id) -> dict:
+    """재집계 쿼리 (bench_queries 도 같은 쿼리를 측정)"""
+    return {
+        "chunks": AudioChunk.objects.filter(session_id=session_id).values_list("id", "status"),
+        "silent": (
+            AudioChunk.objects
+            .filter(session_id=session_id, status="COMPLETE", broadcasts__isnull=True)
+            .values_list("id", flat=True)
+        ),
+        "alerts": Alert.objects.filter(session_id=session_id).values_list("id", flat=True),
+    }
+
+
+def reconcile_counts(session_id) -> dict:
+    """DB 의 ID 를 Redis 에 합쳐 넣고 개수를 반환"""
+    queries = reconcile_queries(session_id)
+    chunks = list(queries["chunks"])
+    silent = list(queries["silent"])
+    alerts = list(queries["alerts"])
+
+    ids = {
+        "received": [i for i, _ in chunks],
+        "completed": [i for i, status in chunks if status == "COMPLETE"],
+        "silent": silent,
+        "alerts": alerts,
+    }
+
+    pipe = r.pipeline()
+    for field, members in ids.items():
+        if members:
+            pipe.zadd(_field_key(session_id, field), {i: i for i in members})
+    pipe.set(_key(session_id), 1)
+    for key in _keys(session_id):
+        pipe.expire(key, COUNTS_TTL)
+    pipe.execute()
+
+    # 그 사이 reset_counts 로 지워졌으면 방금 읽은 DB 기준 값
+    return _read(session_id) or {
+        **{field: len(members) for field, members in ids.items()},
+        "last_alert_id": max(alerts, default=0),
+    }
+
+
+def _read(session_id):
+    pipe = r.pipeline(transaction=False)
+    pipe.exists(_key(session_id))
+    for field in FIELDS:
+        pipe.zcard(_field_key(session_id, field))
+    pipe.zrange(_field_key(session_id, "alerts"), -1, -1)
+    exists, *cards, last_alert = pipe.execute()
+
+    counts = dict(zip(FIELDS, cards))
+    counts["last_alert_id"] = int(last_alert[0]) if last_alert else 0
+    return counts if exists else None
+
+
+def session_counts(session_id) -> dict:
+    """{received, completed, silent, alerts, last_alert_id}"""
+    counts = _read(session_id)
+    if counts is None:
+        return reconcile_counts(session_id)
+    return counts
+
+
+def reset_counts(session_id):
+    """알림/청크가 삭제되는 경우 — 다음 조회에서 DB 로 재집계"""
+    r.delete(*_keys(session_id))
@@ -0,0 +1,124 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+
+from apps.broadcasts.models import Announcement, Broadcast
+from apps.recordings.models import Session
+from .merger import is_same_announcement
+from .results import bump_content_version
+
+
+# ==========================================================
+#  온라인 안내방송 그룹핑
+#  - process_audio_chunk 에서 Broadcast 생성 직후 호출
+#  - 세션의 열린 그룹을 이어가거나, 닫고 새 그룹을 시작
+# ==========================================================
+
+# 동시에 다른 청크가 같은 세션에 붙었을 때 재판정 횟수
+MAX_ASSIGN_RETRIES = 3
+
+
+def _open_announcement(session_id):
+    return (
+        Announcement.objects
+        .filter(session_id=session_id, is_closed=False)
+        .order_by("-seq")
+        .first()
+    )
+
+
+def _last_broadcast(announcement):
+    return announcement.broadcasts.order_by("-created_at", "-id").first()
+
+
+def _lock_session(session_id):
+    """세션 행 잠금 — 같은 세션의 그룹 배정/seq 계산을 직렬화 (트랜잭션 안에서 호출)"""
+    list(Session.objects.select_for_update().filter(id=session_id).values_list("id", flat=True))
+
+
+def _start_announcement(session_id):
+    """
+    seq = 세션 내 최대 + 1 로 새 그룹 생성.
+    행 잠금이 없는 DB(SQLite)에서 동시에 같은 seq 를 잡으면 (session, seq) 중복 → 다시 계산.
+    """
+    for attempt in range(MAX_ASSIGN_RETRIES):
+        last_seq = (
+            Announcement.objects
+            .filter(session_id=session_id)
+            .aggregate(m=Max("seq"))["m"]
+        ) or 0
+        try:
+            with transaction.atomic():
+                return Announcement.objects.create(session_id=session_id, seq=last_seq + 1)
+        except IntegrityError:
+            if attempt == MAX_ASSIGN_RETRIES - 1:
+                raise
+
+
+def assign_announcement(broadcast):
+    """
+    broadcast 를 세션의 안내방송 그룹에 배정하고 그 그룹을 반환한다.
+    판정(LLM 포함 가능)은 트랜잭션 밖에서 하고,
+    쓰기 직전에 열린 그룹의 마지막 방송이 그대로인지 다시 확인한다.
+    """
+    session_id = broadcast.session_id
+
+    for _ in range(MAX_ASSIGN_RETRIES):
+        current = _open_announcement(session_id)
+        prev = _last_broadcast(current) if current else None
+
+        same = prev is not None and is_same_announcement(prev, broadcast)
+
+        with transaction.atomic():
+            _lock_session(session_id)
+
+            # 판정 사이에 다른 청크가 붙었으면 다시 판정
+            latest = _open_announcement(session_id)
+            latest_id = latest.id if latest else None
+            current_id = current.id if current else None
+            if latest_id != current_id:
+                continue
+            if current and _last_broadcast(current) != prev:
+                continue
+
+            if current is None:
+                target = _start_announcement(session_id)
+            elif same or prev is None:
+                target = current
+            else:
+                current.is_closed = True
+                current.save(update_fields=["is_closed", "updated_at"])
+                target = _start_announcement(session_id)
+
+            broadcast.announcement = target
+            broadcast.save(update_fields=["announcement"])
+            bump_content_version(session_id)
+            return target
+
+    # 경합이 계속되면 마지막으로 본 열린 그룹에 붙임
+    with transaction.atomic():
+        _lock_session(session_id)
+        target = _open_announcement(session_id) or _start_announcement(session_id)
+        broadcast.announcement = target
+        broadcast.save(update_fields=["announcement"])
+        bump_content_version(session_id)
+    return target
+
+
+def close_open_announcement(session):
+    """세션 종료 시 마지막 열린 그룹을 닫는다."""
+    Announcement.objects.filter(session=session, is_closed=False).update(is_closed=True)
+
+
+def assign_pending_broadcasts(session):
+    """
+    그룹이 없는 방송(그룹 테이블 도입 이전 데이터)을 시간순으로 배정.
+    이미 모두 배정된 세션이면 쿼리 1회로 끝난다.
+    (LLM 판단이 섞일 수 있으므로 결과 생성 태스크에서만 호출 — GET 경로 금지)
+    """
+    pending = (
+        Broadcast.objects
+        .filter(session=session, announcement__isnull=True)
+        .order_by("created_at", "id")
+    )
+    for b in pending:
+        assign_announcement(b)
@@ -1,8 +1,17 @@
 import os
 from openai import OpenAI
+from django.conf import settings
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from .llm_cache import llm_cached
 
+client = OpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    timeout=settings.LLM_CALL_TIMEOUT,
+    max_retries=settings.LLM_MAX_RETRIES,
+)
+MODEL = "gpt-4o-mini"
+
+@llm_cached(MODEL)
 def correct_transcription(text: str) -> str:
     prompt = f"""
 당신은 한국 지하철 안내방송을 복원하는 전문가입니다.
@@ -46,7 +55,7 @@ def correct_transcription(text: str) -> str:
 """
 
     res = client.chat.completions.create(
-        model="gpt-4o-mini",
+        model=MODEL,
         messages=[{"role": "user", "content": prompt}]
     )
     return res.choices[0].message.content.strip()
@@ -56,6 +65,7 @@ def correct_transcription(text: str) -> str:
 
 
 
+@llm_cached(MODEL)
 def summarize_text(text: str) -> str:
     prompt = f"""
 당신은 한국 지하철 안내방송 요약기입니다.
@@ -85,7 +95,7 @@ def summarize_text(text: str) -> str:
 """
 
     res = client.chat.completions.create(
-        model="gpt-4o-mini",
+        model=MODEL,
         response_format={"type": "json_object"},
         messages=[{"role": "user", "content": prompt}]
     )
@@ -114,7 +124,7 @@ def is_continuation(prev: str, current: str) -> bool:
 """
 
     res = client.chat.completions.create(
-        model="gpt-4o-mini",
+        model=MODEL,
         messages=[{"role": "user", "content": prompt}],
         max_tokens=5
     )
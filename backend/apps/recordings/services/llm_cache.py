@@ -0,0 +1,141 @@
+import functools
+import hashlib
+import inspect
+import json
+import re
+import time
+import unicodedata
+
+import redis
+from django.conf import settings
+
+from apps.recordings.services.redis_client import LazyScript, r
+
+
+# ==========================================================
+#  LLM 응답 캐시 (세션 · 사용자 공통)
+#  - 키: 함수 이름 + 모델 + 프롬프트 버전 + 정규화한 입력 텍스트의 해시
+#    (프롬프트 버전 기본값은 함수 소스 해시 → 프롬프트를 고치면 자동으로 새 키)
+#  - Redis 문자열 + TTL (조회될 때마다 연장), 만료 시각 sorted set 으로
+#    LLM_CACHE_MAX_ENTRIES 개 유지 — 만료 시각 = 마지막 사용 + TTL 이므로 점수 순서가 곧 LRU
+#    저장할 때 이미 만료된 항목을 먼저 정리한 뒤 개수 제한 적용
+#  - llm_cache:stats 해시에 함수별 hit / miss 카운트
+#  - Redis 오류 시 캐시 없이 그대로 호출
+# ==========================================================
+
+LLM_CACHE_ENABLED = getattr(settings, "LLM_CACHE_ENABLED", True)
+LLM_CACHE_TTL = getattr(settings, "LLM_CACHE_TTL", 60 * 60 * 24 * 7)
+LLM_CACHE_MAX_ENTRIES = getattr(settings, "LLM_CACHE_MAX_ENTRIES", 50000)
+
+LRU_KEY = "llm_cache:lru"
+STATS_KEY = "llm_cache:stats"
+
+
+# 값 조회 + (있으면) TTL / 만료 시각 연장 + hit/miss 카운트 — 왕복 1회
+# ARGV: 함수 이름, TTL, 새 만료 시각
+_get_script = LazyScript("""
+local value = redis.call('get', KEYS[1])
+if value then
+    redis.call('expire', KEYS[1], ARGV[2])
+    redis.call('zadd', KEYS[2], 'XX', ARGV[3], KEYS[1])
+    redis.call('hincrby', KEYS[3], ARGV[1] .. ':hit', 1)
+else
+    redis.call('hincrby', KEYS[3], ARGV[1] .. ':miss', 1)
+end
+return value
+""")
+
+# 만료된 항목 정리 + 저장 + 만료 시각 기록 + 초과분을 만료가 가까운(오래 안 쓴) 순으로 삭제
+# ARGV: 값, TTL, 현재 시각, 최대 항목 수
+_set_script = LazyScript("""
+redis.call('zremrangebyscore', KEYS[2], '-inf', ARGV[3])
+redis.call('set', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('zadd', KEYS[2], tonumber(ARGV[3]) + tonumber(ARGV[2]), KEYS[1])
+local overflow = redis.call('zcard', KEYS[2]) - tonumber(ARGV[4])
+if overflow > 0 then
+    local evicted = redis.call('zpopmin', KEYS[2], overflow)
+    for i = 1, #evicted, 2 do
+        redis.call('del', evicted[i])
+    end
+end
+return overflow
+""")
+
+
+def normalize_input(text: str) -> str:
+    """유니코드 정규화(NFC) + 공백 정리 — 같은 방송의 사소한 차이는 같은 키로"""
+    text = unicodedata.normalize("NFC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _source_version(func) -> str:
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        return "0"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:12]
+
+
+def cache_key(name, model, prompt_version, texts) -> str:
+    raw = json.dumps(
+        [name, model, prompt_version, [normalize_input(t) for t in texts]],
+        ensure_ascii=False,
+    )
+    return "llm_cache:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def llm_cached(model, prompt_version=None, cacheable=None):
+    """
+    텍스트 인자만 받는 LLM 함수용 데코레이터.
+    - cacheable(result): False 면 저장하지 않음 (포맷 실패 기본값 등)
+    - 예외는 그대로 전파 (저장 안 함)
+    """
+    def decorator(func):
+        name = func.__qualname__
+        version = prompt_version or _source_version(func)
+
+        @functools.wraps(func)
+        def wrapper(*texts):
+            if not LLM_CACHE_ENABLED:
+                return func(*texts)
+
+            key = cache_key(name, model, version, texts)
+            try:
+                raw = _get_script(
+                    keys=[key, LRU_KEY, STATS_KEY],
+                    args=[name, LLM_CACHE_TTL, time.time() + LLM_CACHE_TTL],
+                )
+            except redis.RedisError as e:
+                print("[WARN] LLM 캐시 조회 실패:", e)
+                return func(*texts)
+            if raw is not None:
+                return json.loads(raw)
+
+            result = func(*texts)
+            if cacheable is None or cacheable(result):
+                try:
+                    _set_script(
+                        keys=[key, LRU_KEY],
+                        args=[json.dumps(result, ensure_ascii=False), LLM_CACHE_TTL, time.time(), LLM_CACHE_MAX_ENTRIES],
+                    )
+                except redis.RedisError as e:
+                    print("[WARN] LLM 캐시 저장 실패:", e)
+            return result
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+def cache_stats() -> dict:
+    """함수별 {"hit": n, "miss": n, "hit_rate": x} + 현재 항목 수"""
+    raw = r.hgetall(STATS_KEY)
+    stats = {}
+    for field, value in raw.items():
+        name, kind = field.decode().rsplit(":", 1)
+        stats.setdefault(name, {"hit": 0, "miss": 0})[kind] = int(value)
+    for s in stats.values():
+        total = s["hit"] + s["miss"]
+        s["hit_rate"] = round(s["hit"] / total, 3) if total else 0.0
+    # 아직 정리되지 않은 만료 항목은 제외
+    return {"entries": r.zcount(LRU_KEY, time.time(), "+inf"), "functions": stats}
@@ -0,0 +1,69 @@
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+
+
+# ==========================================================
+#  LLM 병렬 실행 풀
+#  - 프로세스당 하나의 스레드 풀로 동시 호출 수를 제한
+#  - 결과는 항상 입력 순서대로 반환
+#  - 호출별 타임아웃: OpenAI 클라이언트(LLM_CALL_TIMEOUT, 재시도 LLM_MAX_RETRIES)
+#    + 결과 대기 마감 — 넘기면 FAILED (재시도는 결과 생성 쪽 백오프가 담당)
+# ==========================================================
+
+LLM_MAX_CONCURRENCY = getattr(settings, "LLM_MAX_CONCURRENCY", 8)
+LLM_CALL_TIMEOUT = getattr(settings, "LLM_CALL_TIMEOUT", 30.0)
+
+# 실패한 호출 표시 (결과 캐시에 저장하지 않기 위함)
+FAILED = object()
+
+_executor = None
+_executor_pid = None
+
+
+def get_executor():
+    """fork 된 워커에서는 부모의 풀을 쓰지 않고 새로 만든다."""
+    global _executor, _executor_pid
+
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ThreadPoolExecutor(
+            max_workers=LLM_MAX_CONCURRENCY,
+            thread_name_prefix="llm",
+        )
+        _executor_pid = os.getpid()
+
+    return _executor
+
+
+def run_parallel(calls, on_result=None):
+    """
+    calls: [(fn, args), ...] 를 동시에 실행한다.
+    반환: 같은 순서의 결과 목록 (예외가 난 호출은 FAILED)
+    on_result(done, total): 결과를 하나 모을 때마다 호출 (진행률 보고용)
+    """
+    executor = get_executor()
+    futures = [executor.submit(fn, *args) for fn, args in calls]
+
+    # 풀이 한 번에 LLM_MAX_CONCURRENCY 개씩 처리 → 차례마다 호출 1회 분의 시간
+    waves = math.ceil(len(calls) / LLM_MAX_CONCURRENCY)
+    deadline = time.monotonic() + LLM_CALL_TIMEOUT * waves
+
+    results = []
+    for (fn, _), future in zip(calls, futures):
+        try:
+            results.append(future.result(timeout=max(0, deadline - time.monotonic())))
+        except FutureTimeout:
+            future.cancel()
+            print(f"⏱️ LLM 호출 시간 초과 ({fn.__name__})")
+            results.append(FAILED)
+        except Exception as e:
+            print(f"❌ LLM 호출 실패 ({fn.__name__}):", e)
+            results.append(FAILED)
+
+        if on_result:
+            on_result(len(results), len(calls))
+
+    return results
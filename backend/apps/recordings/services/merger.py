@@ -1,5 +1,7 @@
 from .llm import is_continuation
 from .nlp import guess_station_name
+from .continuation import TIME_CLOSE_SECONDS, decide_continuation
+from .stitcher import broadcast_text
 
 ENDING_PATTERNS = ("입니다", "입니다.", "다.", "요.", "요")
 
@@ -23,7 +25,7 @@ def is_time_close(prev, curr) -> bool:
     연속 방송은 보통 5~7초 간격.
     너무 길면 새로운 방송.
     """
-    return (curr.created_at - prev.created_at).total_seconds() <= 12
+    return (curr.created_at - prev.created_at).total_seconds() <= TIME_CLOSE_SECONDS
 
 
 def is_intro_broadcast(text: str) -> bool:
@@ -34,91 +36,97 @@ def is_intro_broadcast(text: str) -> bool:
     return "이번 역은" in text or "이번역은" in text
 
 
-def group_broadcasts(broadcasts):
-    if not broadcasts:
-        return []
+def extract_features(text: str) -> dict:
+    """
+    그룹핑에 필요한 텍스트 특징을 한 번에 계산한다.
+    process_audio_chunk 에서 Broadcast 생성 시 호출해 컬럼으로 저장.
+    """
+    return {
+        "station_guess": guess_station_name(text),
+        "is_intro": is_intro_broadcast(text),
+        "is_incomplete": is_sentence_incomplete(text),
+        "has_broadcast_keyword": is_broadcast_keyword(text),
+    }
 
-    groups = []
-    cur_group = [broadcasts[0]]
 
-    for i in range(1, len(broadcasts)):
-        prev = cur_group[-1]
-        curr = broadcasts[i]
+def broadcast_features(b) -> dict:
+    """
+    Broadcast 에 저장된 특징을 읽는다.
+    특징 컬럼 도입 이전에 생성된 방송(is_intro 가 null)만 즉석 계산.
+    """
+    if b.is_intro is None:
+        return extract_features(broadcast_text(b))
 
-        prev_text = prev.full_text
-        curr_text = curr.full_text
+    return {
+        "station_guess": b.station_guess,
+        "is_intro": b.is_intro,
+        "is_incomplete": b.is_incomplete,
+        "has_broadcast_keyword": b.has_broadcast_keyword,
+    }
 
-        # ------------------------------
-        # 0) 역명 기반 비교
-        # ------------------------------
-        prev_station = guess_station_name(prev_text)
-        curr_station = guess_station_name(curr_text)
 
-        if prev_station and curr_station:
-            if prev_station == curr_station:
-                cur_group.append(curr)
-                continue
+def is_same_announcement(prev, curr, prev_feat=None, curr_feat=None) -> bool:
+    """
+    연속된 두 방송(prev → curr)이 같은 안내방송인지 판단한다.
+    grouper 가 청크 도착 시(온라인) 호출.
+    """
+    prev_feat = prev_feat or broadcast_features(prev)
+    curr_feat = curr_feat or broadcast_features(curr)
 
+    # ------------------------------
+    # 청크 경계에서 잘린 단어가 다음 청크에서 이어짐 (겹침 정렬로 확인) → 같은 방송
+    # ------------------------------
+    if getattr(curr, "continues_previous", False):
+        return True
 
-        # ------------------------------
-        # 1) '이번 역은'이 등장하면 새로운 방송 시작으로 간주
-        # 단, 바로 전 방송과 역명이 같으면 계속 이어짐
-        # ------------------------------
-        if is_intro_broadcast(curr_text):
+    # ------------------------------
+    # 0) 역명 기반 비교 (저장된 추정 역명 사용)
+    # ------------------------------
+    prev_station = prev_feat["station_guess"]
+    curr_station = curr_feat["station_guess"]
 
-            # 역명이 동일하면 이어지는 경우가 꽤 많음
-            if prev_station and curr_station and prev_station == curr_station:
-                cur_group.append(curr)
-                continue
+    if prev_station and curr_station:
+        if prev_station == curr_station:
+            return True
 
-            # 아니면 새로운 방송 시작으로 처리
-            groups.append(cur_group)
-            cur_group = [curr]
-            continue
 
+    # ------------------------------
+    # 1) '이번 역은'이 등장하면 새로운 방송 시작으로 간주
+    # 단, 바로 전 방송과 역명이 같으면 계속 이어짐
+    # ------------------------------
+    if curr_feat["is_intro"]:
 
-        # ------------------------------
-        # 2) 시간 간격 판단 
-        # ------------------------------
-        if is_time_close(prev, curr):
-            cur_group.append(curr)
-            continue
+        # 역명이 동일하면 이어지는 경우가 꽤 많음
+        if prev_station and curr_station and prev_station == curr_station:
+            return True
 
+        # 아니면 새로운 방송 시작으로 처리
+        return False
 
-        # ------------------------------
-        # 3) 문장 끝이 불완전하면 이어짐
-        # ------------------------------
-        if is_sentence_incomplete(prev_text):
-            cur_group.append(curr)
-            continue
 
+    # ------------------------------
+    # 2) 시간 간격 판단 
+    # ------------------------------
+    if is_time_close(prev, curr):
+        return True
 
-        # ------------------------------
-        # 4) 안내방송 키워드 기반 판단
-        # 두 문장 모두 안내방송적이면 이어질 가능성 높음
-        # ------------------------------
-        if is_broadcast_keyword(prev_text) and is_broadcast_keyword(curr_text):
-            cur_group.append(curr)
-            continue
 
+    # ------------------------------
+    # 3) 문장 끝이 불완전하면 이어짐
+    # ------------------------------
+    if prev_feat["is_incomplete"]:
+        return True
 
-        # ------------------------------
-        # 5) 마지막 수단 - LLM 문맥 판단
-        # ------------------------------
-        try:
-            if is_continuation(prev_text, curr_text):
-                cur_group.append(curr)
-                continue
-        except:
-            pass
 
-        # ------------------------------
-        # 새 그룹 생성
-        # ------------------------------
-        groups.append(cur_group)
-        cur_group = [curr]
+    # ------------------------------
+    # 4) 안내방송 키워드 기반 판단
+    # 두 문장 모두 안내방송적이면 이어질 가능성 높음
+    # ------------------------------
+    if prev_feat["has_broadcast_keyword"] and curr_feat["has_broadcast_keyword"]:
+        return True
 
-    if cur_group:
-        groups.append(cur_group)
 
-    return groups
+    # ------------------------------
+    # 5) 마지막 수단 - 로컬 연속성 점수, 애매할 때만 LLM (세션별 예산 내)
+    # ------------------------------
+    return decide_continuation(prev, curr, prev_feat, curr_feat, is_continuation)
@@ -1,22 +1,22 @@
 import os
-import hgtk
 from difflib import SequenceMatcher
 from openai import OpenAI
-from .station_name import STATION_NAMES
+from django.conf import settings
+from .station_index import STATION_INDEX, jamo
+from .llm_cache import llm_cached
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = OpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    timeout=settings.LLM_CALL_TIMEOUT,
+    max_retries=settings.LLM_MAX_RETRIES,
+)
+MODEL = "gpt-4o-mini"
 
 
 # -------------------------------------------------------
 # 1) 역명 후보 찾기 (부분 일치 + 오타 교정)
 # -------------------------------------------------------
 
-def jamo(text):
-    try:
-        return hgtk.text.decompose(text)
-    except:
-        return text
-
 def jamo_similarity(a, b):
     return SequenceMatcher(None, jamo(a), jamo(b)).ratio()
 
@@ -24,65 +24,19 @@ def guess_station_name(text: str):
     t = text.replace(" ", "").replace("역", "")
 
     # 우선 부분 일치
-    for name in STATION_NAMES:
-        if t in name.replace(" ", ""):
-            return name
-
-    # 자모 기반 유사도
-    best = None
-    best_score = 0
-
-    for name in STATION_NAMES:
-        score = jamo_similarity(t, name)
-        if score > best_score:
-            best = name
-            best_score = score
+    name = STATION_INDEX.find_substring(t)
+    if name:
+        return name
 
-    return best if best_score > 0.55 else None
+    # 자모 기반 유사도 (역색인으로 후보만 채점)
+    return STATION_INDEX.find_similar(t)
 
 
 
 # -------------------------------------------------------
-# 2) STT 문장 보정 + 역명 반영 버전
-# -------------------------------------------------------
-def correct_transcription_v2(raw_text: str):
-    station = guess_station_name(raw_text)
-    station_list = ", ".join([station]) if station else "없음"
-
-    prompt = f"""
-당신은 '지하철 안내방송 복원 전문가'입니다.
-
-아래 STT 텍스트를 읽고 다음 규칙으로 **정확한 안내방송**을 재구성하세요:
-
-규칙:
-1) 문장 구조는 아래 3개 중 필요한 것만 사용:
-    - "이번 역은 ___역입니다."
-    - "내리실 문은 ___쪽입니다."
-    - "환승하실 승객께서는 ___로 이동하시기 바랍니다."
-2) 역명은 반드시 아래 후보 중에서만 선택:
-    → [{station_list}]
-3) 후보가 '없음'이면 역명을 생성하지 말고 문장에서 추출 가능한 경우만 사용.
-4) 절대 존재하지 않는 역명을 만들지 말 것.
-5) 잘린 문장은 자연스럽게 복원.
-6) 출력은 안내방송 문장만 작성.
-
-[STT 텍스트]
-{raw_text}
-
-[재구성된 안내방송]
-"""
-
-    res = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return res.choices[0].message.content.strip()
-
-
-
-# -------------------------------------------------------
-# 3) 안내방송 요약 (정형 요약)
+# 2) 안내방송 요약 (정형 요약)
 # -------------------------------------------------------
+@llm_cached(MODEL)
 def summarize_text_v2(text: str) -> str:
     """
     지하철 안내방송 문장을 구조적으로 요약한다.
@@ -113,69 +67,131 @@ def summarize_text_v2(text: str) -> str:
 """
 
     res = client.chat.completions.create(
-        model="gpt-4o-mini",
+        model=MODEL,
         messages=[{"role": "user", "content": prompt}]
     )
     return res.choices[0].message.content.strip()
 
 # -------------------------------------------------------
-# 4) 안내방송에서 구조화된 정보 추출
-
-def extract_info_v1(text: str) -> dict:
+# 3) 복원 + 요약 + 구조화 한 번에 (JSON 스키마 강제)
+
+EMPTY_INFO = {
+    "station": None,
+    "door": None,
+    "transfers": [],
+    "warnings": []
+}
+
+ANNOUNCEMENT_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "required": ["full_text", "summary", "info"],
+    "properties": {
+        "full_text": {"type": "string"},
+        "summary": {"type": "string"},
+        "info": {
+            "type": "object",
+            "additionalProperties": False,
+            "required": ["station", "door", "transfers", "warnings"],
+            "properties": {
+                "station": {"type": ["string", "null"]},
+                "door": {"type": ["string", "null"], "enum": ["왼쪽", "오른쪽", None]},
+                "transfers": {"type": "array", "items": {"type": "string"}},
+                "warnings": {"type": "array", "items": {"type": "string"}},
+            },
+        },
+    },
+}
+
+
+def _validate_analysis(data) -> dict:
+    """스키마와 정확히 일치하는지 확인 (누락/추가 키, 타입 불일치 시 ValueError)"""
+    if not isinstance(data, dict) or set(data) != {"full_text", "summary", "info"}:
+        raise ValueError("invalid top-level keys")
+    if not isinstance(data["full_text"], str) or not isinstance(data["summary"], str):
+        raise ValueError("full_text/summary must be string")
+
+    info = data["info"]
+    if not isinstance(info, dict) or set(info) != set(EMPTY_INFO):
+        raise ValueError("invalid info keys")
+    if info["station"] is not None and not isinstance(info["station"], str):
+        raise ValueError("station must be string or null")
+    if info["door"] not in ("왼쪽", "오른쪽", None):
+        raise ValueError("door must be 왼쪽/오른쪽/null")
+    for field in ("transfers", "warnings"):
+        if not isinstance(info[field], list) or not all(isinstance(v, str) for v in info[field]):
+            raise ValueError(f"{field} must be list of string")
+
+    return data
+
+
+# 포맷 실패 기본값(summary 없음)은 캐시하지 않음
+@llm_cached(MODEL, cacheable=lambda result: bool(result["summary"]))
+def analyze_announcement_v1(raw_text: str) -> dict:
     """
-    지하철 안내방송 문장에서 구조화된 정보를 추출한다.
+    STT 원문 하나로 문장 복원 · 요약 · 구조화를 한 번의 호출로 처리한다.
+    (문장 보정 → 요약 → 정보 추출을 따로 부르던 방식의 통합 버전)
     반환:
     {
-        "station": "구로역",
-        "door": "오른쪽",
-        "transfers": ["1호선", "7호선"],
-        "warnings": ["열차 지연 안내"]
+        "full_text": "이번 역은 구로역입니다. 내리실 문은 오른쪽입니다.",
+        "summary": "- 역: 구로역\\n- 문 방향: 오른쪽\\n- 환승: 없음\\n- 기타: 없음",
+        "info": {"station": "구로역", "door": "오른쪽", "transfers": [], "warnings": []}
     }
     """
+    station = guess_station_name(raw_text)
+    station_list = ", ".join([station]) if station else "없음"
 
     prompt = f"""
-당신은 '지하철 안내방송 전문 파서(parser)'입니다.
+당신은 '지하철 안내방송 복원 · 요약 · 파서 전문가'입니다.
+
+아래 STT 텍스트로 세 가지를 만들어 JSON 으로만 출력하세요.
+
+1. full_text → 정확한 안내방송 문장
+    - 문장 구조는 아래 3개 중 필요한 것만 사용:
+        "이번 역은 ___역입니다." / "내리실 문은 ___쪽입니다." /
+        "환승하실 승객께서는 ___로 이동하시기 바랍니다."
+    - 역명은 반드시 아래 후보 중에서만 선택: → [{station_list}]
+    - 후보가 '없음'이면 역명을 생성하지 말고 문장에서 추출 가능한 경우만 사용
+    - 잘린 문장은 자연스럽게 복원
+2. summary → full_text 요약, 아래 4줄 형식 그대로
+    - 역: <역 이름 또는 없음>
+    - 문 방향: <왼쪽/오른쪽/없음>
+    - 환승: <노선 목록 또는 없음>
+    - 기타: <안전/지연/주의 안내 또는 없음>
+3. info → full_text 에서 추출한 구조화 정보
+    - station: 역 이름 (예: "구로역"), 없으면 null
+    - door: "왼쪽" / "오른쪽" / null
+    - transfers: 환승 노선 목록 (예: ["1호선", "7호선"])
+    - warnings: 지연/안전/주의 관련 문장을 간단히 요약한 목록
+
+⚠️ 절대 존재하지 않는 역명을 만들지 말 것.
 
-아래 문장을 보고 다음 항목을 JSON으로 추출하세요:
-
-필수 항목:
-1. station → 역 이름 (예: "구로역")
-2. door → 문 열림 방향 ("왼쪽", "오른쪽" 중 하나. 없으면 null)
-3. transfers → 환승 노선 목록 (예: ["1호선", "7호선"])
-4. warnings → 지연/안전/주의 관련 문장을 간단히 요약한 목록
-
-⚠️ 규칙
-- 역명을 임의로 생성하지 말고, 문장에서 추론 가능한 경우만 추출
-- JSON 외의 다른 텍스트를 절대 출력하지 말 것
-- null / 빈 리스트 허용
-
-[입력 문장]
-{text}
-
-[출력 포맷]
-{{
-    "station": "...",
-    "door": "...",
-    "transfers": [...],
-    "warnings": [...]
-}}
+[STT 텍스트]
+{raw_text}
 """
 
     res = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}]
+        model=MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": "announcement_analysis",
+                "strict": True,
+                "schema": ANNOUNCEMENT_SCHEMA,
+            },
+        },
     )
     content = res.choices[0].message.content.strip()
 
-    # JSON 파싱 시도
+    # JSON 파싱 + 스키마 검증
     import json
     try:
-        return json.loads(content)
+        return _validate_analysis(json.loads(content))
     except:
-        # 모델이 포맷을 100% 맞추지 못했을 때
+        # 모델이 포맷을 100% 맞추지 못했을 때 (원문 + 빈 정보)
         return {
-            "station": None,
-            "door": None,
-            "transfers": [],
-            "warnings": []
+            "full_text": raw_text,
+            "summary": "",
+            "info": dict(EMPTY_INFO, transfers=[], warnings=[])
         }
@@ -0,0 +1,155 @@
+import asyncio
+import os
+import threading
+import weakref
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+
+
+# ==========================================================
+#  Redis 연결 관리 (모든 Redis 사용처가 공유)
+#  - 접속 정보 / 풀 크기 / 타임아웃 / health check 는 settings.REDIS_*
+#  - 풀은 처음 쓸 때 만들고, 프로세스(pid)별로 따로 둔다
+#    → Celery prefork 자식은 부모의 소켓을 물려 쓰지 않고 새 풀을 만든다
+#  - BlockingConnectionPool: 연결이 REDIS_MAX_CONNECTIONS 개에 차면
+#    REDIS_POOL_TIMEOUT 초까지 반환을 기다림 (무한히 늘어나지 않음)
+#  - blocking 풀: BLPOP / pubsub 처럼 오래 기다리는 명령용 (socket timeout 없음)
+# ==========================================================
+
+REDIS_HOST = getattr(settings, "REDIS_HOST", "redis")
+REDIS_PORT = getattr(settings, "REDIS_PORT", 6379)
+REDIS_DB = getattr(settings, "REDIS_DB", 0)
+REDIS_MAX_CONNECTIONS = getattr(settings, "REDIS_MAX_CONNECTIONS", 50)
+REDIS_POOL_TIMEOUT = getattr(settings, "REDIS_POOL_TIMEOUT", 5.0)
+REDIS_SOCKET_TIMEOUT = getattr(settings, "REDIS_SOCKET_TIMEOUT", 5.0)
+REDIS_CONNECT_TIMEOUT = getattr(settings, "REDIS_CONNECT_TIMEOUT", 2.0)
+REDIS_HEALTH_CHECK_INTERVAL = getattr(settings, "REDIS_HEALTH_CHECK_INTERVAL", 30)
+
+_lock = threading.Lock()
+_clients = {}                       # (pid, blocking) → redis.Redis
+_async_clients = weakref.WeakKeyDictionary()   # 이벤트 루프 → aioredis.Redis
+_async_pools = weakref.WeakSet()    # 이벤트 루프별 async 풀 (통계용)
+
+
+def _pool_kwargs(blocking):
+    return dict(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        db=REDIS_DB,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_timeout=None if blocking else REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        socket_keepalive=True,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        client_name=f"soribom-{os.getpid()}{'-blocking' if blocking else ''}",
+    )
+
+
+def get_redis(blocking=False) -> redis.Redis:
+    """현재 프로세스의 공유 클라이언트 (풀은 처음 호출 때 생성)"""
+    key = (os.getpid(), blocking)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            # fork 전에 부모가 만든 클라이언트는 버림 (소켓 공유 금지)
+            for stale in [k for k in _clients if k[0] != key[0]]:
+                del _clients[stale]
+            pool = redis.BlockingConnectionPool(**_pool_kwargs(blocking))
+            client = _clients[key] = redis.Redis(connection_pool=pool)
+    return client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """
+    asyncio 클라이언트 (호출한 이벤트 루프 전용 — 루프마다 한 번만 만들어 재사용).
+    pubsub 대기에 쓰이므로 socket timeout 없음.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        pool = aioredis.BlockingConnectionPool(**_pool_kwargs(blocking=True))
+        _async_pools.add(pool)
+        client = _async_clients[loop] = aioredis.Redis(connection_pool=pool)
+    return client
+
+
+class LazyRedis:
+    """
+    import 시점에는 아무것도 만들지 않고, 사용할 때 현재 프로세스의 클라이언트로 위임.
+    (모듈 전역 r 을 그대로 쓰면서도 fork 이후 자식 프로세스 전용 풀을 사용)
+    """
+
+    def __init__(self, blocking=False):
+        self._blocking = blocking
+
+    def __getattr__(self, name):
+        return getattr(get_redis(self._blocking), name)
+
+
+r = LazyRedis()
+blocking_r = LazyRedis(blocking=True)
+
+
+class LazyScript:
+    """
+    Lua 스크립트 — 모듈 전역에 두어도 import 시점에는 연결을 만들지 않고,
+    호출할 때 현재 프로세스의 클라이언트에 등록해 실행 (fork 후에는 자식 풀 사용).
+    client 에 파이프라인을 넘기면 그 파이프라인에 쌓임.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._client = None
+        self._script = None
+
+    def __call__(self, keys=(), args=(), client=None):
+        current = get_redis()
+        if self._client is not current:
+            self._client, self._script = current, current.register_script(self.source)
+        return self._script(keys=keys, args=args, client=client)
+
+
+# ==========================================================
+#  풀 사용 통계
+# ==========================================================
+def _sync_stats(pool):
+    created = len(pool._connections)
+    idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    return {"created": created, "in_use": created - idle, "idle": idle, "max": pool.max_connections}
+
+
+def _async_stats(pool):
+    created = len(pool._available_connections) + len(pool._in_use_connections)
+    return {
+        "created": created,
+        "in_use": len(pool._in_use_connections),
+        "idle": len(pool._available_connections),
+        "max": pool.max_connections,
+    }
+
+
+def pool_stats() -> dict:
+    """현재 프로세스의 풀 사용량"""
+    pid = os.getpid()
+    stats = {"pid": pid}
+    for (owner, blocking), client in list(_clients.items()):
+        if owner == pid:
+            stats["blocking" if blocking else "default"] = _sync_stats(client.connection_pool)
+    stats["async"] = [_async_stats(pool) for pool in list(_async_pools)]
+    return stats
+
+
+def server_client_stats() -> dict:
+    """Redis 서버 기준 프로세스(client_name)별 연결 수 — 모든 웹/워커 프로세스 합산"""
+    counts = {}
+    for client in r.client_list():
+        name = client.get("name") or "(unnamed)"
+        counts[name] = counts.get(name, 0) + 1
+    return counts
@@ -0,0 +1,330 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.db.models import F, Prefetch
+
+from apps.broadcasts.models import Broadcast, Transcript
+from apps.keywords.models import Alert
+from apps.recordings.models import Session
+from .llm_pool import FAILED, run_parallel
+from apps.recordings.services.redis_client import r
+from .nlp import analyze_announcement_v1, summarize_text_v2, EMPTY_INFO
+from .stitcher import join_broadcast_texts
+from .template_parser import record_parse_stats, try_parse
+
+
+# ==========================================================
+#  세션 결과(타임라인) 생성 + Transcript 캐시
+#  - 그룹별 LLM 결과는 멤버 방송 ID/텍스트 해시로 캐시
+#  - 타임라인 전체는 세션 버전(그룹 구성 해시)으로 캐시
+#  - GET 은 Session.content_version 만 비교 (그룹 배정 / 키워드 감지·삭제 때 +1)
+#  - LLM 이 실패한 그룹은 원문 기본값으로 타임라인에 넣고 (부분 결과),
+#    group_cache["failures"] 에 시도 횟수 / 다음 재시도 시각을 기록해 백오프로 재시도
+# ==========================================================
+
+RESULTS_RETRY_MAX_ATTEMPTS = getattr(settings, "RESULTS_RETRY_MAX_ATTEMPTS", 3)
+RESULTS_RETRY_BASE_SEC = getattr(settings, "RESULTS_RETRY_BASE_SEC", 60)
+
+FAILURES_KEY = "failures"
+
+def bump_content_version(session_id):
+    """결과에 들어갈 내용이 바뀜 → 다음 GET 에서 저장된 결과를 쓰지 않음"""
+    Session.objects.filter(id=session_id).update(content_version=F("content_version") + 1)
+
+
+def _content_version(session_id) -> int:
+    return Session.objects.values_list("content_version", flat=True).get(id=session_id)
+
+
+def _digest(value) -> str:
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def group_cache_key(group) -> str:
+    """그룹 LLM 결과 캐시 키 — 멤버 방송 ID + 원문이 같으면 같은 키"""
+    return "group:" + _digest([[b.id, b.full_text] for b in group])
+
+
+def session_summary_key(full_text: str) -> str:
+    return "session:" + _digest(full_text)
+
+
+def load_announcement_groups(session):
+    """세션의 안내방송 그룹 (방송은 시간순, 키워드 prefetch) — 조회만"""
+    announcements = session.announcements.prefetch_related(
+        Prefetch(
+            "broadcasts",
+            queryset=Broadcast.objects
+                .order_by("created_at")
+                .prefetch_related("keywords_detected"),
+        )
+    )
+    groups = [list(a.broadcasts.all()) for a in announcements]
+    return [g for g in groups if g]
+
+
+def analyze_groups(groups, on_progress=None) -> list:
+    """
+    여러 그룹의 LLM 처리를 병렬로 수행한다 (결과는 입력 순서).
+    그룹당 한 번의 호출로 문장 복원 · 요약 · 구조화를 함께 받는다.
+    정형 문장만으로 된 그룹은 템플릿 파서로 처리하고 LLM 을 부르지 않는다.
+    실패한 그룹은 원문 기반 기본값과 failed=True 로 반환 (build_results 가 재시도 기록).
+    """
+    # 청크 경계 겹침은 제거하고 잘린 단어는 온전한 단어로 이어 붙임
+    merged = [join_broadcast_texts(group) for group in groups]
+
+    # 템플릿 파서가 처리하지 못한 그룹만 LLM 으로
+    parsed = [try_parse(text) for text in merged]
+    pending = [i for i, p in enumerate(parsed) if p is None]
+    if groups:
+        record_parse_stats(groups[0][0].session_id, len(groups) - len(pending), len(pending))
+
+    def on_result(done, total):
+        if on_progress:
+            on_progress(len(groups) - len(pending) + done, len(groups))
+
+    outputs = dict(zip(pending, run_parallel(
+        [(analyze_announcement_v1, (merged[i],)) for i in pending],
+        on_result=on_result,
+    )))
+    if not pending and groups:
+        on_result(0, 0)
+
+    analyses = []
+    for i, raw in enumerate(merged):
+        output = parsed[i] or outputs[i]
+        if output is FAILED:
+            analyses.append({
+                "full_text": raw,
+                "summary": "",
+                "info": dict(EMPTY_INFO, transfers=[], warnings=[]),
+                "failed": True,
+            })
+        else:
+            analyses.append(output)
+
+    return analyses
+
+
+def _group_meta(group) -> dict:
+    """LLM 과 무관한 그룹 메타데이터"""
+    group_conf = [b.confidence_avg or 0 for b in group]
+
+    keywords = set()
+    for b in group:
+        keywords.update(k.word for k in b.keywords_detected.all())
+
+    return {
+        "broadcast_ids": [b.id for b in group],
+        "audio_chunks": [b.audio_chunk_id for b in group],
+        "keywords_detected": sorted(keywords),
+        "confidence_avg": round(sum(group_conf) / len(group_conf), 3) if group_conf else 0,
+        "confidences": group_conf,
+    }
+
+
+def _next_failure(failure, now) -> dict:
+    """실패 1회 추가 — 다음 재시도는 RESULTS_RETRY_BASE_SEC 에서 두 배씩"""
+    attempts = (failure or {}).get("attempts", 0) + 1
+    return {"attempts": attempts, "retry_at": now + RESULTS_RETRY_BASE_SEC * 2 ** (attempts - 1)}
+
+
+def _due(failure, now) -> bool:
+    return (
+        failure is not None
+        and failure["attempts"] < RESULTS_RETRY_MAX_ATTEMPTS
+        and failure["retry_at"] <= now
+    )
+
+
+def _due_keys(group_cache, now) -> set:
+    failures = group_cache.get(FAILURES_KEY, {})
+    return {key for key, failure in failures.items() if _due(failure, now)}
+
+
+def _payload(transcript):
+    failures = transcript.group_cache.get(FAILURES_KEY, {})
+    return {
+        "total_announcements": len(transcript.timeline),
+        # LLM 실패로 원문 기본값이 들어간 그룹 수 (0 이 아니면 부분 결과)
+        "failed_announcements": sum(1 for key in failures if key.startswith("group:")),
+        "summary": transcript.summary,
+        "timeline": transcript.timeline,
+    }
+
+
+def _collect(session):
+    """그룹 / 캐시 키 / 메타데이터 / 세션 버전 (DB 조회만, LLM 없음)"""
+    groups = load_announcement_groups(session)
+    keys = [group_cache_key(g) for g in groups]
+    metas = [_group_meta(g) for g in groups]
+
+    version = _digest([
+        [key, meta["keywords_detected"], meta["confidences"]]
+        for key, meta in zip(keys, metas)
+    ])
+    return groups, keys, metas, version
+
+
+def cached_results(session):
+    """Transcript 에 저장된 결과가 최신이면 반환, 아니면 None (쿼리 1회 — 방송/그룹 조회 없음)"""
+    transcript = Transcript.objects.filter(session=session).first()
+    if not transcript or not transcript.version:
+        return None
+
+    fresh = transcript.content_version == session.content_version
+    return _payload(transcript) if fresh else None
+
+
+def retry_due(session) -> bool:
+    """부분 결과 중 재시도 시각이 된 그룹 / 요약이 있는지"""
+    transcript = Transcript.objects.filter(session=session).only("group_cache").first()
+    return bool(transcript and _due_keys(transcript.group_cache, time.time()))
+
+
+def build_results(session, on_progress=None):
+    """
+    세션 결과를 반환한다. 방송이 없으면 None.
+    세션 버전이 Transcript 에 저장된 버전과 같으면 LLM 호출 없이 그대로 반환,
+    달라졌으면 새로 생기거나 바뀐 그룹만 다시 처리한다.
+    실패했던 그룹은 재시도 시각이 됐을 때만 다시 처리한다 (최대 RESULTS_RETRY_MAX_ATTEMPTS 회).
+    on_progress(done, total): 그룹 처리 진행률
+    """
+    if not Broadcast.objects.filter(session=session).exists():
+        return None
+
+    # 조회 전에 읽어 둠 — 처리 중에 내용이 바뀌면 다음 GET 에서 다시 생성
+    content_version = _content_version(session.id)
+    groups, keys, metas, version = _collect(session)
+
+    now = time.time()
+    transcript = Transcript.objects.filter(session=session).first()
+    cache = transcript.group_cache if transcript else {}
+    failures = cache.get(FAILURES_KEY, {})
+    retry = _due_keys(cache, now)
+
+    if transcript and transcript.version == version and not retry:
+        # 버전만 올라가고 그룹 구성은 같음 → LLM 없이 버전만 맞춤
+        if transcript.content_version != content_version:
+            transcript.content_version = content_version
+            transcript.save(update_fields=["content_version"])
+        return _payload(transcript)
+
+    new_cache = {}
+    new_failures = {}
+
+    timeline = []
+    confidences_total = []
+
+    # 캐시에 없는 그룹 + 재시도 시각이 된 실패 그룹만 모아서 한 번에 병렬 처리
+    missing = [i for i, key in enumerate(keys) if key not in cache or key in retry]
+    fresh = dict(zip(missing, analyze_groups([groups[i] for i in missing], on_progress)))
+
+    for i, (key, meta) in enumerate(zip(keys, metas)):
+        analysis = fresh.get(i) or cache[key]
+        failed = analysis.pop("failed", False) or not analysis["summary"]
+        # 실패한 그룹 / 포맷 실패 기본값(summary 없음)도 원문 기본값으로 저장 — 재시도는 failures 기록으로
+        new_cache[key] = analysis
+        if failed:
+            previous = failures.get(key)
+            new_failures[key] = _next_failure(previous, now) if i in fresh or not previous else previous
+
+        confidences_total.extend(meta["confidences"])
+
+        timeline.append({
+            "announcement_id": i + 1,
+            "broadcast_ids": meta["broadcast_ids"],
+            "audio_chunks": meta["audio_chunks"],
+            "full_text": analysis["full_text"],
+            "summary": analysis["summary"],
+            "info": analysis["info"],
+            "keywords_detected": meta["keywords_detected"],
+            "confidence_avg": meta["confidence_avg"],
+        })
+
+    # 세션 전체 요약 (전체 복원 문장이 같으면 재사용)
+    session_full_text = " ".join(t["full_text"] for t in timeline)
+    summary_key = session_summary_key(session_full_text)
+    session_summary = cache.get(summary_key)
+    if session_summary is None or summary_key in retry:
+        session_summary = run_parallel([(summarize_text_v2, (session_full_text,))])[0]
+        if session_summary is FAILED:
+            session_summary = ""
+            new_failures[summary_key] = _next_failure(failures.get(summary_key), now)
+    elif summary_key in failures:
+        new_failures[summary_key] = failures[summary_key]
+    new_cache[summary_key] = session_summary
+    if new_failures:
+        new_cache[FAILURES_KEY] = new_failures
+
+    total_keywords = Alert.objects.filter(keyword__session=session).count()
+    total_broadcasts = sum(len(g) for g in groups)
+
+    transcript, _ = Transcript.objects.update_or_create(
+        session=session,
+        defaults={
+            "summary": session_summary,
+            "full_text": session_full_text,
+            "timeline": timeline,
+            "version": version,
+            "content_version": content_version,
+            "group_cache": new_cache,
+            "total_broadcasts": total_broadcasts,
+            "total_keywords": total_keywords,
+            "accuracy_avg": round(sum(confidences_total) / len(confidences_total), 3) if confidences_total else 0,
+        }
+    )
+
+    return _payload(transcript)
+
+
+# ==========================================================
+#  백그라운드 결과 생성 작업 상태 (Redis 해시: results_job:{session_id})
+#  state: QUEUED → RUNNING → DONE / FAILED
+#  선점: results_job_lock:{session_id} (SET NX) — 작업이 끝나면 해제,
+#        워커가 죽어도 RESULTS_JOB_TTL 뒤에는 다시 등록 가능
+# ==========================================================
+RESULTS_JOB_TTL = 60 * 60
+
+
+def _job_key(session_id):
+    return f"results_job:{session_id}"
+
+
+def _lock_key(session_id):
+    return f"results_job_lock:{session_id}"
+
+
+def claim_results_job(session_id) -> bool:
+    """대기/실행 중인 작업이 없을 때만 QUEUED 로 선점 (동시에 불려도 1번만 True)"""
+    if not r.set(_lock_key(session_id), 1, nx=True, ex=RESULTS_JOB_TTL):
+        return False
+
+    set_results_job(session_id, state="QUEUED", done=0, total=0)
+    return True
+
+
+def release_results_job(session_id):
+    r.delete(_lock_key(session_id))
+
+
+def set_results_job(session_id, **fields):
+    key = _job_key(session_id)
+    pipe = r.pipeline()
+    pipe.hset(key, mapping=fields)
+    pipe.expire(key, RESULTS_JOB_TTL)
+    pipe.execute()
+
+
+def get_results_job(session_id) -> dict:
+    raw = r.hgetall(_job_key(session_id))
+    job = {k.decode(): v.decode() for k, v in raw.items()}
+    return {
+        "state": job.get("state", "NONE"),
+        "done": int(job.get("done", 0)),
+        "total": int(job.get("total", 0)),
+        "error": job.get("error"),
+    }
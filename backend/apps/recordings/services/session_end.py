@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.recordings.models import Session
+from apps.recordings.sse.publisher import push_event
+from .counters import session_counts
+from .grouper import close_open_announcement
+
+
+# ==========================================================
+#  세션 종료
+#  - 명시적 종료: POST /api/session/{id}/end/ 또는 새 세션 생성 시 previous_session_id
+#  - 유휴 종료: 마지막 청크 이후 SESSION_IDLE_TIMEOUT 초 동안 새 청크가 없으면 (beat)
+#  - 종료된 세션의 청크가 모두 처리되면 COMPLETE + 마지막 안내방송 그룹 닫기 + 결과 생성 등록
+#    (녹음 중에는 done >= total 이어도 그대로 — 그룹은 merger 의 시간 간격 규칙으로 닫힘)
+# ==========================================================
+
+SESSION_IDLE_TIMEOUT = getattr(settings, "SESSION_IDLE_TIMEOUT", 120)
+
+
+def end_session(session) -> bool:
+    """ended_at 기록 (이미 종료됐으면 그대로) 후 finish_session"""
+    if session.ended_at is None:
+        ended_at = timezone.now()
+        updated = (
+            Session.objects
+            .filter(id=session.id, ended_at__isnull=True)
+            .update(ended_at=ended_at, status="PROCESSING")
+        )
+        if updated:
+            session.ended_at, session.status = ended_at, "PROCESSING"
+            push_event(session.id, {"type": "status", "status": session.status})
+        else:
+            session.refresh_from_db(fields=["ended_at", "status"])
+
+    return finish_session(session)
+
+
+def finish_session(session, counts=None) -> bool:
+    """
+    종료된 세션의 청크가 모두 처리됐으면 COMPLETE 로 바꾸고 마지막 그룹을 닫은 뒤
+    결과 생성 작업을 등록한다.
+    상태를 실제로 바꾼 호출만 True (동시에 여러 번 불려도 1번).
+    """
+    if session.ended_at is None or session.status == "COMPLETE":
+        return False
+
+    counts = counts or session_counts(session.id)
+    if counts["completed"] < counts["received"]:
+        return False
+
+    updated = (
+        Session.objects
+        .filter(id=session.id, ended_at__isnull=False)
+        .exclude(status="COMPLETE")
+        .update(status="COMPLETE")
+    )
+    if not updated:
+        return False
+
+    session.status = "COMPLETE"
+    close_open_announcement(session)
+    push_event(session.id, {"type": "status", "status": session.status})
+
+    # 녹음 종료 → 결과 생성 작업 자동 시작 (tasks 가 이 모듈을 import 하므로 지연 import)
+    from apps.recordings.tasks import enqueue_results
+    enqueue_results(session)
+    return True
+
+
+def end_idle_sessions() -> int:
+    """마지막 청크 이후 SESSION_IDLE_TIMEOUT 초가 지난 녹음 중 세션을 종료"""
+    now = timezone.now()
+    idle = (
+        Session.objects
+        .filter(ended_at__isnull=True, expired_at__gt=now)
+        .annotate(last_chunk_at=Max("chunks__created_at"))
+        .filter(last_chunk_at__lt=now - timedelta(seconds=SESSION_IDLE_TIMEOUT))
+    )
+
+    ended = 0
+    for session in idle:
+        end_session(session)
+        ended += 1
+    return ended
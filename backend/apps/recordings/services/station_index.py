@@ -0,0 +1,97 @@
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+import hgtk
+
+from .station_name import STATION_NAMES
+
+
+# 자모 유사도 기준 (이 값을 넘어야 역명으로 인정)
+SIMILARITY_THRESHOLD = 0.55
+
+
+@lru_cache(maxsize=4096)
+def jamo(text):
+    try:
+        return hgtk.text.decompose(text)
+    except:
+        return text
+
+
+# ==========================================================
+#  역명 인덱스 (모듈 로드 시 1회 빌드)
+# ==========================================================
+class StationIndex:
+    """
+    guess_station_name 전용 사전 계산 인덱스.
+    - names      : 중복 제거된 역명 (STATION_NAMES 최초 등장 순서 유지)
+    - substrings : 역명 부분 문자열 → 가장 앞선 역명 index (부분 일치용)
+    - postings   : 자모 1-gram → [(역명 index, 등장 횟수)] 역색인
+
+    자모 유사도는 SequenceMatcher.ratio() 의 상한(quick_ratio)을
+    역색인으로 한 번에 계산한 뒤, 상한이 높은 소수 후보만 정확히 채점한다.
+    상한이 현재 최고점보다 낮아지는 순간 중단하므로 결과는 전수 비교와 같다.
+    """
+
+    def __init__(self, station_names):
+        self.names = list(dict.fromkeys(station_names))
+        self.compact = [name.replace(" ", "") for name in self.names]
+        self.jamos = [jamo(name) for name in self.names]
+        self.lengths = [len(j) for j in self.jamos]
+
+        self.substrings = {"": 0}
+        for i, name in enumerate(self.compact):
+            for start in range(len(name)):
+                for end in range(start + 1, len(name) + 1):
+                    self.substrings.setdefault(name[start:end], i)
+
+        self.postings = defaultdict(list)
+        for i, j in enumerate(self.jamos):
+            for ch, count in Counter(j).items():
+                self.postings[ch].append((i, count))
+
+    def find_substring(self, t):
+        i = self.substrings.get(t)
+        return self.names[i] if i is not None else None
+
+    def _candidates(self, query):
+        """(상한 점수, index) 후보 목록 — 상한이 기준 이하인 역명은 제외"""
+        la = len(query)
+        overlap = defaultdict(int)
+
+        for ch, qc in Counter(query).items():
+            for i, nc in self.postings.get(ch, ()):
+                overlap[i] += min(qc, nc)
+
+        candidates = []
+        for i, inter in overlap.items():
+            bound = 2.0 * inter / (la + self.lengths[i])
+            if bound > SIMILARITY_THRESHOLD:
+                candidates.append((bound, i))
+
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        return candidates
+
+    def find_similar(self, t):
+        query = jamo(t)
+        if not query:
+            return None
+
+        best = None
+        best_score = 0
+
+        for bound, i in self._candidates(query):
+            if bound < best_score:
+                break
+
+            score = SequenceMatcher(None, query, self.jamos[i]).ratio()
+            # 동점이면 원래 목록에서 앞선 역명 우선
+            if score > best_score or (score == best_score and best is not None and i < best):
+                best = i
+                best_score = score
+
+        return self.names[best] if best is not None and best_score > SIMILARITY_THRESHOLD else None
+
+
+STATION_INDEX = StationIndex(STATION_NAMES)
@@ -0,0 +1,229 @@
+import json
+import os
+from difflib import SequenceMatcher
+
+import numpy as np
+from django.conf import settings
+
+from apps.recordings.services.redis_client import LazyScript, r
+from .audio_decode import SAMPLE_RATE, write_wav
+from .station_index import jamo
+
+
+# ==========================================================
+#  청크 경계 겹침 처리
+#  1) 오디오: 앞 청크의 마지막 STITCH_OVERLAP_SEC 초를 현재 청크 앞에 붙여 STT
+#     → 경계에서 잘린 단어가 현재 청크 전사에 온전히 들어옴
+#  2) 텍스트: 앞 청크 전사 꼬리 ↔ 현재 전사 머리를 자모 단위로 정렬해 겹친 부분 제거
+#     → Broadcast.stitched_text (단어 경계에서 시작하는 새 내용)
+#     앞 청크 전사는 STT 직후 Redis 에 보관 (Broadcast 생성 순서와 무관하게 비교)
+#     앞 청크가 아직 STT 중이면 기다리지 않고 STT 결과를 맡겨 둠 (stitch_parked)
+#     → 앞 청크가 전사를 저장할 때 깨워서 이어 처리 (늦어도 STITCH_TEXT_WAIT 초 뒤)
+# ==========================================================
+
+STITCH_OVERLAP_SEC = getattr(settings, "STITCH_OVERLAP_SEC", 1.5)
+STITCH_MIN_CHARS = getattr(settings, "STITCH_MIN_CHARS", 2)
+STITCH_MAX_CHARS = getattr(settings, "STITCH_MAX_CHARS", 20)
+STITCH_MIN_RATIO = getattr(settings, "STITCH_MIN_RATIO", 0.8)
+STITCH_TEXT_WAIT = getattr(settings, "STITCH_TEXT_WAIT", 10.0)
+
+# 다음 청크가 가져갈 꼬리 오디오 (int16 PCM) / 전사
+TAIL_TTL = 60 * 10
+
+
+def _tail_key(chunk_id):
+    return f"audio_tail:{chunk_id}"
+
+
+def _text_key(chunk_id):
+    return f"text_tail:{chunk_id}"
+
+
+def _waiting_key(chunk_id):
+    """앞 청크 ID → 그 전사를 기다리는 다음 청크 ID"""
+    return f"stitch_waiting:{chunk_id}"
+
+
+def _parked_key(chunk_id):
+    """앞 청크 전사를 기다리는 청크의 STT 결과"""
+    return f"stitch_parked:{chunk_id}"
+
+
+def previous_chunk(chunk):
+    return (
+        chunk.session.chunks
+        .filter(created_at__lt=chunk.created_at)
+        .order_by("-created_at", "-id")
+        .first()
+    )
+
+
+# ==========================================================
+#  1) 오디오 겹침
+# ==========================================================
+def save_tail(chunk, pcm):
+    """이 청크의 마지막 STITCH_OVERLAP_SEC 초를 다음 청크용으로 보관"""
+    if not STITCH_OVERLAP_SEC or pcm is None:
+        return
+    tail = pcm[-int(STITCH_OVERLAP_SEC * SAMPLE_RATE):]
+    samples = (np.clip(tail, -1.0, 1.0) * 32767).astype("<i2")
+    r.set(_tail_key(chunk.id), samples.tobytes(), ex=TAIL_TTL)
+
+
+def build_overlap_audio(chunk, pcm):
+    """
+    앞 청크 꼬리 + 현재 청크를 이어 붙인 WAV 경로를 반환 (없으면 None).
+    호출 측에서 AI 서버 전송 후 삭제한다.
+    """
+    if not STITCH_OVERLAP_SEC or pcm is None:
+        return None
+
+    prev = previous_chunk(chunk)
+    raw = r.get(_tail_key(prev.id)) if prev else None
+    if not raw:
+        return None
+
+    tail = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    base, _ = os.path.splitext(chunk.file_path)
+    path = f"{base}.overlap.wav"
+    write_wav(path, np.concatenate([tail, pcm]))
+    return path
+
+
+# ==========================================================
+#  2) 텍스트 이어 붙이기
+# ==========================================================
+# 전사 저장 + 이 전사를 기다리던 다음 청크 ID 반환
+_save_text_script = LazyScript("""
+redis.call('set', KEYS[1], ARGV[1], 'EX', ARGV[2])
+local waiting = redis.call('get', KEYS[2])
+if waiting then
+    redis.call('del', KEYS[2])
+end
+return waiting
+""")
+
+# 앞 청크 전사가 있으면 반환, 없으면 기다린다고 표시 + STT 결과 보관
+# (전사 저장과 같은 스크립트 단위로 실행되므로 둘 중 한쪽은 반드시 상대를 봄)
+_text_or_park_script = LazyScript("""
+local text = redis.call('get', KEYS[1])
+if text then
+    return text
+end
+redis.call('set', KEYS[2], ARGV[1], 'EX', ARGV[3])
+redis.call('set', KEYS[3], ARGV[2], 'EX', ARGV[3])
+return false
+""")
+
+
+def save_tail_text(chunk, text):
+    """
+    이 청크의 STT 전사를 다음 청크의 겹침 제거용으로 보관 (빈 전사도 저장).
+    반환: 이 전사를 기다리며 결과를 맡겨 둔 다음 청크 ID (없으면 None)
+    """
+    waiting = _save_text_script(
+        keys=[_text_key(chunk.id), _waiting_key(chunk.id)],
+        args=[text, TAIL_TTL],
+    )
+    return int(waiting) if waiting else None
+
+
+def previous_text_or_park(prev_chunk, chunk, text, confidence):
+    """
+    앞 청크의 STT 전사. 아직 없으면 (앞 청크 STT 중) 이 청크의 STT 결과를 맡겨 두고 None.
+    맡겨 둔 결과는 take_parked 로 한 번만 꺼낼 수 있다.
+    """
+    if prev_chunk is None:
+        return ""
+    raw = _text_or_park_script(
+        keys=[_text_key(prev_chunk.id), _waiting_key(prev_chunk.id), _parked_key(chunk.id)],
+        args=[chunk.id, json.dumps({"text": text, "confidence": confidence}), TAIL_TTL],
+    )
+    return raw.decode("utf-8") if raw is not None else None
+
+
+def stored_text(prev_chunk):
+    """앞 청크의 STT 전사 (기다리지 않음, 없으면 None)"""
+    if prev_chunk is None:
+        return None
+    raw = r.get(_text_key(prev_chunk.id))
+    return raw.decode("utf-8") if raw is not None else None
+
+
+def take_parked(chunk_id):
+    """맡겨 둔 STT 결과 {text, confidence} 를 꺼냄 — 먼저 꺼낸 쪽만 받음 (나머지는 None)"""
+    raw = r.getdel(_parked_key(chunk_id))
+    return json.loads(raw) if raw is not None else None
+
+
+def find_overlap(prev_text: str, curr_text: str):
+    """
+    prev 꼬리와 curr 머리의 겹침을 찾는다 (공백 무시, 자모 유사도).
+    반환: (겹친 글자 수, curr_text 에서 겹침이 끝나는 위치) / 없으면 (0, 0)
+    """
+    prev_chars = [c for c in prev_text if not c.isspace()]
+    curr_chars = [(c, i) for i, c in enumerate(curr_text) if not c.isspace()]
+
+    best_k, best_ratio = 0, STITCH_MIN_RATIO
+    longest = min(STITCH_MAX_CHARS, len(prev_chars), len(curr_chars))
+    for k in range(longest, STITCH_MIN_CHARS - 1, -1):
+        tail = jamo("".join(prev_chars[-k:]))
+        head = jamo("".join(c for c, _ in curr_chars[:k]))
+        ratio = SequenceMatcher(None, tail, head).ratio()
+        # 유사도가 가장 높은 길이 (같으면 긴 쪽) — 한 글자 밀린 정렬을 피함
+        if ratio > best_ratio or (ratio == best_ratio and not best_k):
+            best_k, best_ratio = k, ratio
+
+    if not best_k:
+        return 0, 0
+    return best_k, curr_chars[best_k - 1][1] + 1
+
+
+def stitch(prev_text: str, curr_text: str) -> dict:
+    """
+    반환:
+    - stitched_text     : 겹침을 뺀 curr 내용 (항상 단어 경계에서 시작)
+    - overlap_chars     : 겹친 글자 수 (0 이면 겹침 없음 → stitched_text = curr 전체)
+    - continues_previous: 겹침이 단어 중간에서 끝남 = 경계에서 단어가 잘렸던 것
+    """
+    overlap, cut = find_overlap(prev_text, curr_text) if prev_text else (0, 0)
+    if not overlap:
+        return {
+            "stitched_text": curr_text.strip(),
+            "overlap_chars": 0,
+            "continues_previous": False,
+        }
+
+    # 겹침이 단어 중간에서 끝나면, 그 단어의 시작부터 새 내용으로 본다
+    # ("이번 역은 구" + "역은 구로역입니다" → 새 내용 "구로역입니다")
+    mid_word = cut < len(curr_text) and curr_text[cut].isalnum()
+    start = cut
+    if mid_word:
+        start = curr_text.rfind(" ", 0, cut) + 1
+
+    return {
+        "stitched_text": curr_text[start:].lstrip(" .,?!").strip(),
+        "overlap_chars": overlap,
+        "continues_previous": mid_word,
+    }
+
+
+def broadcast_text(b) -> str:
+    """그룹핑 / 키워드 / 결과 생성에 쓰는 방송 텍스트 (겹침 제거본 우선)"""
+    return b.stitched_text if b.overlap_chars else b.full_text
+
+
+def join_broadcast_texts(broadcasts) -> str:
+    """
+    시간순 방송들을 하나의 문장으로 잇는다.
+    앞 방송 끝에서 잘렸던 단어는 뒤 방송의 온전한 단어로 교체.
+    """
+    out = ""
+    for b in broadcasts:
+        text = broadcast_text(b).strip()
+        if out and b.overlap_chars and b.continues_previous:
+            # 앞 방송의 잘린 마지막 단어 제거
+            head, _, _ = out.rstrip().rpartition(" ")
+            out = head
+        out = f"{out} {text}" if out else text
+    return out.strip()
@@ -0,0 +1,87 @@
+import json
+import time
+
+from django.conf import settings
+
+from apps.recordings.services.redis_client import blocking_r, r
+
+
+# ==========================================================
+#  세션 간 STT 마이크로 배칭 (Redis 큐)
+#  - 태스크: 요청을 큐에 넣고 자기 결과 키를 BLPOP 으로 기다림
+#  - 디스패처(run_stt_batcher): 짧은 윈도우 동안 모아 배치 라우트로 1회 전송
+#    후 청크별 결과를 각 결과 키로 돌려준다
+# ==========================================================
+
+AI_BATCH_WINDOW_MS = getattr(settings, "AI_BATCH_WINDOW_MS", 200)
+AI_BATCH_MAX_SIZE = getattr(settings, "AI_BATCH_MAX_SIZE", 8)
+AI_BATCH_WAIT_TIMEOUT = getattr(settings, "AI_BATCH_WAIT_TIMEOUT", 60)
+
+PENDING_KEY = "stt:pending"
+RESULT_TTL = 120
+
+
+def _result_key(chunk_id):
+    return f"stt:result:{chunk_id}"
+
+
+def submit_and_wait(audio_path, chunk_id, timeout=None):
+    """
+    배치 큐에 청크를 넣고 결과를 기다린다.
+    timeout 안에 결과가 없으면(디스패처 미실행 등) None → 호출 측이 단건 전송.
+    None 을 반환할 때는 요청이 큐에 남아 있지 않다 (호출 측이 파일을 지워도 안전).
+    """
+    timeout = AI_BATCH_WAIT_TIMEOUT if timeout is None else timeout
+
+    payload = json.dumps({
+        "chunk_id": chunk_id,
+        "path": audio_path,
+        "queued_at": time.time(),
+    })
+    r.rpush(PENDING_KEY, payload)
+
+    item = blocking_r.blpop(_result_key(chunk_id), timeout=timeout)
+    if item is None and not r.lrem(PENDING_KEY, 1, payload):
+        # 디스패처가 이미 가져가 전송 중 → 파일을 읽는 중일 수 있으니 결과를 한 번 더 기다림
+        item = blocking_r.blpop(_result_key(chunk_id), timeout=timeout)
+    if item is None:
+        print(f"⚠️ 배치 결과 대기 시간 초과 (chunk={chunk_id}) → 단건 전송")
+        return None
+    return json.loads(item[1])
+
+
+def collect_batch(window_ms=None, max_size=None, idle_timeout=1):
+    """
+    첫 요청이 올 때까지 최대 idle_timeout 초 대기한 뒤,
+    window_ms 동안 또는 max_size 개가 찰 때까지 요청을 모은다.
+    """
+    window_ms = AI_BATCH_WINDOW_MS if window_ms is None else window_ms
+    max_size = AI_BATCH_MAX_SIZE if max_size is None else max_size
+
+    first = blocking_r.blpop(PENDING_KEY, timeout=idle_timeout)
+    if first is None:
+        return []
+
+    batch = [json.loads(first[1])]
+    deadline = time.monotonic() + window_ms / 1000
+
+    while len(batch) < max_size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        item = blocking_r.blpop(PENDING_KEY, timeout=remaining)
+        if item is None:
+            break
+        batch.append(json.loads(item[1]))
+
+    return batch
+
+
+def publish_results(results):
+    """results: {chunk_id: result dict} → 각 태스크의 결과 키로 전달 (파이프라인 1회)"""
+    pipe = r.pipeline(transaction=False)
+    for chunk_id, result in results.items():
+        key = _result_key(chunk_id)
+        pipe.rpush(key, json.dumps(result))
+        pipe.expire(key, RESULT_TTL)
+    pipe.execute()
@@ -0,0 +1,188 @@
+import re
+
+from django.conf import settings
+
+from apps.recordings.services.redis_client import r
+from .station_index import STATION_INDEX
+from .nlp import EMPTY_INFO, jamo_similarity
+
+
+# ==========================================================
+#  정형 안내방송 템플릿 파서 (LLM 없이)
+#  - "이번 역은 ___역입니다" / "내리실 문은 ___쪽입니다" /
+#    "환승하실 승객께서는 ___" / 지연·안전 안내 / 인사말 등 정형 문장만 처리
+#  - 문장마다 템플릿을 맞춰 보고, 글자 수 가중 평균으로 confidence 계산
+#    (어느 템플릿에도 안 맞는 문장 = 0 → 잘린 문장이 섞이면 LLM 으로)
+#  - 결과는 analyze_announcement_v1 과 같은 {"full_text", "summary", "info"}
+# ==========================================================
+
+TEMPLATE_MIN_CONFIDENCE = getattr(settings, "TEMPLATE_MIN_CONFIDENCE", 0.85)
+
+# 문장 끝 (구두점이 없는 STT 결과도 여기서 끊음)
+SENTENCE_END = re.compile(r"(니다|십시오|세요)(?=\s|$)")
+
+STATION_RE = re.compile(r"^이번\s*(?:역|정차역)은\s*(?P<name>.+?)\s*(?:역)?\s*입니다$")
+DOOR_RE = re.compile(r"^내리실\s*문은\s*(?P<side>왼|오른)\s*(?:쪽|죽|쪼)\s*입니다$")
+TRANSFER_RE = re.compile(r"환승|갈아타")
+
+NUMERALS = {"일": 1, "이": 2, "삼": 3, "사": 4, "오": 5, "육": 6, "칠": 7, "팔": 8, "구": 9}
+LINE_NUMBER_RE = re.compile(r"([1-9]|[일이삼사오육칠팔구])\s*호선")
+NAMED_LINES = ["신분당선", "수인분당선", "분당선", "경의중앙선", "경춘선", "공항철도", "우이신설선", "신림선", "서해선", "경강선", "김포골드라인"]
+NAMED_LINE_RE = re.compile("|".join(
+    # "신분당선" / "신분당 선" / "신분당" 모두 허용 (긴 이름 먼저)
+    re.escape(name[:-1]) + r"\s*선?" if name.endswith("선") else re.escape(name)
+    for name in sorted(NAMED_LINES, key=len, reverse=True)
+))
+
+# (패턴, 경고 라벨) — 위에서부터 첫 번째로 맞는 것
+WARNINGS = [
+    (re.compile(r"지연|늦어지"), "열차 지연 안내"),
+    (re.compile(r"간격이\s*넓|발\s*빠짐"), "승강장 간격 주의"),
+    (re.compile(r"출입문.*(닫|기대|끼)"), "출입문 안전 주의"),
+    (re.compile(r"안전|조심|주의"), "안전 주의 안내"),
+]
+
+# 정보는 없지만 정형인 문장 (처리한 것으로 간주)
+FILLERS = re.compile(
+    r"^(감사합니다|안녕히\s*가십시오|잊으신\s*물건.*|다음\s*역은.*입니다|"
+    r"우리\s*열차는.*(행|방면).*입니다|.*(도착|출발)(합니다|하겠습니다))$"
+)
+
+
+def split_sentences(text: str) -> list:
+    text = SENTENCE_END.sub(r"\1.", text)
+    return [s.strip() for s in re.split(r"[.?!]+", text) if s.strip()]
+
+
+def resolve_station(name: str):
+    """
+    STATION_NAMES 로 역명 확정 → (역명, confidence) / 못 찾으면 (None, 0)
+    정확히 일치하면 1.0, 아니면 자모 유사도.
+    """
+    compact = name.replace(" ", "")
+    if compact in STATION_INDEX.names:
+        return compact, 1.0
+    if compact.endswith("역") and compact[:-1] in STATION_INDEX.names:
+        return compact[:-1], 1.0
+
+    found = STATION_INDEX.find_similar(compact)
+    if not found:
+        return None, 0.0
+    return found, jamo_similarity(compact, found)
+
+
+def _lines(sentence: str) -> list:
+    found = []
+    for m in LINE_NUMBER_RE.finditer(sentence):
+        num = m.group(1)
+        found.append(f"{NUMERALS.get(num, num)}호선")
+    for m in NAMED_LINE_RE.finditer(sentence):
+        stem = re.sub(r"\s", "", m.group(0)).rstrip("선")
+        found.append(next(n for n in NAMED_LINES if n.rstrip("선") == stem))
+    return list(dict.fromkeys(found))
+
+
+def _parse_sentence(sentence: str, info: dict):
+    """문장 하나를 템플릿에 맞춰 info 를 채우고 (정규화된 문장 | None, confidence) 반환"""
+    m = STATION_RE.match(sentence)
+    if m:
+        station, conf = resolve_station(m.group("name"))
+        if not station:
+            return None, 0.0
+        info["station"] = station if station.endswith("역") else f"{station}역"
+        return f"이번 역은 {info['station']}입니다.", conf
+
+    m = DOOR_RE.match(sentence)
+    if m:
+        info["door"] = f"{m.group('side')}쪽"
+        return f"내리실 문은 {info['door']}입니다.", 1.0
+
+    if TRANSFER_RE.search(sentence):
+        lines = _lines(sentence)
+        if not lines:
+            return None, 0.0
+        info["transfers"] += [l for l in lines if l not in info["transfers"]]
+        return f"{sentence}.", 1.0
+
+    for pattern, label in WARNINGS:
+        if pattern.search(sentence):
+            if label not in info["warnings"]:
+                info["warnings"].append(label)
+            return f"{sentence}.", 0.9
+
+    if FILLERS.match(sentence):
+        return f"{sentence}.", 1.0
+
+    return None, 0.0
+
+
+def summarize(info: dict) -> str:
+    """analyze_announcement_v1 의 summary 4줄 형식"""
+    return "\n".join([
+        f"- 역: {info['station'] or '없음'}",
+        f"- 문 방향: {info['door'] or '없음'}",
+        f"- 환승: {', '.join(info['transfers']) or '없음'}",
+        f"- 기타: {', '.join(info['warnings']) or '없음'}",
+    ])
+
+
+def parse_announcement(text: str) -> dict:
+    """
+    반환: {"full_text", "summary", "info", "confidence"}
+    confidence: 문장 글자 수 가중 평균 (정보 문장이 하나도 없으면 0)
+    """
+    info = dict(EMPTY_INFO, transfers=[], warnings=[])
+    sentences = split_sentences(text)
+
+    parsed, weighted, total = [], 0.0, 0
+    for sentence in sentences:
+        normalized, conf = _parse_sentence(sentence, info)
+        size = len(sentence.replace(" ", ""))
+        weighted += conf * size
+        total += size
+        if normalized:
+            parsed.append(normalized)
+
+    has_info = info != EMPTY_INFO
+    confidence = weighted / total if total and has_info else 0.0
+
+    return {
+        "full_text": " ".join(parsed),
+        "summary": summarize(info),
+        "info": info,
+        "confidence": round(confidence, 3),
+    }
+
+
+def try_parse(text: str):
+    """confidence 가 TEMPLATE_MIN_CONFIDENCE 이상이면 analysis dict, 아니면 None"""
+    result = parse_announcement(text)
+    if result.pop("confidence") < TEMPLATE_MIN_CONFIDENCE:
+        return None
+    return result
+
+
+# ==========================================================
+#  세션별 처리 통계 (Redis 해시 template:{session_id})
+# ==========================================================
+def _stats_key(session_id):
+    return f"template:{session_id}"
+
+
+def record_parse_stats(session_id, parsed, llm):
+    pipe = r.pipeline(transaction=False)
+    pipe.hincrby(_stats_key(session_id), "parsed", parsed)
+    pipe.hincrby(_stats_key(session_id), "llm_calls", llm)
+    pipe.expire(_stats_key(session_id), 60 * 60 * 24)
+    pipe.execute()
+
+
+def template_stats(session_id) -> dict:
+    raw = r.hgetall(_stats_key(session_id))
+    stats = {k.decode(): int(v) for k, v in raw.items()}
+    parsed, llm = stats.get("parsed", 0), stats.get("llm_calls", 0)
+    return {
+        "parsed": parsed,
+        "llm_calls": llm,
+        "llm_rate": round(llm / (parsed + llm), 3) if parsed + llm else 0.0,
+    }
@@ -0,0 +1,249 @@
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+
+from apps.recordings.models import AudioChunk, ChunkUpload
+from apps.recordings.sse.publisher import event_batch, push_event
+from .redis_client import r
+from apps.recordings.tasks import process_audio_chunk
+from .counters import mark_counted
+
+
+# ==========================================================
+#  스트리밍 · 이어받기 업로드
+#  - 본문을 메모리에 올리지 않고 UPLOAD_PART_SIZE 씩 읽어 .part 파일에 이어 씀
+#  - 현재 offset 은 디스크의 .part 크기 (끊긴 뒤에도 그대로 이어받기)
+#  - 파트 단위 sha256 (Upload-Checksum) / 전체 sha256 (commit) 검증
+# ==========================================================
+
+UPLOAD_PART_SIZE = getattr(settings, "UPLOAD_PART_SIZE", 1024 * 1024)
+UPLOAD_MAX_SIZE = getattr(settings, "UPLOAD_MAX_SIZE", 200 * 1024 * 1024)
+UPLOAD_DIR = os.path.join(settings.MEDIA_ROOT, "uploads")
+
+# 같은 업로드에 동시에 쓰지 않도록 잡는 Redis 락 (초)
+UPLOAD_LOCK_TTL = 300
+# 이 시간 동안 진행이 없는 업로드는 정리 대상
+UPLOAD_STALE_AFTER = timedelta(hours=6)
+
+
+class UploadError(Exception):
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def part_path(upload) -> str:
+    return os.path.join(UPLOAD_DIR, f"{upload.id}.part")
+
+
+def upload_offset(upload) -> int:
+    """디스크에 실제로 기록된 바이트 수"""
+    path = part_path(upload)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def _lock_key(upload):
+    return f"upload_lock:{upload.id}"
+
+
+def _acquire(upload):
+    if not r.set(_lock_key(upload), 1, nx=True, ex=UPLOAD_LOCK_TTL):
+        raise UploadError("upload is busy", 409)
+
+
+def _release(upload):
+    r.delete(_lock_key(upload))
+
+
+def _refresh(upload):
+    """락을 잡은 뒤 상태를 다시 읽음 — 락 대기 중 다른 요청이 commit / 삭제했을 수 있음"""
+    try:
+        upload.refresh_from_db()
+    except ChunkUpload.DoesNotExist:
+        raise UploadError("upload not found", 404)
+
+
+def _file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(UPLOAD_PART_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def create_upload(session, filename, size, sha256="") -> ChunkUpload:
+    if size <= 0 or size > UPLOAD_MAX_SIZE:
+        raise UploadError(f"size must be between 1 and {UPLOAD_MAX_SIZE}", 413)
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    upload = ChunkUpload.objects.create(
+        session=session,
+        filename=os.path.basename(filename) or "audio",
+        size=size,
+        sha256=sha256.lower(),
+    )
+    open(part_path(upload), "wb").close()
+    return upload
+
+
+def write_part(upload, stream, offset, length, checksum=None) -> int:
+    """
+    stream 에서 length 바이트를 읽어 offset 위치에 이어 쓴다. 반환: 새 offset
+    - offset 이 디스크 크기와 다르면 409 (클라이언트는 HEAD 로 offset 재조회)
+    - checksum 이 있으면 파트 전체가 도착하고 해시가 맞을 때만 반영
+    - checksum 이 없으면 연결이 끊겨도 받은 만큼은 남겨 두고 이어받기
+    """
+    if upload.status != "UPLOADING":
+        raise UploadError("upload already committed", 409)
+
+    _acquire(upload)
+    try:
+        # commit 된 뒤 도착한 PATCH 가 새 .part 를 만들지 않도록
+        _refresh(upload)
+        if upload.status != "UPLOADING":
+            raise UploadError("upload already committed", 409)
+
+        current = upload_offset(upload)
+        if offset != current:
+            raise UploadError(f"offset mismatch (expected {current})", 409)
+        if offset + length > upload.size:
+            raise UploadError("part exceeds declared size", 413)
+
+        digest = hashlib.sha256()
+        received = 0
+        with open(part_path(upload), "ab") as f:
+            while received < length:
+                try:
+                    block = stream.read(min(UPLOAD_PART_SIZE, length - received))
+                except OSError as e:
+                    print(f"⚠️ 업로드 연결 끊김 (upload={upload.id}, offset={offset + received}):", e)
+                    break
+                if not block:
+                    break
+                f.write(block)
+                digest.update(block)
+                received += len(block)
+
+        if checksum and (received != length or digest.hexdigest() != checksum.lower()):
+            # 검증 실패한 파트는 버리고 이전 offset 으로 되돌림
+            os.truncate(part_path(upload), offset)
+            raise UploadError("part checksum mismatch", 422)
+
+        upload.offset = offset + received
+        upload.save(update_fields=["offset", "updated_at"])
+        return upload.offset
+    finally:
+        _release(upload)
+
+
+@event_batch()  # status / chunk_received 를 한 번에 발행
+def start_chunk_processing(session, saved_path, saved_name) -> AudioChunk:
+    """저장이 끝난 오디오 파일로 AudioChunk 생성 + 처리 태스크 호출 + SSE 알림"""
+
+    # ① 세션 상태를 RECORDING으로 강제 설정 (종료/유휴 종료된 세션이면 녹음 재개)
+    if session.status != "RECORDING" or session.ended_at is not None:
+        session.status = "RECORDING"
+        session.ended_at = None
+        session.save()
+
+        # SSE로 상태 변경 알림 (선택)
+        push_event(session.id, {
+            "type": "status",
+            "status": session.status
+        })
+
+    # ② AudioChunk 레코드 생성
+    chunk = AudioChunk.objects.create(
+        session=session,
+        file_path=saved_path,
+        status="PENDING",
+    )
+    mark_counted(session.id, "received", [chunk.id])
+
+    # ③ 비동기 처리 태스크 호출
+    process_audio_chunk.delay(chunk.id)
+
+    # ④ SSE로 "새 chunk 들어옴" 알림
+    push_event(session.id, {
+        "type": "chunk_received",
+        "chunk_id": chunk.id,
+        "file": saved_name
+    })
+
+    return chunk
+
+
+def commit_upload(upload) -> AudioChunk:
+    """
+    업로드 완료 처리 — 크기/전체 해시 확인 후 media/audio/ 로 옮기고 AudioChunk 생성.
+    이미 commit 된 업로드면 기존 AudioChunk 를 그대로 반환 (commit 재시도 안전).
+    """
+    if upload.status == "COMMITTED":
+        return upload.chunk
+
+    _acquire(upload)
+    try:
+        # 동시에 들어온 commit 재시도 → 먼저 끝난 commit 의 AudioChunk
+        _refresh(upload)
+        if upload.status == "COMMITTED":
+            return upload.chunk
+
+        path = part_path(upload)
+        received = upload_offset(upload)
+        if received != upload.size:
+            raise UploadError(f"incomplete upload ({received}/{upload.size})", 409)
+        if upload.sha256 and _file_sha256(path) != upload.sha256:
+            raise UploadError("file checksum mismatch", 422)
+
+        # 같은 볼륨 안에서 이동만 (복사 없음)
+        fs = FileSystemStorage(location="media/audio/")
+        os.makedirs(fs.location, exist_ok=True)
+        saved_name = fs.get_available_name(upload.filename)
+        saved_path = fs.path(saved_name)
+        os.replace(path, saved_path)
+
+        chunk = start_chunk_processing(upload.session, saved_path, saved_name)
+
+        upload.status = "COMMITTED"
+        upload.chunk = chunk
+        upload.save(update_fields=["status", "chunk", "updated_at"])
+        return chunk
+    finally:
+        _release(upload)
+
+
+def discard_upload(upload):
+    path = part_path(upload)
+    if os.path.exists(path):
+        os.remove(path)
+    upload.delete()
+
+
+def cleanup_stale_uploads() -> int:
+    """오래 멈춘 업로드와 레코드 없이 남은 .part 파일을 지운다. 반환: 지운 파일 수"""
+    cutoff = timezone.now() - UPLOAD_STALE_AFTER
+    stale = list(ChunkUpload.objects.filter(status="UPLOADING", updated_at__lt=cutoff))
+    for upload in stale:
+        discard_upload(upload)
+
+    if not os.path.isdir(UPLOAD_DIR):
+        return 0
+
+    # 세션 삭제(CASCADE)로 레코드만 사라진 파일 (방금 만들어진 파일은 건너뜀)
+    alive = {str(pk) for pk in ChunkUpload.objects.filter(status="UPLOADING").values_list("id", flat=True)}
+    removed = 0
+    for name in os.listdir(UPLOAD_DIR):
+        path = os.path.join(UPLOAD_DIR, name)
+        if not name.endswith(".part") or name[:-len(".part")] in alive:
+            continue
+        if os.path.getmtime(path) < cutoff.timestamp():
+            os.remove(path)
+            removed += 1
+
+    return removed + len(stale)
@@ -0,0 +1,103 @@
+import numpy as np
+from django.conf import settings
+
+from apps.recordings.services.redis_client import r
+from .audio_decode import SAMPLE_RATE
+
+
+# ==========================================================
+#  AI 서버 호출 전 음성 구간 검출 (에너지 + 스펙트럼 평탄도)
+#  - 프레임별 에너지(dBFS)가 충분하고 스펙트럼이 평탄하지 않은(=음색이 있는)
+#    프레임만 음성으로 본다. 승강장 소음/환풍기 소리는 평탄도가 높다.
+#  - 음성 프레임 합이 VAD_MIN_SPEECH_MS 미만이면 무음 청크
+#  - 디코딩 실패 등 판단 불가일 때는 항상 음성으로 취급 (AI 서버로 보냄)
+# ==========================================================
+
+VAD_ENABLED = getattr(settings, "VAD_ENABLED", True)
+VAD_FRAME_MS = getattr(settings, "VAD_FRAME_MS", 30)
+VAD_ENERGY_DB = getattr(settings, "VAD_ENERGY_DB", -50.0)
+VAD_FLATNESS_MAX = getattr(settings, "VAD_FLATNESS_MAX", 0.35)
+VAD_MIN_SPEECH_MS = getattr(settings, "VAD_MIN_SPEECH_MS", 300)
+
+# 평탄도는 음성 대역에서만 계산
+SPEECH_BAND = (300, 4000)
+EPS = 1e-10
+STATS_TTL = 60 * 60 * 24
+
+
+def frame_features(pcm, sample_rate=SAMPLE_RATE, frame_ms=None):
+    """
+    반환: (energy_db, flatness) — 프레임별 배열
+    energy_db : 프레임 평균 파워 (dBFS)
+    flatness  : 음성 대역 (소음 백색화) 파워 스펙트럼의 기하평균 / 산술평균
+                (0 음색 ~ 0.56 정상 소음)
+    """
+    frame_ms = VAD_FRAME_MS if frame_ms is None else frame_ms
+    frame_len = int(sample_rate * frame_ms / 1000)
+    n_frames = len(pcm) // frame_len
+    if n_frames == 0:
+        return np.empty(0), np.empty(0)
+
+    frames = pcm[:n_frames * frame_len].reshape(n_frames, frame_len)
+
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + EPS)
+
+    power = np.abs(np.fft.rfft(frames * np.hanning(frame_len), axis=1)) ** 2 + EPS
+    freqs = np.fft.rfftfreq(frame_len, 1 / sample_rate)
+    band = power[:, (freqs >= SPEECH_BAND[0]) & (freqs <= SPEECH_BAND[1])]
+    # 청크 전체의 주파수별 중앙값으로 나눠 정상(stationary) 소음의 색을 지움
+    # → 핑크/브라운 계열 소음도 평탄하게 보이고, 음성 배음만 튀어나옴
+    band = band / np.median(band, axis=0)
+    flatness = np.exp(np.mean(np.log(band), axis=1)) / np.mean(band, axis=1)
+
+    return energy_db, flatness
+
+
+def detect_speech(pcm, sample_rate=SAMPLE_RATE) -> dict:
+    energy_db, flatness = frame_features(pcm, sample_rate)
+    voiced = (energy_db > VAD_ENERGY_DB) & (flatness < VAD_FLATNESS_MAX)
+    speech_ms = int(voiced.sum()) * VAD_FRAME_MS
+
+    return {
+        "speech": speech_ms >= VAD_MIN_SPEECH_MS,
+        "speech_ms": speech_ms,
+        "duration": round(len(pcm) / sample_rate, 2),
+        "energy_db_max": round(float(energy_db.max()), 1) if len(energy_db) else None,
+        "flatness_min": round(float(flatness.min()), 3) if len(flatness) else None,
+    }
+
+
+def _record(session_id, field):
+    key = f"vad:{session_id}"
+    pipe = r.pipeline()
+    pipe.hincrby(key, field, 1)
+    pipe.expire(key, STATS_TTL)
+    pipe.execute()
+
+
+def vad_stats(session_id) -> dict:
+    raw = r.hgetall(f"vad:{session_id}")
+    stats = {k.decode(): int(v) for k, v in raw.items()}
+    return {
+        "passed": stats.get("passed", 0),
+        "skipped": stats.get("skipped", 0),
+    }
+
+
+def check_chunk(chunk, pcm) -> dict:
+    """
+    디코딩된 청크(pcm)에 음성이 있는지 판단한다 (AI 서버 호출 전).
+    반환: detect_speech 결과 (디코딩 실패 등 판단 불가면 speech=True)
+    세션별 판단 결과는 Redis 해시 vad:{session_id} 에 passed / skipped 로 누적
+    """
+    if not VAD_ENABLED or pcm is None:
+        return {"speech": True}
+
+    decision = detect_speech(pcm)
+    label = "🗣️ 음성" if decision["speech"] else "🔇 무음 → AI 호출 생략"
+    print(
+        f"{label} (chunk={chunk.id}, speech={decision['speech_ms']}ms/{decision['duration']}s, "
+        f"energy_max={decision['energy_db_max']}dB, flatness_min={decision['flatness_min']})"
+    )
+    _record(chunk.session_id, "passed" if decision["speech"] else "skipped")
+    return decision
@@ -1,6 +1,108 @@
-import redis, json
+import json
+import threading
+from contextlib import contextmanager
+from django.conf import settings
+
+from apps.recordings.services.redis_client import LazyScript, r
+
+
+# ==========================================================
+#  세션 이벤트 발행
+#  - events:{session_id} (Redis Stream, 최근 SSE_STREAM_MAXLEN 개) 에 기록
+#    → 스트림 ID 가 SSE 의 id: 가 되고, 재연결 시 Last-Event-ID 이후만 재전송
+#  - 같은 스크립트 안에서 session:{session_id} 로 "ID 데이터" 줄들을 PUBLISH (실시간 전달)
+#  - event_batch() 블록 안에서는 이벤트를 모아 두었다가 블록이 끝날 때
+#    세션별 스크립트 1회 (파이프라인 1회) 로 발행, 상태 이벤트는 마지막 값만 남김
+# ==========================================================
+
+SSE_STREAM_MAXLEN = getattr(settings, "SSE_STREAM_MAXLEN", 500)
+SSE_STREAM_TTL = getattr(settings, "SSE_STREAM_TTL", 60 * 60 * 2)
+
+# 최신 값이 이전 값을 대체하는 이벤트 (중간 값은 버려도 됨)
+STATE_EVENTS = {"status", "chunk_count", "results_progress"}
+
+
+def stream_key(session_id):
+    return f"events:{session_id}"
+
+
+_append_and_publish = LazyScript("""
+local lines = {}
+for i = 3, #ARGV do
+    local id = redis.call('xadd', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[i])
+    lines[#lines + 1] = id .. ' ' .. ARGV[i]
+end
+redis.call('expire', KEYS[1], ARGV[2])
+redis.call('publish', KEYS[2], table.concat(lines, '\\n'))
+return #lines
+""")
+
+
+def coalesce(payloads):
+    """상태 이벤트는 타입별 마지막 것만 (그 위치에) 남기고, 나머지는 순서대로 유지"""
+    last = {
+        p.get("type"): i
+        for i, p in enumerate(payloads)
+        if p.get("type") in STATE_EVENTS
+    }
+    return [
+        p for i, p in enumerate(payloads)
+        if p.get("type") not in STATE_EVENTS or last[p.get("type")] == i
+    ]
+
+
+def _publish(session_id, payloads, client=None):
+    _append_and_publish(
+        keys=[stream_key(session_id), f"session:{session_id}"],
+        args=[SSE_STREAM_MAXLEN, SSE_STREAM_TTL, *(json.dumps(p) for p in payloads)],
+        client=client,
+    )
+
+
+# ==========================================================
+#  배치 (태스크 / 요청 단위)
+# ==========================================================
+_local = threading.local()
+
+
+@contextmanager
+def event_batch():
+    """
+    with event_batch(): / @event_batch()
+    블록 안의 push_event / push_events 를 모아 끝날 때 한 번에 발행 (예외가 나도 발행).
+    중첩되면 가장 바깥 블록에서 발행.
+    """
+    if getattr(_local, "buffer", None) is not None:
+        yield
+        return
+
+    _local.buffer = {}
+    try:
+        yield
+    finally:
+        buffer, _local.buffer = _local.buffer, None
+        flush(buffer)
+
+
+def flush(buffer):
+    if not buffer:
+        return
+    pipe = r.pipeline(transaction=False)
+    for session_id, payloads in buffer.items():
+        _publish(session_id, coalesce(payloads), client=pipe)
+    pipe.execute()
 
-r = redis.Redis(host="redis", port=6379, db=0)
 
 def push_event(session_id, payload):
-    r.publish(f"session:{session_id}", json.dumps(payload))
+    push_events(session_id, [payload])
+
+
+def push_events(session_id, payloads):
+    """여러 이벤트를 스크립트 한 번으로 발행 (배치 중이면 버퍼에 추가)"""
+    if not payloads:
+        return
+    buffer = getattr(_local, "buffer", None)
+    if buffer is not None:
+        buffer.setdefault(session_id, []).extend(payloads)
+        return
+    _publish(session_id, payloads)
@@ -1,22 +1,216 @@
-import time
-import redis
-from django.http import StreamingHttpResponse
+import asyncio
+import json
+import re
+import weakref
 
-r = redis.Redis(host="redis", port=6379, db=0)
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
 
-def event_stream(session_id):
-    pubsub = r.pubsub()
-    pubsub.subscribe(f"session:{session_id}")
+from apps.recordings.models import Session
+from apps.recordings.services.redis_client import get_async_redis
+from apps.recordings.sse.publisher import STATE_EVENTS, stream_key
 
-    for message in pubsub.listen():
-        if message["type"] == "message":
-            data = message["data"].decode("utf-8")
-            yield f"data: {data}\n\n"
 
+# ==========================================================
+#  SSE 스트림 (ASGI)
+#  - 프로세스당 Redis 구독 1개 (PSUBSCRIBE session:*)
+#  - 받은 메시지를 세션별 클라이언트 큐로 분배 (fan-out)
+#  - 클라이언트 큐는 SSE_CLIENT_BUFFER 개까지 → 넘치면 가장 오래된 이벤트부터 버림
+#  - 이벤트가 없으면 SSE_HEARTBEAT_SEC 마다 주석 줄(": ping") 전송
+#  - 연결이 끊기면 제너레이터가 취소되고 finally 에서 큐 해제
+#  - 이벤트마다 id: (Redis Stream ID) 를 붙이고, 재연결 시 Last-Event-ID 이후를
+#    events:{session_id} 스트림에서 먼저 재전송한 뒤 실시간 전달로 넘어감
+#  - 이벤트를 받으면 SSE_COALESCE_MS 동안 더 모아 한 번에 쓰고,
+#    그 사이 같은 상태 이벤트(chunk_count 등)가 여러 번 오면 마지막 것만 보냄
+# ==========================================================
+
+SSE_HEARTBEAT_SEC = getattr(settings, "SSE_HEARTBEAT_SEC", 15)
+SSE_CLIENT_BUFFER = getattr(settings, "SSE_CLIENT_BUFFER", 100)
+SSE_COALESCE_MS = getattr(settings, "SSE_COALESCE_MS", 50)
+
+CHANNEL_PATTERN = "session:*"
+EVENT_ID = re.compile(r"^\d+-\d+$")
+
+
+def _id_key(event_id):
+    ms, seq = event_id.split("-")
+    return int(ms), int(seq)
+
+
+class SessionHub:
+    """이벤트 루프 하나에 묶인 공유 구독자 + 세션별 클라이언트 큐"""
+
+    def __init__(self):
+        self.redis = get_async_redis()
+        self.clients = {}     # session_id(str) → set[asyncio.Queue]
+        self.dropped = 0      # 버퍼가 넘쳐 버린 이벤트 수
+        self.ready = asyncio.Event()   # PSUBSCRIBE 완료 여부
+        self._task = None
+
+    def subscribe(self, session_id):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+        queue = asyncio.Queue(maxsize=SSE_CLIENT_BUFFER)
+        self.clients.setdefault(str(session_id), set()).add(queue)
+        return queue
+
+    def unsubscribe(self, session_id, queue):
+        queues = self.clients.get(str(session_id))
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.clients[str(session_id)]
+
+    def stats(self):
+        return {
+            "sessions": len(self.clients),
+            "clients": sum(len(q) for q in self.clients.values()),
+            "dropped": self.dropped,
+        }
+
+    def dispatch(self, session_id, event):
+        for queue in self.clients.get(session_id, ()):
+            if queue.full():
+                # 느린 클라이언트 — 가장 오래된 이벤트를 버리고 최신 이벤트 유지
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+
+    async def replay(self, session_id, last_event_id):
+        """
+        Last-Event-ID 이후 이벤트 [(id, data), ...]
+        last_event_id 이후 구간이 이미 잘려 나갔거나(MAXLEN) 만료됐으면 맨 앞에
+        resync 이벤트를 넣는다 (클라이언트는 status/ 를 한 번 다시 조회).
+        """
+        key = stream_key(session_id)
+        entries = await self.redis.xrange(key, min=f"({last_event_id}", max="+")
+        events = [(eid.decode(), fields[b"data"].decode("utf-8")) for eid, fields in entries]
+
+        first = await self.redis.xrange(key, count=1)
+        if not first or _id_key(first[0][0].decode()) > _id_key(last_event_id):
+            events.insert(0, (None, json.dumps({"type": "resync"})))
+        return events
+
+    async def _listen(self):
+        reconnect = False
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.psubscribe(CHANNEL_PATTERN)
+                self.ready.set()
+                print(f"📡 SSE 구독 시작 ({CHANNEL_PATTERN})")
+                if reconnect:
+                    # 끊긴 동안의 이벤트는 알 수 없음 → 모든 클라이언트에 resync
+                    for session_id in list(self.clients):
+                        self.dispatch(session_id, (None, json.dumps({"type": "resync"})))
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    session_id = message["channel"].decode().split(":", 1)[1]
+                    # 발행 1회에 이벤트 여러 줄 ("ID 데이터")
+                    for line in message["data"].decode("utf-8").split("\n"):
+                        event_id, data = line.split(" ", 1)
+                        self.dispatch(session_id, (event_id, data))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("[ERROR] SSE 구독 끊김, 재연결:", e)
+                self.ready.clear()
+                reconnect = True
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+# 이벤트 루프별 허브 (운영은 uvicorn 워커당 루프 1개)
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_hub():
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = SessionHub()
+    return hub
+
+
+def _format(event_id, data):
+    if event_id is None:
+        return f"data: {data}\n\n"
+    return f"id: {event_id}\ndata: {data}\n\n"
+
+
+def _coalesce(events):
+    """[(id, data), ...] 에서 상태 이벤트는 타입별 마지막 것만 남김"""
+    types = [json.loads(data).get("type") for _, data in events]
+    last = {t: i for i, t in enumerate(types) if t in STATE_EVENTS}
+    return [e for i, (e, t) in enumerate(zip(events, types)) if t not in STATE_EVENTS or last[t] == i]
+
+
+async def _next_events(queue):
+    """이벤트 하나를 기다린 뒤 SSE_COALESCE_MS 동안 들어온 것까지 함께 반환"""
+    events = [await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SEC)]
+    if SSE_COALESCE_MS:
+        await asyncio.sleep(SSE_COALESCE_MS / 1000)
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return _coalesce(events)
+
+
+async def event_stream(session_id, last_event_id=None):
+    hub = get_hub()
+    # 재전송 중 발행되는 이벤트도 놓치지 않도록 구독을 먼저 건다
+    queue = hub.subscribe(session_id)
+    try:
+        yield ": connected\n\n"
+        # 구독이 실제로 걸린 뒤에 재전송 (그 사이 발행된 이벤트 누락 방지)
+        # Redis 재연결이 길어져도 프록시가 끊지 않도록 기다리는 동안 ping
+        while not hub.ready.is_set():
+            try:
+                await asyncio.wait_for(hub.ready.wait(), timeout=SSE_HEARTBEAT_SEC)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+
+        last_key = None
+        if last_event_id:
+            last_key = _id_key(last_event_id)
+            for event_id, data in await hub.replay(session_id, last_event_id):
+                yield _format(event_id, data)
+                if event_id is not None:
+                    last_key = _id_key(event_id)
+
+        while True:
+            try:
+                events = await _next_events(queue)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            # 재전송으로 이미 보낸 이벤트는 건너뜀
+            if last_key is not None:
+                events = [
+                    (event_id, data) for event_id, data in events
+                    if event_id is None or _id_key(event_id) > last_key
+                ]
+            if events:
+                yield "".join(_format(event_id, data) for event_id, data in events)
+    finally:
+        hub.unsubscribe(session_id, queue)
+
+
+# [GET] /api/session/{id}/stream/
+async def session_event_stream(request, session_id):
+    if not await Session.objects.filter(id=session_id).aexists():
+        raise Http404("Session not found")
+
+    # EventSource 는 재연결 시 Last-Event-ID 헤더를 자동으로 보냄 (쿼리 파라미터도 허용)
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    if last_event_id and not EVENT_ID.match(last_event_id):
+        last_event_id = None
 
-def session_event_stream(request, session_id):
     response = StreamingHttpResponse(
-        event_stream(session_id),
+        event_stream(session_id, last_event_id),
         content_type="text/event-stream",
     )
     response["Cache-Control"] = "no-cache"
@@ -1,10 +1,30 @@
+import os
+
 from celery import shared_task
 from django.utils import timezone
 from apps.recordings.services.ai_client import call_ai_server
-from apps.recordings.models import AudioChunk
+from apps.recordings.services.audio_decode import decode_pcm
+from apps.recordings.services.vad import check_chunk
+from apps.recordings.services.stitcher import (
+    STITCH_TEXT_WAIT,
+    build_overlap_audio,
+    previous_chunk,
+    previous_text_or_park,
+    save_tail,
+    save_tail_text,
+    stitch,
+    stored_text,
+    take_parked,
+)
+from apps.recordings.services.merger import extract_features
+from apps.recordings.services.grouper import assign_announcement, assign_pending_broadcasts
+from apps.recordings.models import AudioChunk, Session
+from apps.recordings.services.results import build_results, claim_results_job, release_results_job, set_results_job
+from apps.recordings.services.counters import mark_counted, session_counts
+from apps.recordings.services.session_end import finish_session
 from apps.broadcasts.models import Broadcast
 from apps.keywords.utils.detect import detect_keywords_in_chunk
-from apps.recordings.sse.publisher import push_event
+from apps.recordings.sse.publisher import event_batch, push_event
 
 
 @shared_task
@@ -12,51 +32,196 @@ def process_audio_chunk(chunk_id):
     chunk = AudioChunk.objects.get(id=chunk_id)
     session = chunk.session 
 
-    # --- 1) AI 서버 호출 ---
-    result = call_ai_server(chunk.file_path, chunk_id)
+    # --- 0) 로컬 VAD: 음성이 없으면 AI 서버 호출 없이 끝냄 ---
+    pcm = decode_pcm(chunk.file_path)
+    vad = check_chunk(chunk, pcm)
+    if vad.get("duration"):
+        chunk.duration = vad["duration"]
+    if not vad["speech"]:
+        chunk.status = "COMPLETE"
+        chunk.save()
+
+        # 실시간 청크 개수 이벤트 보내기
+        update_session_chunk_count(session, chunk, silent=True)
+        return {"text": "", "is_broadcast": False, "skipped_by_vad": True}
+
+    # --- 1) AI 서버 호출 (앞 청크 꼬리를 겹쳐 붙인 오디오) ---
+    save_tail(chunk, pcm)
+    overlap_path = build_overlap_audio(chunk, pcm)
+    try:
+        result = call_ai_server(overlap_path or chunk.file_path, chunk_id)
+    finally:
+        if overlap_path and os.path.exists(overlap_path):
+            os.remove(overlap_path)
+
+    if "error" in result:
+        print(f"❌ AI 서버 오류 (chunk={chunk_id}):", result["error"])
     text = result.get("text", "")
     confidence = result.get("confidence", 0)
 
-    # 무음이면 아무것도 안 함
-    if text.strip() == "":
+    # 이 전사를 기다리며 결과를 맡겨 둔 다음 청크가 있으면 이어서 처리
+    waiting = save_tail_text(chunk, text)
+    if waiting:
+        finish_audio_chunk.delay(waiting)
+
+    # --- 2) 앞 청크 전사와 겹친 머리 제거 (앞 청크의 Broadcast 유무/처리 순서와 무관) ---
+    #     앞 청크가 아직 STT 중이면 워커를 잡고 기다리지 않고 결과를 맡겨 둔 채 끝냄
+    #     → 앞 청크가 전사를 저장할 때 (늦어도 STITCH_TEXT_WAIT 초 뒤) finish_audio_chunk
+    prev_text = ""
+    if overlap_path:
+        prev_text = previous_text_or_park(previous_chunk(chunk), chunk, text, confidence)
+        if prev_text is None:
+            chunk.save(update_fields=["duration"])
+            finish_audio_chunk.apply_async((chunk.id,), countdown=STITCH_TEXT_WAIT)
+            return {"text": text, "is_broadcast": None, "deferred": True}
+
+    return complete_chunk(chunk, text, confidence, prev_text)
+
+
+@shared_task
+def finish_audio_chunk(chunk_id):
+    """앞 청크 전사를 기다리며 맡겨 둔 STT 결과로 청크 처리를 마무리"""
+    parked = take_parked(chunk_id)
+    if parked is None:
+        # 앞 청크가 깨운 작업 / 시간 초과 작업 중 먼저 실행된 쪽이 이미 처리함
+        return None
+
+    chunk = AudioChunk.objects.filter(id=chunk_id).select_related("session").first()
+    if chunk is None:
+        return None
+
+    prev_text = stored_text(previous_chunk(chunk))
+    if prev_text is None:
+        print(f"⚠️ 앞 청크 전사 없음 (chunk={chunk_id}) → 겹침 제거 생략")
+    return complete_chunk(chunk, parked["text"], parked["confidence"], prev_text or "")
+
+
+def complete_chunk(chunk, text, confidence, prev_text):
+    """STT 전사로 Broadcast 생성 · 키워드 감지 · 그룹 배정 후 청크 완료"""
+    session = chunk.session
+    stitched = stitch(prev_text, text)
+    new_text = stitched["stitched_text"]
+
+    # 무음(또는 겹친 부분뿐)이면 아무것도 안 함
+    if new_text.strip() == "":
         chunk.status = "COMPLETE"
         chunk.save()
         
         # 실시간 청크 개수 이벤트 보내기
-        update_session_chunk_count(session)
+        update_session_chunk_count(session, chunk, silent=True)
         return {"text": "", "is_broadcast": False}
 
-    # --- 3) Broadcast 저장 ---
+    # --- 3) Broadcast 저장 (그룹핑용 특징은 여기서 1회만 계산) ---
     broadcast = Broadcast.objects.create(
         session=session,
         audio_chunk=chunk,
         full_text=text,
         confidence_avg=confidence,
+        **stitched,
+        **extract_features(new_text),
     )
 
-    # --- 4) 키워드 즉시 감지 + Broadcast에 저장 ---
-    detected = detect_keywords_in_chunk(session, text, broadcast)
+    # --- 4) 키워드 즉시 감지 + Broadcast에 저장 (겹친 부분 중복 알림 방지) ---
+    detected = detect_keywords_in_chunk(session, new_text, broadcast)
+
+    # --- 5) 안내방송 그룹 갱신 (열린 그룹 연장 or 새 그룹) ---
+    assign_announcement(broadcast)
 
-    # --- 5) chunk 완료 ---
+    # --- 6) chunk 완료 ---
     chunk.status = "COMPLETE"
     chunk.save()
 
-    # --- 6) SSE: 처리된 chunk 개수 push ---
-    update_session_chunk_count(session)
+    # --- 7) SSE: 처리된 chunk 개수 push ---
+    update_session_chunk_count(session, chunk)
 
     return {
-        "text": text,
+        "text": new_text,
         "is_broadcast": True,
         "detected_keywords": [kw.word for kw in detected] 
     }
 
 
 
-def update_session_chunk_count(session):
-    done = session.chunks.filter(status="COMPLETE").count()
+# 청크 처리 마무리 이벤트(chunk_count / 종료 시 status)만 모아 한 번에 발행
+# (keyword_alert 는 감지 즉시 발행 — 그룹핑 LLM 판단을 기다리지 않음)
+@event_batch()
+def update_session_chunk_count(session, chunk, silent=False):
+    # 청크 완료 카운터에 추가 (COUNT 쿼리 없이 Redis 카운터 사용, 같은 청크는 한 번만)
+    mark_counted(session.id, "completed", [chunk.id])
+    if silent:
+        mark_counted(session.id, "silent", [chunk.id])
+    counts = session_counts(session.id)
 
     # SSE로 실시간 전달
     push_event(session.id, {
         "type": "chunk_count",
-        "done": done,
+        "done": counts["completed"],
+        "total": counts["received"],
+        "silent": counts["silent"],
     })
+
+    # 종료된 세션의 마지막 청크였으면 COMPLETE + 결과 생성 작업 등록
+    if counts["completed"] >= counts["received"]:
+        session.refresh_from_db(fields=["ended_at", "status"])
+        finish_session(session, counts)
+
+
+@shared_task
+def generate_session_results(session_id):
+    """
+    세션 결과(그룹별 LLM 처리 + 전체 요약)를 백그라운드에서 생성해 Transcript 에 저장.
+    진행률은 SSE(results_progress)로, 완료는 results_ready 로 알린다.
+    """
+    session = Session.objects.get(id=session_id)
+    set_results_job(session_id, state="RUNNING")
+
+    def on_progress(done, total):
+        set_results_job(session_id, done=done, total=total)
+        push_event(session_id, {
+            "type": "results_progress",
+            "done": done,
+            "total": total,
+        })
+
+    try:
+        # 그룹이 없는 방송(이전 데이터)은 여기서 배정 (LLM 판단이 섞일 수 있어 조회 경로에서는 안 함)
+        assign_pending_broadcasts(session)
+        payload = build_results(session, on_progress=on_progress)
+    except Exception as e:
+        set_results_job(session_id, state="FAILED", error=str(e))
+        push_event(session_id, {"type": "results_failed", "error": str(e)})
+        raise
+    finally:
+        release_results_job(session_id)
+
+    set_results_job(session_id, state="DONE")
+    push_event(session_id, {
+        "type": "results_ready",
+        "total_announcements": payload["total_announcements"] if payload else 0,
+    })
+
+
+@shared_task
+def cleanup_stale_uploads():
+    """멈춘 이어받기 업로드(.part) 정리 — CELERY_BEAT_SCHEDULE 에서 주기 실행"""
+    from apps.recordings.services.uploads import cleanup_stale_uploads as cleanup
+
+    removed = cleanup()
+    if removed:
+        print(f"🧹 멈춘 업로드 {removed}개 정리")
+
+
+@shared_task
+def end_idle_sessions():
+    """새 청크가 끊긴 녹음 중 세션 종료 — CELERY_BEAT_SCHEDULE 에서 주기 실행"""
+    from apps.recordings.services.session_end import end_idle_sessions as end_idle
+
+    ended = end_idle()
+    if ended:
+        print(f"⏹️ 유휴 세션 {ended}개 종료")
+
+
+def enqueue_results(session):
+    """대기/실행 중인 결과 생성 작업이 없을 때만 Celery 작업을 등록"""
+    if claim_results_job(session.id):
+        generate_session_results.delay(session.id)
@@ -0,0 +1,31 @@
+import os
+from unittest import mock
+
+import fakeredis
+from fakeredis import aioredis as fake_aioredis
+
+from apps.recordings.services import redis_client
+
+
+# ==========================================================
+#  테스트용 Redis — 테스트마다 빈 fakeredis 서버
+#  get_redis() (r / blocking_r / LazyScript) 가 이 서버의 클라이언트를 반환
+# ==========================================================
+class FakeRedisMixin:
+
+    def setUp(self):
+        super().setUp()
+        self.redis_server = fakeredis.FakeServer()
+        pid = os.getpid()
+        clients = {
+            (pid, False): fakeredis.FakeRedis(server=self.redis_server),
+            (pid, True): fakeredis.FakeRedis(server=self.redis_server),
+        }
+        patcher = mock.patch.dict(redis_client._clients, clients, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.redis = clients[(pid, False)]
+
+    def async_redis(self):
+        """같은 서버를 보는 asyncio 클라이언트 (SSE 허브용)"""
+        return fake_aioredis.FakeRedis(server=self.redis_server)
@@ -1,3 +1,630 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import io
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from difflib import SequenceMatcher
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase, TestCase
+
+from apps.broadcasts.models import Broadcast
+from apps.keywords.models import Alert, Keyword
+from apps.recordings.models import AudioChunk, ChunkUpload, Session
+from apps.recordings import tasks
+from apps.recordings.services import (
+    continuation, counters, grouper, llm_cache, merger, results, template_parser, uploads,
+)
+from apps.recordings.services.llm_pool import FAILED
+from apps.recordings.services.nlp import guess_station_name
+from apps.recordings.services.station_index import SIMILARITY_THRESHOLD, jamo
+from apps.recordings.services.station_name import STATION_NAMES
+from apps.recordings.sse import publisher, stream
+from apps.recordings.testing import FakeRedisMixin
+
+
+def _broadcast(text, seconds):
+    return SimpleNamespace(
+        session_id=1,
+        full_text=text,
+        stitched_text=text,
+        overlap_chars=0,
+        created_at=datetime(2025, 1, 1, 8, 0) + timedelta(seconds=seconds),
+    )
+
+
+def _features(text, station=None):
+    return {
+        "station_guess": station,
+        "is_intro": merger.is_intro_broadcast(text),
+        "is_incomplete": merger.is_sentence_incomplete(text),
+        "has_broadcast_keyword": merger.is_broadcast_keyword(text),
+    }
+
+
+# ==========================================================
+#  연속성 점수 — 규칙 0~4 를 통과한 쌍(간격 > 12초, 앞 문장 완결)도
+#  LLM 없이 점수만으로 이어 붙이거나 끊을 수 있어야 한다
+# ==========================================================
+@mock.patch.object(merger, "is_continuation", side_effect=AssertionError("LLM 호출"))
+@mock.patch.object(continuation, "ContinuationBudget")
+class ContinuationScoreTests(SimpleTestCase):
+
+    def _decide(self, prev, curr, prev_station=None, curr_station=None):
+        prev_feat = _features(prev.full_text, prev_station)
+        curr_feat = _features(curr.full_text, curr_station)
+        score = continuation.continuation_score(prev, curr, prev_feat, curr_feat)
+        return score, merger.is_same_announcement(prev, curr, prev_feat, curr_feat)
+
+    def test_accepts_repeated_sentence_after_short_pause(self, budget, ask_llm):
+        prev = _broadcast("신호 점검으로 운행이 잠시 멈춥니다.", 0)
+        curr = _broadcast("신호 점검으로 운행이 잠시 멈춥니다 양해 바랍니다.", 14)
+
+        score, same = self._decide(prev, curr, prev_station="시청")
+
+        self.assertGreaterEqual(score, continuation.CONTINUATION_HIGH)
+        self.assertTrue(same)
+        budget.return_value.record.assert_called_once_with("avoided_by_score")
+        ask_llm.assert_not_called()
+
+    def test_rejects_unrelated_sentence_at_other_station(self, budget, ask_llm):
+        prev = _broadcast("시청역에서 잠시 정차합니다.", 0)
+        curr = _broadcast("강남역 일대 공사로 혼잡하니 양해 바랍니다.", 45)
+
+        score, same = self._decide(prev, curr, prev_station="시청", curr_station="강남")
+
+        self.assertLessEqual(score, continuation.CONTINUATION_LOW)
+        self.assertFalse(same)
+        budget.return_value.record.assert_called_once_with("avoided_by_score")
+        ask_llm.assert_not_called()
+
+
+# ==========================================================
+#  역명 추정 — 역색인 결과가 예전 전수 비교(부분 일치 → 자모 유사도)와 같아야 한다
+# ==========================================================
+def _linear_guess(text):
+    t = text.replace(" ", "").replace("역", "")
+
+    for name in STATION_NAMES:
+        if t in name.replace(" ", ""):
+            return name
+
+    best, best_score = None, 0
+    for name in STATION_NAMES:
+        score = SequenceMatcher(None, jamo(t), jamo(name)).ratio()
+        if score > best_score:
+            best, best_score = name, score
+    return best if best_score > SIMILARITY_THRESHOLD else None
+
+
+class StationLookupTests(SimpleTestCase):
+
+    def _assert_same(self, texts):
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(guess_station_name(text), _linear_guess(text))
+
+    def test_exact_and_partial_names(self):
+        names = STATION_NAMES[::9]
+        self._assert_same([f"{name}역" for name in names] + [name[:2] for name in names])
+
+    def test_misrecognized_names(self):
+        # 받침/모음이 하나씩 틀린 STT 결과, 역명이 아닌 문장
+        self._assert_same([
+            "시청녁", "강남녁", "구료", "신도림녁", "서울녁", "왕십이", "고속터미날",
+            "홍대입구녁", "잠실새내녁", "디지털미디어시티",
+            "내리실 문은 오른쪽입니다", "양해 바랍니다", "",
+        ])
+
+
+# ==========================================================
+#  이어받기 업로드 — offset / 파트·전체 해시 검증, commit 재시도와 늦은 PATCH
+# ==========================================================
+class ResumableUploadTests(FakeRedisMixin, TestCase):
+
+    DATA = b"0123456789"
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+        for patcher in (
+            mock.patch.object(uploads, "UPLOAD_DIR", os.path.join(self.dir, "uploads")),
+            mock.patch.object(uploads, "FileSystemStorage", lambda location: FileSystemStorage(location=self.dir)),
+            mock.patch.object(uploads.process_audio_chunk, "delay"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.session = Session.objects.create()
+
+    def _upload(self, sha256=""):
+        return uploads.create_upload(self.session, "chunk.wav", len(self.DATA), sha256)
+
+    def _write(self, upload, data, offset, checksum=None):
+        return uploads.write_part(upload, io.BytesIO(data), offset, len(data), checksum)
+
+    def test_part_at_wrong_offset_is_rejected(self):
+        upload = self._upload()
+        self.assertEqual(self._write(upload, self.DATA[:4], 0), 4)
+
+        with self.assertRaises(uploads.UploadError) as ctx:
+            self._write(upload, self.DATA[4:], 0)
+
+        self.assertEqual(ctx.exception.status, 409)
+        self.assertEqual(uploads.upload_offset(upload), 4)
+
+    def test_part_with_bad_checksum_is_rolled_back(self):
+        upload = self._upload()
+        self._write(upload, self.DATA[:4], 0)
+
+        with self.assertRaises(uploads.UploadError) as ctx:
+            self._write(upload, self.DATA[4:], 4, checksum=hashlib.sha256(b"other").hexdigest())
+
+        self.assertEqual(ctx.exception.status, 422)
+        self.assertEqual(uploads.upload_offset(upload), 4)
+
+        good = hashlib.sha256(self.DATA[4:]).hexdigest()
+        self.assertEqual(self._write(upload, self.DATA[4:], 4, checksum=good), len(self.DATA))
+
+    def test_commit_rejects_file_checksum_mismatch(self):
+        upload = self._upload(sha256=hashlib.sha256(b"other").hexdigest())
+        self._write(upload, self.DATA, 0)
+
+        with self.assertRaises(uploads.UploadError) as ctx:
+            uploads.commit_upload(upload)
+
+        self.assertEqual(ctx.exception.status, 422)
+        self.assertFalse(AudioChunk.objects.exists())
+
+    def test_retried_commit_returns_the_committed_chunk(self):
+        upload = self._upload(sha256=hashlib.sha256(self.DATA).hexdigest())
+        self._write(upload, self.DATA, 0)
+        stale = ChunkUpload.objects.get(id=upload.id)
+
+        chunk = uploads.commit_upload(upload)
+        retried = uploads.commit_upload(stale)
+
+        self.assertEqual(retried.id, chunk.id)
+        self.assertEqual(AudioChunk.objects.count(), 1)
+        uploads.process_audio_chunk.delay.assert_called_once_with(chunk.id)
+
+    def test_patch_after_commit_does_not_start_new_part(self):
+        upload = self._upload()
+        self._write(upload, self.DATA, 0)
+        stale = ChunkUpload.objects.get(id=upload.id)
+        uploads.commit_upload(upload)
+
+        with self.assertRaises(uploads.UploadError) as ctx:
+            self._write(stale, self.DATA[:1], 0)
+
+        self.assertEqual(ctx.exception.status, 409)
+        self.assertFalse(os.path.exists(uploads.part_path(upload)))
+
+
+# ==========================================================
+#  세션 카운터 — 키가 없으면 DB 로 재집계, 같은 ID 는 몇 번 넣어도 한 번만
+# ==========================================================
+class SessionCounterTests(FakeRedisMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.session = Session.objects.create()
+        self.done = [
+            AudioChunk.objects.create(session=self.session, file_path=f"/done{i}", status="COMPLETE")
+            for i in range(2)
+        ]
+        self.pending = AudioChunk.objects.create(session=self.session, file_path="/pending")
+
+        broadcast = Broadcast.objects.create(session=self.session, audio_chunk=self.done[0], full_text="시청역")
+        keyword = Keyword.objects.create(session=self.session, word="시청")
+        self.alerts = [
+            Alert.objects.create(session=self.session, broadcast=broadcast, keyword=keyword)
+            for _ in range(2)
+        ]
+
+    def test_missing_keys_are_reconciled_from_db(self):
+        counts = counters.session_counts(self.session.id)
+
+        self.assertEqual(counts, {
+            "received": 3,
+            "completed": 2,
+            "silent": 1,
+            "alerts": 2,
+            "last_alert_id": self.alerts[-1].id,
+        })
+
+    def test_marks_after_reconcile_are_not_double_counted(self):
+        counters.session_counts(self.session.id)
+
+        # 재집계에 이미 들어간 청크 + 재시도된 태스크가 같은 청크를 다시 표시
+        counters.mark_counted(self.session.id, "completed", [self.done[0].id])
+        counters.mark_counted(self.session.id, "completed", [self.done[0].id])
+        self.assertEqual(counters.session_counts(self.session.id)["completed"], 2)
+
+        counters.mark_counted(self.session.id, "completed", [self.pending.id])
+        self.assertEqual(counters.session_counts(self.session.id)["completed"], 3)
+
+    def test_reset_recounts_after_alerts_are_deleted(self):
+        counters.session_counts(self.session.id)
+
+        self.alerts[-1].delete()
+        counters.reset_counts(self.session.id)
+
+        counts = counters.session_counts(self.session.id)
+        self.assertEqual(counts["alerts"], 1)
+        self.assertEqual(counts["last_alert_id"], self.alerts[0].id)
+
+    def test_reconcile_reads_the_db_once(self):
+        with self.assertNumQueries(3):
+            counters.session_counts(self.session.id)
+        with self.assertNumQueries(0):
+            counters.session_counts(self.session.id)
+
+
+# ==========================================================
+#  SSE 재전송 — Last-Event-ID 이후만 다시 보내고, 잘려 나간 구간이 있으면 resync
+# ==========================================================
+class EventReplayTests(FakeRedisMixin, SimpleTestCase):
+
+    SESSION_ID = 7
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(stream, "get_async_redis", self.async_redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _publish(self, *types):
+        for t in types:
+            publisher.push_event(self.SESSION_ID, {"type": t})
+        entries = self.redis.xrange(publisher.stream_key(self.SESSION_ID))
+        return [eid.decode() for eid, _ in entries]
+
+    def _replay(self, last_event_id):
+        async def run():
+            events = await stream.SessionHub().replay(self.SESSION_ID, last_event_id)
+            return [(eid, json.loads(data)["type"]) for eid, data in events]
+        return asyncio.run(run())
+
+    def test_replays_only_events_after_last_id(self):
+        ids = self._publish("chunk_received", "keyword_alert", "chunk_count")
+
+        self.assertEqual(self._replay(ids[0]), [
+            (ids[1], "keyword_alert"),
+            (ids[2], "chunk_count"),
+        ])
+        self.assertEqual(self._replay(ids[2]), [])
+
+    def test_trimmed_history_starts_with_resync(self):
+        ids = self._publish("chunk_received", "keyword_alert", "chunk_count")
+        self.redis.xtrim(publisher.stream_key(self.SESSION_ID), maxlen=1, approximate=False)
+
+        self.assertEqual(self._replay(ids[0]), [(None, "resync"), (ids[2], "chunk_count")])
+
+    def test_expired_stream_asks_for_resync(self):
+        ids = self._publish("chunk_received")
+        self.redis.delete(publisher.stream_key(self.SESSION_ID))
+
+        self.assertEqual(self._replay(ids[0]), [(None, "resync")])
+
+    def test_live_events_already_replayed_are_skipped(self):
+        ids = self._publish("chunk_received", "keyword_alert")
+
+        async def run():
+            hub = stream.SessionHub()
+            hub.ready.set()
+            hub._task = asyncio.get_running_loop().create_future()   # 실제 구독은 띄우지 않음
+
+            with mock.patch.object(stream, "get_hub", return_value=hub), \
+                    mock.patch.object(stream, "SSE_COALESCE_MS", 0):
+                gen = stream.event_stream(self.SESSION_ID, last_event_id=ids[0])
+                sent = [await gen.__anext__() for _ in range(2)]
+
+                # 재전송과 겹친 실시간 이벤트 + 새 이벤트
+                new_id = self._publish("keyword_alert")[-1]
+                hub.dispatch(str(self.SESSION_ID), (ids[1], json.dumps({"type": "keyword_alert"})))
+                hub.dispatch(str(self.SESSION_ID), (new_id, json.dumps({"type": "keyword_alert"})))
+                sent.append(await gen.__anext__())
+                await gen.aclose()
+            return sent, new_id
+
+        sent, new_id = asyncio.run(run())
+
+        self.assertEqual(sent[0], ": connected\n\n")
+        self.assertTrue(sent[1].startswith(f"id: {ids[1]}\n"))
+        self.assertEqual(sent[2].count("id: "), 1)
+        self.assertTrue(sent[2].startswith(f"id: {new_id}\n"))
+
+
+# ==========================================================
+#  이벤트 묶음 발행 — 배치 안의 상태 이벤트는 마지막 값만, 나머지는 순서대로 한 번에
+# ==========================================================
+class EventBatchTests(FakeRedisMixin, SimpleTestCase):
+
+    SESSION_ID = 8
+
+    def _stream(self):
+        entries = self.redis.xrange(publisher.stream_key(self.SESSION_ID))
+        return [json.loads(fields[b"data"]) for _, fields in entries]
+
+    def test_batch_keeps_last_state_event_and_all_alerts(self):
+        pubsub = self.redis.pubsub()
+        pubsub.subscribe(f"session:{self.SESSION_ID}")
+        pubsub.get_message(timeout=1)
+
+        with publisher.event_batch():
+            publisher.push_event(self.SESSION_ID, {"type": "chunk_count", "done": 1})
+            publisher.push_event(self.SESSION_ID, {"type": "keyword_alert", "keyword": "시청"})
+            publisher.push_event(self.SESSION_ID, {"type": "chunk_count", "done": 2})
+            publisher.push_event(self.SESSION_ID, {"type": "keyword_alert", "keyword": "환승"})
+            self.assertEqual(self._stream(), [])
+
+        self.assertEqual(self._stream(), [
+            {"type": "keyword_alert", "keyword": "시청"},
+            {"type": "chunk_count", "done": 2},
+            {"type": "keyword_alert", "keyword": "환승"},
+        ])
+        # PUBLISH 도 1회 (이벤트마다 한 줄)
+        message = pubsub.get_message(timeout=1)
+        self.assertEqual(len(message["data"].decode().split("\n")), 3)
+        self.assertIsNone(pubsub.get_message(timeout=0.1))
+
+    def test_nested_batch_publishes_once_at_the_outermost_block(self):
+        with publisher.event_batch():
+            with publisher.event_batch():
+                publisher.push_event(self.SESSION_ID, {"type": "status", "status": "RECORDING"})
+            self.assertEqual(self._stream(), [])
+            publisher.push_event(self.SESSION_ID, {"type": "status", "status": "PROCESSING"})
+
+        self.assertEqual(self._stream(), [{"type": "status", "status": "PROCESSING"}])
+
+    def test_stream_coalesces_state_events_between_writes(self):
+        events = [
+            ("1-0", json.dumps({"type": "chunk_count", "done": 1})),
+            ("2-0", json.dumps({"type": "keyword_alert"})),
+            ("3-0", json.dumps({"type": "chunk_count", "done": 2})),
+            ("4-0", json.dumps({"type": "results_progress", "done": 1})),
+        ]
+
+        self.assertEqual([eid for eid, _ in stream._coalesce(events)], ["2-0", "3-0", "4-0"])
+
+
+# ==========================================================
+#  LLM 응답 캐시 — 개수 제한은 오래 안 쓴 것부터, 만료된 항목은 저장 때 정리
+# ==========================================================
+class LLMCacheTests(FakeRedisMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.now = 1_000_000.0
+        self.calls = []
+
+        for patcher in (
+            mock.patch.object(llm_cache, "LLM_CACHE_ENABLED", True),
+            mock.patch.object(llm_cache, "LLM_CACHE_TTL", 100),
+            mock.patch.object(llm_cache, "LLM_CACHE_MAX_ENTRIES", 2),
+            mock.patch.object(llm_cache.time, "time", lambda: self.now),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        @llm_cache.llm_cached("test-model", prompt_version="1")
+        def summarize(text):
+            self.calls.append(text)
+            return text.upper()
+
+        self.summarize = summarize
+
+    def _call(self, text, advance=1):
+        self.now += advance
+        return self.summarize(text)
+
+    def test_hit_skips_the_call(self):
+        self.assertEqual(self._call("a"), "A")
+        self.assertEqual(self._call(" a "), "A")
+
+        self.assertEqual(self.calls, ["a"])
+
+    def test_overflow_evicts_least_recently_used(self):
+        self._call("a")
+        self._call("b")
+        self._call("a")     # a 사용 → b 가 가장 오래 안 씀
+        self._call("c")     # 3개째 → b 삭제
+
+        self._call("a")
+        self._call("b")
+
+        self.assertEqual(self.calls, ["a", "b", "c", "b"])
+        self.assertEqual(self.redis.zcard(llm_cache.LRU_KEY), 2)
+
+    def test_expired_entries_are_pruned_on_write(self):
+        self._call("a")
+        self._call("b")
+
+        self._call("c", advance=500)    # a, b 는 TTL 지남
+
+        self.assertEqual(self.redis.zcard(llm_cache.LRU_KEY), 1)
+        self.assertEqual(llm_cache.cache_stats()["entries"], 1)
+
+
+# ==========================================================
+#  템플릿 파서 — 정형 문장만으로 된 그룹만 LLM 없이 처리 (confidence 기준 미달은 None)
+# ==========================================================
+class TemplateParserTests(SimpleTestCase):
+
+    def test_standard_phrasing_is_parsed(self):
+        result = template_parser.try_parse("이번 역은 시청역입니다 내리실 문은 오른쪽입니다")
+
+        self.assertEqual(result["full_text"], "이번 역은 시청역입니다. 내리실 문은 오른쪽입니다.")
+        self.assertEqual(result["info"], {"station": "시청역", "door": "오른쪽", "transfers": [], "warnings": []})
+        self.assertEqual(result["summary"].splitlines()[0], "- 역: 시청역")
+
+    def test_named_line_transfer_is_recognised(self):
+        result = template_parser.try_parse(
+            "이번 역은 김포공항역입니다 김포골드라인으로 갈아타실 수 있습니다 내리실 문은 왼쪽입니다"
+        )
+
+        self.assertEqual(result["info"]["transfers"], ["김포골드라인"])
+
+    def test_free_sentence_falls_back_to_llm(self):
+        text = "이번 역은 시청역입니다 승객 여러분 오늘 강남 일대에서 행사가 있어"
+
+        self.assertLess(template_parser.parse_announcement(text)["confidence"], template_parser.TEMPLATE_MIN_CONFIDENCE)
+        self.assertIsNone(template_parser.try_parse(text))
+
+    def test_misrecognized_station_is_gated_by_min_confidence(self):
+        text = "이번 역은 시텽역입니다"
+        confidence = template_parser.parse_announcement(text)["confidence"]
+        self.assertTrue(0 < confidence < template_parser.TEMPLATE_MIN_CONFIDENCE)
+
+        self.assertIsNone(template_parser.try_parse(text))
+        with mock.patch.object(template_parser, "TEMPLATE_MIN_CONFIDENCE", confidence):
+            self.assertEqual(template_parser.try_parse(text)["info"]["station"], "시청역")
+
+    def test_filler_only_text_has_no_confidence(self):
+        text = "감사합니다 안녕히 가십시오"
+
+        self.assertEqual(template_parser.parse_announcement(text)["confidence"], 0)
+        self.assertIsNone(template_parser.try_parse(text))
+
+
+# ==========================================================
+#  청크 경계 이어 붙이기 — 앞 청크가 아직 STT 중이면 기다리지 않고 맡겨 둔 뒤,
+#  앞 청크가 전사를 저장할 때 이어서 처리 (한 번만)
+# ==========================================================
+class DeferredStitchTests(FakeRedisMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.session = Session.objects.create()
+        self.first = AudioChunk.objects.create(session=self.session, file_path="/first")
+        self.second = AudioChunk.objects.create(session=self.session, file_path="/second")
+        texts = {
+            self.first.id: "이번 역은 시청역입니다 내리실 문은",
+            self.second.id: "내리실 문은 오른쪽입니다",
+        }
+        self.queued = []
+
+        for patcher in (
+            mock.patch.object(tasks, "decode_pcm", return_value=None),
+            mock.patch.object(tasks, "check_chunk", return_value={"speech": True, "duration": 10.0}),
+            # 두 번째 청크만 앞 청크 꼬리를 겹쳐 붙인 오디오
+            mock.patch.object(tasks, "build_overlap_audio",
+                              side_effect=lambda chunk, pcm: "/missing.wav" if chunk.id == self.second.id else None),
+            mock.patch.object(tasks, "call_ai_server",
+                              side_effect=lambda path, chunk_id: {"text": texts[chunk_id], "confidence": 0.9}),
+            mock.patch.object(tasks, "assign_announcement"),
+            mock.patch.object(tasks.finish_audio_chunk, "delay",
+                              side_effect=lambda chunk_id: self.queued.append(("wake", chunk_id))),
+            mock.patch.object(tasks.finish_audio_chunk, "apply_async",
+                              side_effect=lambda args, countdown: self.queued.append(("timeout", args[0]))),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_chunk_dequeued_before_its_predecessor_is_stitched_later(self):
+        deferred = tasks.process_audio_chunk(self.second.id)
+        self.assertTrue(deferred["deferred"])
+        self.assertEqual(self.queued, [("timeout", self.second.id)])
+        self.assertFalse(Broadcast.objects.filter(audio_chunk=self.second).exists())
+
+        tasks.process_audio_chunk(self.first.id)
+        self.assertEqual(self.queued[-1], ("wake", self.second.id))
+
+        self.assertEqual(tasks.finish_audio_chunk(self.second.id)["text"], "오른쪽입니다")
+        # 시간 초과 작업은 이미 처리된 것을 보고 그냥 끝남
+        self.assertIsNone(tasks.finish_audio_chunk(self.second.id))
+
+        broadcast = Broadcast.objects.get(audio_chunk=self.second)
+        self.assertEqual(broadcast.stitched_text, "오른쪽입니다")
+        self.assertEqual(AudioChunk.objects.get(id=self.second.id).status, "COMPLETE")
+
+    def test_predecessor_already_transcribed_is_stitched_inline(self):
+        tasks.process_audio_chunk(self.first.id)
+
+        result = tasks.process_audio_chunk(self.second.id)
+
+        self.assertEqual(result["text"], "오른쪽입니다")
+        self.assertEqual(self.queued, [])
+
+
+# ==========================================================
+#  결과 캐시 — GET 은 content_version 비교만, 실패한 그룹은 부분 결과 + 백오프 재시도
+# ==========================================================
+class ResultsCacheTests(FakeRedisMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.session = Session.objects.create()
+        for i, text in enumerate(["공사 안내 첫 방송", "실패할 두 번째 방송"]):
+            chunk = AudioChunk.objects.create(session=self.session, file_path=f"/c{i}", status="COMPLETE")
+            broadcast = Broadcast.objects.create(session=self.session, audio_chunk=chunk, full_text=text)
+            with mock.patch.object(grouper, "is_same_announcement", return_value=False):
+                grouper.assign_announcement(broadcast)
+
+        self.calls = []
+        self.now = 1_000_000.0
+        for patcher in (
+            mock.patch.object(results, "run_parallel", side_effect=self._run),
+            mock.patch.object(results, "try_parse", return_value=None),
+            mock.patch.object(results.time, "time", lambda: self.now),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self, calls, on_result=None):
+        """두 번째 그룹 분석과 세션 요약은 실패"""
+        self.calls.extend(fn.__name__ for fn, _ in calls)
+        return [
+            FAILED if fn is not results.analyze_announcement_v1 or "실패" in args[0]
+            else {"full_text": args[0], "summary": "요약", "info": {}}
+            for fn, args in calls
+        ]
+
+    def _build(self):
+        payload = results.build_results(self.session)
+        self.session.refresh_from_db()
+        return payload
+
+    def test_get_compares_content_version_only(self):
+        self._build()
+
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(results.cached_results(self.session))
+
+        results.bump_content_version(self.session.id)
+        self.session.refresh_from_db()
+        self.assertIsNone(results.cached_results(self.session))
+
+    def test_failed_group_is_served_partially_and_retried_with_backoff(self):
+        payload = self._build()
+        self.assertEqual(payload["failed_announcements"], 1)
+        self.assertEqual([t["summary"] for t in payload["timeline"]], ["요약", ""])
+        self.assertIsNotNone(results.cached_results(self.session))
+        self.assertFalse(results.retry_due(self.session))
+
+        calls = len(self.calls)
+        self._build()
+        self.assertEqual(len(self.calls), calls)    # 재시도 시각 전에는 LLM 호출 없음
+
+        self.now += results.RESULTS_RETRY_BASE_SEC
+        self.assertTrue(results.retry_due(self.session))
+        self._build()
+        # 실패한 그룹 + 세션 요약만 다시 호출
+        self.assertEqual(self.calls[calls:], ["analyze_announcement_v1", "summarize_text_v2"])
+
+    def test_retries_stop_after_max_attempts(self):
+        for _ in range(results.RESULTS_RETRY_MAX_ATTEMPTS + 2):
+            self._build()
+            self.now += 10 ** 6
+
+        analyses = self.calls.count("analyze_announcement_v1")
+        self.assertEqual(analyses, 1 + results.RESULTS_RETRY_MAX_ATTEMPTS)
+        self.assertFalse(results.retry_due(self.session))
@@ -2,15 +2,21 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views.session import SessionViewSet
 from .views.audio_chunk import AudioChunkViewSet
+from .views.audio_upload import ChunkUploadViewSet
 from .views.audio_save import SaveCleanAudio
+from .sse.stream import session_event_stream
 
 app_name = "recordings"
 
 router = DefaultRouter()
 router.register(r"session", SessionViewSet, basename="session")
+# audio/{pk}/ 보다 먼저 매칭되도록 uploads 를 앞에 등록
+router.register(r"audio/uploads", ChunkUploadViewSet, basename="audio-upload")
 router.register(r"audio", AudioChunkViewSet, basename="audio")
 
 urlpatterns = [
+    # SSE 스트림 (ASGI async 뷰)
+    path("session/<int:session_id>/stream/", session_event_stream, name="session-stream"),
     # 기본 REST 라우터
     path("", include(router.urls)),
     path("save-clean-audio/", SaveCleanAudio.as_view()),
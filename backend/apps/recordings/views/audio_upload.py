@@ -0,0 +1,110 @@
+import os
+
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.shortcuts import get_object_or_404
+
+from apps.recordings.models import ChunkUpload
+from apps.recordings.serializers.serializers import ChunkUploadCreateSerializer
+from apps.recordings.services.uploads import (
+    UPLOAD_PART_SIZE,
+    UploadError,
+    commit_upload,
+    create_upload,
+    discard_upload,
+    upload_offset,
+    write_part,
+)
+
+
+def _state(upload, status=200):
+    offset = upload_offset(upload)
+    response = Response({
+        "upload_id": str(upload.id),
+        "offset": offset,
+        "size": upload.size,
+        "part_size": UPLOAD_PART_SIZE,
+        "status": upload.status,
+    }, status=status)
+    response["Upload-Offset"] = str(offset)
+    return response
+
+
+# ========================================================
+# 이어받기 업로드 ViewSet
+#  POST   /api/audio/uploads/                 → 업로드 시작
+#  HEAD   /api/audio/uploads/{id}/            → 현재 offset
+#  PATCH  /api/audio/uploads/{id}/            → 본문(octet-stream) 이어 쓰기
+#  POST   /api/audio/uploads/{id}/commit/     → AudioChunk 생성 + 처리 시작
+#  DELETE /api/audio/uploads/{id}/            → 업로드 취소
+# ========================================================
+class ChunkUploadViewSet(viewsets.ViewSet):
+
+    # [POST] /api/audio/uploads/
+    def create(self, request):
+        serializer = ChunkUploadCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            upload = create_upload(data["session"], data["filename"], data["size"], data["sha256"])
+        except UploadError as e:
+            return Response({"error": e.message}, status=e.status)
+
+        return _state(upload, status=201)
+
+    # [GET/HEAD] /api/audio/uploads/{id}/
+    def retrieve(self, request, pk=None):
+        upload = get_object_or_404(ChunkUpload, id=pk)
+        return _state(upload)
+
+    # [PATCH] /api/audio/uploads/{id}/
+    def partial_update(self, request, pk=None):
+        upload = get_object_or_404(ChunkUpload, id=pk)
+
+        # request.data 는 건드리지 않음 (본문 전체를 메모리에 읽게 되므로)
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return Response({"error": "Upload-Offset and Content-Length required"}, status=400)
+
+        checksum = None
+        if "Upload-Checksum" in request.headers:
+            algorithm, _, checksum = request.headers["Upload-Checksum"].partition(" ")
+            if algorithm.lower() != "sha256" or not checksum:
+                return Response({"error": "Upload-Checksum must be 'sha256 <hex>'"}, status=400)
+
+        try:
+            write_part(upload, request.stream, offset, length, checksum)
+        except UploadError as e:
+            response = Response({"error": e.message, "offset": upload_offset(upload)}, status=e.status)
+            response["Upload-Offset"] = str(upload_offset(upload))
+            return response
+
+        return _state(upload)
+
+    # [DELETE] /api/audio/uploads/{id}/
+    def destroy(self, request, pk=None):
+        upload = get_object_or_404(ChunkUpload, id=pk)
+        if upload.status == "COMMITTED":
+            return Response({"error": "upload already committed"}, status=409)
+        discard_upload(upload)
+        return Response({"detail": f"Upload {pk} deleted."})
+
+    # [POST] /api/audio/uploads/{id}/commit/
+    @action(detail=True, methods=["POST"], url_path="commit")
+    def commit(self, request, pk=None):
+        upload = get_object_or_404(ChunkUpload.objects.select_related("session"), id=pk)
+
+        try:
+            chunk = commit_upload(upload)
+        except UploadError as e:
+            return Response({"error": e.message, "offset": upload_offset(upload)}, status=e.status)
+
+        return Response({
+            "audio_id": chunk.id,
+            "status": "PROCESSING",
+            "file": os.path.basename(chunk.file_path),
+        }, status=201)
@@ -1,29 +1,38 @@
-from datetime import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.http import StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
 
 from apps.keywords.models import Alert
 from apps.recordings.models import Session
 from apps.recordings.serializers.serializers import SessionSerializer
-from apps.recordings.serializers.result import ResultSerializer
-from apps.recordings.services.llm import correct_transcription, summarize_text
-from apps.recordings.services.nlp import correct_transcription_v2, summarize_text_v2, extract_info_v1
-from apps.recordings.services.merger import group_broadcasts
+from apps.recordings.services.session_end import end_session, finish_session
+from apps.recordings.services.results import cached_results, get_results_job, retry_due
+from apps.recordings.tasks import enqueue_results
+from apps.recordings.services.continuation import continuation_stats
+from apps.recordings.services.vad import vad_stats
+from apps.recordings.services.template_parser import template_stats
+from apps.recordings.services.counters import session_counts
 
-from apps.recordings.sse.stream import event_stream
-from apps.broadcasts.models import Broadcast, Transcript
+from apps.broadcasts.models import Broadcast
 
 
 # ========================================================
-# Session ViewSet — CRUD + status + results + SSE
+# Session ViewSet — CRUD + status + results
+# (SSE 스트림은 async 뷰 — sse/stream.py)
 # ========================================================
 class SessionViewSet(viewsets.ViewSet):
 
     # [POST] /api/session/
+    #  - previous_session_id 가 오면 그 세션은 녹음 종료로 처리
     def create(self, request):
+        previous_id = request.data.get("previous_session_id")
+        if previous_id:
+            previous = Session.objects.filter(id=previous_id).first()
+            if previous is not None:
+                end_session(previous)
+
         session = Session.objects.create()
         return Response(SessionSerializer(session).data, status=status.HTTP_201_CREATED)
 
@@ -41,8 +50,17 @@ class SessionViewSet(viewsets.ViewSet):
         session.delete()
         return Response({"detail": f"Session {pk} deleted."})
 
+    # -----------------------------
+    # [POST] /api/session/{id}/end/  → 녹음 종료 (남은 청크가 끝나면 COMPLETE)
+    @action(detail=True, methods=["POST"], url_path="end")
+    def end(self, request, pk=None):
+        session = get_object_or_404(Session, id=pk)
+        end_session(session)
+        return Response({"session_id": pk, "status": session.status, "ended_at": session.ended_at})
+
     # -----------------------------
     # [GET] /api/session/{id}/status/
+    #  - 청크/알림 개수는 Redis 세션 카운터, 세션은 쿼리 1회, 바뀐 게 없으면 304
     @action(detail=True, methods=["GET"], url_path="status")
     def status(self, request, pk=None):
         session = get_object_or_404(Session, id=pk)
@@ -50,121 +68,78 @@ class SessionViewSet(viewsets.ViewSet):
             session.delete()
             return Response({"detail": "Session이 만료되었습니다."}, status=410)
 
-        alerts = Alert.objects.filter(keyword__session=session)
-        
-        done = session.chunks.filter(status="COMPLETE").count()
-        total = session.chunks.count()
+        counts = session_counts(session.id)
+        done = counts["completed"]
+        total = counts["received"]
         
-        # ==== 세션 자동 종료 판정 ====
-        if total > 0 and done >= total:
-            if session.status != "COMPLETE":
-                session.status = "COMPLETE"
-                session.save()
-        else:
-            session.status = "RECORDING"
-            session.save()
+        # ==== 종료된 세션이면 남은 청크가 다 끝났는지 확인 (녹음 중에는 그대로) ====
+        finish_session(session, counts)
+
+        # 알림 삭제 + 새 알림으로 개수가 같아져도 바뀌도록 마지막 알림 ID 포함
+        etag = quote_etag(f"{session.status}-{done}-{total}-{counts['alerts']}-{counts['last_alert_id']}")
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=304)
+            response["ETag"] = etag
+            return response
+
+        alerts = (
+            Alert.objects
+            .filter(session=session)
+            .select_related("keyword")
+            .only("broadcast_id", "detected_at", "keyword__word")
+        )
 
-        return Response({
+        response = Response({
             "session_id": pk,
             "status": session.status,
             "done_chunks": done,
             "total_chunks": total,
-            "total_keywords": alerts.count(),
+            "total_keywords": counts["alerts"],
             "keyword_alerts": [
                 {
-                    "broadcast_id": a.broadcast.id if a.broadcast else None,
+                    "broadcast_id": a.broadcast_id,
                     "keyword": a.keyword.word,
                     "detected_at": a.detected_at,
                 }
                 for a in alerts
             ],
         })
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
 
     # -----------------------------
-    # [GET] /api/session/{id}/results/
-    @action(detail=True, methods=["GET"], url_path="results")
+    # [GET]  /api/session/{id}/results/  → 저장된 결과 (없으면 202 + 작업 상태)
+    # [POST] /api/session/{id}/results/  → 결과 생성 작업 시작
+    @action(detail=True, methods=["GET", "POST"], url_path="results")
     def results(self, request, pk=None):
         session = get_object_or_404(Session, id=pk)
 
-        # 세션의 방송 목록
-        broadcasts = Broadcast.objects.filter(session=session).order_by("created_at")
-
-        if not broadcasts.exists():
+        if not Broadcast.objects.filter(session=session).exists():
             return Response({"detail": "No broadcasts detected yet."})
 
-        # 1) 방송 → 안내방송 단위 그룹핑
-        try:
-            announcement_groups = group_broadcasts(broadcasts)
-        except Exception as e:
-            print("❌ group_broadcasts 오류:", e)
-            announcement_groups = [[b] for b in broadcasts]
-
-        timeline = []
-        confidences_total = []
-        
-        # 2) 안내방송 단위 처리
-        for i, group in enumerate(announcement_groups):
-
-            # --- 텍스트 병합 + LLM 재생성 ---
-            raw_texts = [b.full_text for b in group]
-            merged_raw = " ".join(raw_texts)
-
-            fixed_text = correct_transcription_v2(merged_raw)
-            summary = summarize_text_v2(fixed_text)
-            info = extract_info_v1(fixed_text)
-
-            # --- 메타데이터 수집 ---
-            broadcast_ids = [b.id for b in group]
-            chunk_ids = [b.audio_chunk.id for b in group]
-            group_conf = [b.confidence_avg or 0 for b in group]
-
-            confidences_total.extend(group_conf)
-
-            # 키워드
-            keywords = []
-            for b in group:
-                kw = list(b.keywords_detected.values_list("word", flat=True))
-                keywords.extend(kw)
-
-            timeline.append({
-                "announcement_id": i + 1,
-                "broadcast_ids": broadcast_ids,
-                "audio_chunks": chunk_ids,
-                "full_text": fixed_text,
-                "summary": summary,
-                "info": info,
-                "keywords_detected": list(set(keywords)),
-                "confidence_avg": round(sum(group_conf) / len(group_conf), 3) if group_conf else 0
-            })
-
-        # 3) 세션 전체 요약
-        session_full_text = " ".join([t["full_text"] for t in timeline])
-        session_summary = summarize_text_v2(session_full_text)
-        
-        # Tramscript 모델에 저장
-        total_keywords = Alert.objects.filter(keyword__session=session).count()
-
-        Transcript.objects.update_or_create(
-            session=session,
-            defaults={
-                "summary": session_summary,
-                "total_broadcasts": len(broadcasts),
-                "total_keywords": total_keywords,
-                "accuracy_avg": round(sum(confidences_total) / len(confidences_total), 3)
-            }
-        )
+        if request.method == "GET":
+            # 그룹/내용이 바뀌지 않았으면 Transcript 에서 바로 반환
+            payload = cached_results(session)
+            if payload is not None:
+                # 일부 그룹이 실패한 부분 결과 → 그대로 주고, 재시도 시각이 됐으면 백그라운드로 다시 처리
+                if payload["failed_announcements"] and retry_due(session):
+                    enqueue_results(session)
+                return Response({
+                    "session_id": pk,
+                    **payload,
+                    # 그룹핑 LLM 호출 / 절감 통계
+                    "continuation": continuation_stats(session.id),
+                    # VAD 로 생략한 AI 서버 호출 수
+                    "vad": vad_stats(session.id),
+                    # 템플릿 파서로 처리한 그룹 / LLM 호출 그룹
+                    "template": template_stats(session.id),
+                })
+
+        # 결과가 없거나 오래됨 → 작업 시작 (이미 진행 중이면 상태만 반환)
+        enqueue_results(session)
 
         return Response({
             "session_id": pk,
-            "total_announcements": len(timeline),
-            "summary": session_summary,
-            "timeline": timeline
-        })
-
-    # -----------------------------
-    # [GET] /api/session/{id}/stream/
-    @action(detail=True, methods=["GET"], url_path="stream")
-    def stream(self, request, pk=None):
-        response = StreamingHttpResponse(event_stream(pk), content_type="text/event-stream")
-        response["X-Accel-Buffering"] = "no"
-        return response
+            "job": get_results_job(session.id),
+        }, status=status.HTTP_202_ACCEPTED)
@@ -107,7 +107,12 @@ DATABASES = {
 
 #업로드 파일 최대 크기
 DATA_UPLOAD_MAX_MEMORY_SIZE = 200 * 1024 * 1024  # 200MB
-FILE_UPLOAD_MAX_MEMORY_SIZE = 200 * 1024 * 1024  # 200MB
+# 이보다 큰 multipart 파일은 메모리 대신 임시 파일로 받음
+FILE_UPLOAD_MAX_MEMORY_SIZE = env.int("FILE_UPLOAD_MAX_MEMORY_SIZE", default=2621440)  # 2.5MB
+
+# 이어받기 업로드 (/api/audio/uploads/) — 한 번에 읽는 크기 / 최대 파일 크기
+UPLOAD_PART_SIZE = env.int("UPLOAD_PART_SIZE", default=1024 * 1024)  # 1MB
+UPLOAD_MAX_SIZE = env.int("UPLOAD_MAX_SIZE", default=200 * 1024 * 1024)  # 200MB
 
 
 # Password validation
@@ -170,7 +175,14 @@ CORS_ALLOW_ORIGINS = [
 
 #######################################################
 CELERY_BEAT_SCHEDULE = {
-    
+    "cleanup-stale-uploads": {
+        "task": "apps.recordings.tasks.cleanup_stale_uploads",
+        "schedule": crontab(minute=0),
+    },
+    "end-idle-sessions": {
+        "task": "apps.recordings.tasks.end_idle_sessions",
+        "schedule": crontab(),
+    },
 }
 
 
@@ -191,8 +203,83 @@ CELERY_TASK_SOFT_TIME_LIMIT = 540  # soft timeout 9분
 # Colab 서버 URL
 AI_SERVER_URL = env('AI_SERVER_URL')
 COLAB_SERVER_URL = env('COLAB_SERVER_URL', default="")
+
+# AI 서버 클라이언트 (연결/응답 타임아웃 초, 재시도, 커넥션 풀, 서킷 브레이커)
+AI_CONNECT_TIMEOUT = env.float("AI_CONNECT_TIMEOUT", default=3.0)
+AI_READ_TIMEOUT = env.float("AI_READ_TIMEOUT", default=30.0)
+AI_MAX_RETRIES = env.int("AI_MAX_RETRIES", default=2)
+AI_BACKOFF_BASE = env.float("AI_BACKOFF_BASE", default=0.5)
+AI_POOL_SIZE = env.int("AI_POOL_SIZE", default=4)
+AI_BREAKER_THRESHOLD = env.int("AI_BREAKER_THRESHOLD", default=5)
+AI_BREAKER_COOLDOWN = env.float("AI_BREAKER_COOLDOWN", default=30.0)
+
+# 세션 간 STT 마이크로 배칭 (run_stt_batcher 디스패처 필요)
+AI_BATCHING_ENABLED = env.bool("AI_BATCHING_ENABLED", default=False)
+AI_BATCH_URL = env("AI_BATCH_URL", default=AI_SERVER_URL + "_batch")
+AI_BATCH_WINDOW_MS = env.int("AI_BATCH_WINDOW_MS", default=200)
+AI_BATCH_MAX_SIZE = env.int("AI_BATCH_MAX_SIZE", default=8)
+AI_BATCH_WAIT_TIMEOUT = env.int("AI_BATCH_WAIT_TIMEOUT", default=60)
+
+# AI 서버 호출 전 로컬 VAD (프레임 길이 ms / 에너지 하한 dBFS / 평탄도 상한 / 최소 음성 길이 ms)
+VAD_ENABLED = env.bool("VAD_ENABLED", default=True)
+VAD_FRAME_MS = env.int("VAD_FRAME_MS", default=30)
+VAD_ENERGY_DB = env.float("VAD_ENERGY_DB", default=-50.0)
+VAD_FLATNESS_MAX = env.float("VAD_FLATNESS_MAX", default=0.35)
+VAD_MIN_SPEECH_MS = env.int("VAD_MIN_SPEECH_MS", default=300)
+
+# 청크 경계 겹침 (앞 청크 꼬리 초, 0 이면 끔) / 텍스트 정렬 최소·최대 글자 수, 자모 유사도
+STITCH_OVERLAP_SEC = env.float("STITCH_OVERLAP_SEC", default=1.5)
+STITCH_MIN_CHARS = env.int("STITCH_MIN_CHARS", default=2)
+STITCH_MAX_CHARS = env.int("STITCH_MAX_CHARS", default=20)
+STITCH_MIN_RATIO = env.float("STITCH_MIN_RATIO", default=0.8)
+# 앞 청크가 아직 STT 중일 때, 그 전사 없이 마무리하기까지의 최대 지연 (초 — 워커를 잡지 않는 지연 태스크)
+STITCH_TEXT_WAIT = env.float("STITCH_TEXT_WAIT", default=10.0)
+#########################################################
+# Redis (SSE / 카운터 / 캐시 / 배치 큐 공통 — apps/recordings/services/redis_client.py)
+# 풀 최대 연결 수 / 빈 연결 대기 초 / 소켓·접속 타임아웃 초 / health check 주기 초
+REDIS_HOST = env("REDIS_HOST", default="redis")
+REDIS_PORT = env.int("REDIS_PORT", default=6379)
+REDIS_DB = env.int("REDIS_DB", default=0)
+REDIS_MAX_CONNECTIONS = env.int("REDIS_MAX_CONNECTIONS", default=50)
+REDIS_POOL_TIMEOUT = env.float("REDIS_POOL_TIMEOUT", default=5.0)
+REDIS_SOCKET_TIMEOUT = env.float("REDIS_SOCKET_TIMEOUT", default=5.0)
+REDIS_CONNECT_TIMEOUT = env.float("REDIS_CONNECT_TIMEOUT", default=2.0)
+REDIS_HEALTH_CHECK_INTERVAL = env.int("REDIS_HEALTH_CHECK_INTERVAL", default=30)
 #########################################################
 # Django EventStream 설정
-EVENTSTREAM_REDIS_HOST = "redis"
-EVENTSTREAM_REDIS_PORT = 6379
-############################################################
\ No newline at end of file
+EVENTSTREAM_REDIS_HOST = REDIS_HOST
+EVENTSTREAM_REDIS_PORT = REDIS_PORT
+
+# SSE 스트림 (하트비트 간격 초 / 클라이언트별 버퍼 이벤트 수)
+SSE_HEARTBEAT_SEC = env.float("SSE_HEARTBEAT_SEC", default=15.0)
+SSE_CLIENT_BUFFER = env.int("SSE_CLIENT_BUFFER", default=100)
+# 이벤트를 모아 한 번에 보내는 시간 (ms, 그 사이 상태 이벤트는 마지막 값만)
+SSE_COALESCE_MS = env.int("SSE_COALESCE_MS", default=50)
+# 세션 이벤트 로그 (Redis Stream 최대 길이 / 보관 초) — Last-Event-ID 재전송 범위
+SSE_STREAM_MAXLEN = env.int("SSE_STREAM_MAXLEN", default=500)
+SSE_STREAM_TTL = env.int("SSE_STREAM_TTL", default=60 * 60 * 2)
+############################################################
+# 키워드 감지 매처 캐시 (워커 프로세스당 세션 수)
+KEYWORD_MATCHER_CACHE_SIZE = env.int("KEYWORD_MATCHER_CACHE_SIZE", default=1024)
+############################################################
+# LLM 호출 설정 (결과 생성 시 동시 호출 수 / 호출당 타임아웃 초 / OpenAI 클라이언트 자동 재시도 횟수)
+LLM_MAX_CONCURRENCY = env.int("LLM_MAX_CONCURRENCY", default=8)
+LLM_CALL_TIMEOUT = env.float("LLM_CALL_TIMEOUT", default=30.0)
+LLM_MAX_RETRIES = env.int("LLM_MAX_RETRIES", default=0)
+# LLM 응답 캐시 (세션 공통, Redis) — 보관 초 / 최대 항목 수 (넘치면 오래 안 쓴 것부터 삭제)
+LLM_CACHE_ENABLED = env.bool("LLM_CACHE_ENABLED", default=True)
+LLM_CACHE_TTL = env.int("LLM_CACHE_TTL", default=60 * 60 * 24 * 7)
+LLM_CACHE_MAX_ENTRIES = env.int("LLM_CACHE_MAX_ENTRIES", default=50000)
+# 정형 안내방송 템플릿 파서 — 이 confidence 이상이면 LLM 없이 결과 생성
+TEMPLATE_MIN_CONFIDENCE = env.float("TEMPLATE_MIN_CONFIDENCE", default=0.85)
+# 결과 생성 중 LLM 이 실패한 그룹 재시도 (최대 시도 횟수 / 첫 대기 초, 이후 두 배씩)
+RESULTS_RETRY_MAX_ATTEMPTS = env.int("RESULTS_RETRY_MAX_ATTEMPTS", default=3)
+RESULTS_RETRY_BASE_SEC = env.int("RESULTS_RETRY_BASE_SEC", default=60)
+############################################################
+# 방송 연속성 판단 (로컬 점수 임계값 / 세션당 LLM 호출 예산)
+CONTINUATION_LOW = env.float("CONTINUATION_LOW", default=0.35)
+CONTINUATION_HIGH = env.float("CONTINUATION_HIGH", default=0.65)
+CONTINUATION_LLM_BUDGET = env.int("CONTINUATION_LLM_BUDGET", default=20)
+# 세션 유휴 종료 (마지막 청크 이후 이 시간(초) 동안 새 청크가 없으면 녹음 종료로 처리)
+SESSION_IDLE_TIMEOUT = env.int("SESSION_IDLE_TIMEOUT", default=120)
+############################################################
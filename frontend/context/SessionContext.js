@@ -268,6 +268,7 @@ export function SessionProvider({ children }) {
    * 세션 결과 조회 (/session/{id}/results/)
    * - targetId가 있으면 해당 세션 ID로 조회
    * - 없으면 lastSessionId → sessionId 순으로 사용
+   * - 결과 생성 중이면(202) 저장하지 않고 { pending: true, job } 을 리턴
    * - 에러 발생 시 throw 하지 않고 null을 리턴
    */
   const fetchSessionResults = useCallback(
@@ -285,6 +286,13 @@ export function SessionProvider({ children }) {
 
       try {
         const res = await api.get(url);
+
+        // 202: 결과 생성 작업 진행 중 → body 는 { session_id, job } (timeline 없음)
+        if (res.status === 202) {
+          console.log("[Session] 결과 생성 중:", res.data?.job);
+          return { pending: true, job: res.data?.job };
+        }
+
         console.log(
           "[Session] 결과 조회 완료:",
           JSON.stringify(res.data, null, 2)
@@ -150,7 +150,8 @@ export default function MainScreen() {
   }, [recording, sessionId, settings.alertsEnabled, fetchSessionStatus, handleKeywordAlert]);
 
   // --------------------------------------------
-  // ⭐ COMPLETE 될 때까지 상태 조회 + 결과 조회
+  // ⭐ COMPLETE 될 때까지 상태 조회 → 결과가 생성될 때까지 결과 조회
+  //    (COMPLETE 시점에 결과 생성 작업이 시작되므로 처음 몇 번은 202)
   // --------------------------------------------
   // ✅ [FIX] targetId를 “인자로” 받도록 변경 (state(lastSessionId)에 의존 X)
   const waitForCompleteAndShowResults = useCallback(
@@ -163,7 +164,9 @@ export default function MainScreen() {
       setResultsLoading(true);
 
       const INTERVAL = 2000;
-      const TIMEOUT = 30000; // 30초
+      const TIMEOUT = 30000; // 30초 — 남은 청크 처리
+      const RESULTS_TIMEOUT = 120000; // 2분 — 결과 생성 (LLM)
+      const sleep = () => new Promise((r) => setTimeout(r, INTERVAL));
       const startTime = Date.now();
 
       try {
@@ -171,19 +174,33 @@ export default function MainScreen() {
           const statusRes = await fetchSessionStatus(targetId);
           console.log('[Status]', statusRes);
 
-          if (statusRes?.status === 'COMPLETE') {
-            console.log('[Session] COMPLETE → 결과 조회 (targetId=', targetId, ')');
-            await fetchSessionResults(targetId);
-            setTab('history');
-            break;
-          }
+          if (statusRes?.status === 'COMPLETE') break;
 
           if (Date.now() - startTime > TIMEOUT) {
             Alert.alert('지연', '처리가 오래 걸립니다. 잠시 후 다시 확인해주세요.');
-            break;
+            return;
+          }
+
+          await sleep();
+        }
+
+        console.log('[Session] COMPLETE → 결과 조회 (targetId=', targetId, ')');
+        const resultsStart = Date.now();
+
+        while (true) {
+          const results = await fetchSessionResults(targetId);
+
+          if (results && !results.pending) {
+            setTab('history');
+            return;
+          }
+
+          if (Date.now() - resultsStart > RESULTS_TIMEOUT) {
+            Alert.alert('지연', '결과 생성이 오래 걸립니다. 잠시 후 다시 확인해주세요.');
+            return;
           }
 
-          await new Promise((r) => setTimeout(r, INTERVAL));
+          await sleep();
         }
       } finally {
         setResultsLoading(false);